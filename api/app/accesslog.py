@@ -0,0 +1,247 @@
+"""Sampled access log of request keys, replayed on boot to warm the response cache.
+
+A fraction of cacheable GET requests is counted by request key. The counts are
+flushed periodically (and on shutdown) to a small JSON file; on the next startup
+the most frequent keys are replayed in-process before the app accepts traffic,
+so a fresh instance starts with the hit rate of a long-running one.
+
+Gunicorn workers share the file: each flush adds the worker's samples since its
+last flush to the counts on disk under a lock file, so no worker overwrites
+another's. Older counts are decayed once per boot, when the log is loaded.
+
+Env vars:
+- ACCESS_LOG_PATH: JSON file for counts (default: `<serving db>.access.json`)
+- ACCESS_LOG_SAMPLE_RATE: fraction of requests recorded (default 0.1, 0 disables)
+- ACCESS_LOG_MAX_KEYS: keys kept when persisting (default 5000)
+- ACCESS_LOG_FLUSH_SECONDS: periodic flush interval (default 60)
+- ACCESS_LOG_REPLAY_TOP: keys replayed at startup (default 200, 0 disables)
+- ACCESS_LOG_REPLAY_BUDGET_SECONDS: wall-clock cap for the replay (default 30)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from .cache import is_cacheable, request_key, response_cache
+
+try:
+    import fcntl
+except ImportError:  # Windows dev; a single process needs no lock
+    fcntl = None
+
+# Marks in-process replay requests so they are not counted again.
+WARMUP_SCOPE_KEY = "openfootball.warmup"
+# Older counts are halved on load so the log tracks recent traffic.
+_DECAY = 0.5
+
+
+class AccessLog:
+    """Thread-safe counter of sampled request keys with JSON persistence."""
+
+    def __init__(self, path: Optional[str], sample_rate: float, max_keys: int) -> None:
+        self.path = Path(path) if path else None
+        self.sample_rate = sample_rate
+        self.max_keys = max_keys
+        # Samples not yet flushed, and the decayed counts read by `load`.
+        self._counts: Counter = Counter()
+        self._loaded: Counter = Counter()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None and self.sample_rate > 0
+
+    def record(self, key: str) -> None:
+        if random.random() >= self.sample_rate:
+            return
+        with self._lock:
+            self._counts[key] += 1
+
+    @contextlib.contextmanager
+    def _file_lock(self):
+        """Hold `<path>.lock` so concurrent workers merge one at a time."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_suffix(self.path.suffix + ".lock"), "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            yield
+
+    def _read(self) -> Counter:
+        try:
+            keys = json.loads(self.path.read_text()).get("keys", {})
+            return Counter({k: float(c) for k, c in keys.items()})
+        except (OSError, ValueError, AttributeError, TypeError):
+            return Counter()
+
+    def _write(self, counts: Counter) -> None:
+        keys = {k: round(c, 3) for k, c in counts.most_common(self.max_keys)}
+        # Per process, in case a lock-less platform flushes concurrently.
+        tmp = self.path.with_suffix(f"{self.path.suffix}.{os.getpid()}.part")
+        tmp.write_text(json.dumps({"version": 1, "keys": keys}, separators=(",", ":")))
+        tmp.replace(self.path)
+
+    def load(self) -> None:
+        """Decay the persisted counts, on disk too, and keep them for `top`.
+
+        Call once per boot (the pre-fork master, or the single process).
+        """
+        if self.path is None or not self.path.exists():
+            return
+        with self._file_lock():
+            counts = self._read()
+            for key in counts:
+                counts[key] *= _DECAY
+            with contextlib.suppress(OSError):
+                self._write(counts)
+        with self._lock:
+            self._loaded = counts
+
+    def top(self, n: int) -> List[str]:
+        with self._lock:
+            return [k for k, _ in (self._loaded + self._counts).most_common(n)]
+
+    def reset(self) -> None:
+        """Drop state inherited from the pre-fork master."""
+        with self._lock:
+            self._counts = Counter()
+            self._loaded = Counter()
+
+    def flush(self) -> None:
+        """Add the samples since the last flush to the counts in `path`."""
+        if self.path is None:
+            return
+        with self._lock:
+            pending, self._counts = self._counts, Counter()
+        if not pending:
+            return
+        try:
+            with self._file_lock():
+                counts = self._read()
+                counts.update(pending)
+                self._write(counts)
+        except OSError:
+            # Keep the samples for the next flush.
+            with self._lock:
+                self._counts.update(pending)
+            raise
+
+
+def _default_path() -> str:
+    from .db import db_path
+
+    return db_path() + ".access.json"
+
+
+access_log = AccessLog(
+    path=os.getenv("ACCESS_LOG_PATH") or _default_path(),
+    sample_rate=float(os.getenv("ACCESS_LOG_SAMPLE_RATE", "0.1")),
+    max_keys=int(os.getenv("ACCESS_LOG_MAX_KEYS", "5000")),
+)
+FLUSH_SECONDS = float(os.getenv("ACCESS_LOG_FLUSH_SECONDS", "60"))
+REPLAY_TOP = int(os.getenv("ACCESS_LOG_REPLAY_TOP", "200"))
+REPLAY_BUDGET_SECONDS = float(os.getenv("ACCESS_LOG_REPLAY_BUDGET_SECONDS", "30"))
+
+
+class AccessLogMiddleware:
+    """ASGI middleware recording keys of successful cacheable GETs."""
+
+    def __init__(self, app, log: AccessLog = access_log) -> None:
+        self.app = app
+        self.log = log
+
+    async def __call__(self, scope, receive, send):
+        if (
+            not self.log.enabled
+            or not is_cacheable(scope)
+            or scope.get(WARMUP_SCOPE_KEY)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                self.log.record(
+                    request_key(scope["path"], scope.get("query_string", b""))
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+async def dispatch(app, key: str) -> Tuple[int, bytes]:
+    """Run a GET for `key` through the full ASGI app in-process.
+
+    Returns the status and the identity (uncompressed) body.
+    """
+    path, _, query = key.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": query.encode(),
+        "headers": [(b"host", b"warmup")],
+        "client": None,
+        "server": None,
+        WARMUP_SCOPE_KEY: True,
+    }
+    status = 0
+    chunks: List[bytes] = []
+    requested = False
+    finished = asyncio.Event()
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Like a real server: block until the response is done, then disconnect.
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                finished.set()
+
+    await app(scope, receive, send)
+    return status, b"".join(chunks)
+
+
+async def replay(app, log: AccessLog = access_log) -> int:
+    """Replay the top keys against `app`; return how many returned 200."""
+    if REPLAY_TOP <= 0:
+        return 0
+    log.load()
+    deadline = time.monotonic() + REPLAY_BUDGET_SECONDS
+    warmed = 0
+    for key in log.top(REPLAY_TOP):
+        if time.monotonic() > deadline:
+            break
+        try:
+            status, _ = await dispatch(app, key)
+            if status == 200:
+                warmed += 1
+        except Exception:
+            # A stale key (e.g. removed route) must never block startup.
+            continue
+    # Replay may run in a throwaway loop (pre-fork); finish the variants first.
+    await response_cache.drain()
+    return warmed
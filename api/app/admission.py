@@ -0,0 +1,200 @@
+"""Admission control and load shedding for API routes.
+
+Each `/api/...` request is classified as `lookup` (point reads), `scan` (filtered
+aggregates over a season) or `bulk` (large or unfiltered datasets). A class
+admits a bounded number of concurrent requests; the rest wait in a bounded
+queue, and requests that find the queue full (or wait too long) get 503 with
+`Retry-After`. Classes are isolated, so a burst of bulk calls cannot take the
+slots that cheap lookups need. Cache hits are answered before admission.
+
+Env vars:
+- ADMISSION_LIMITS: concurrent requests per class (default `lookup=16,scan=4,bulk=2`;
+  0 sheds every request of the class)
+- ADMISSION_QUEUE: waiting requests per class (default `lookup=64,scan=16,bulk=4`)
+- ADMISSION_ROUTE_CLASSES: extra `path_prefix=class` overrides
+- ADMISSION_QUEUE_TIMEOUT_SECONDS: max wait before shedding (default 10)
+- ADMISSION_RETRY_AFTER_SECONDS: value of the Retry-After header (default 1)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import Dict
+
+from .cache import UNCACHED_PATHS
+from .settings import match_prefix, parse_mapping
+
+CLASSES = ("lookup", "scan", "bulk")
+
+# Longest prefix wins; unmatched `/api/` paths are lookups.
+ROUTE_CLASSES: Dict[str, str] = {
+    "/api/analytics": "scan",
+    "/api/analytics/value-perf": "bulk",
+    "/api/compare": "scan",
+    "/api/formations/history": "bulk",
+    "/api/formations/league": "scan",
+    "/api/league-stats": "scan",
+    "/api/managers/best-formations": "scan",
+    "/api/managers/formation": "scan",
+    "/api/managers/performance": "bulk",
+    "/api/market/movers": "scan",
+    "/api/players/leaders": "scan",
+    "/api/players/top": "scan",
+    "/api/search": "scan",
+    "/api/transfers/age-fee-profile": "bulk",
+    "/api/transfers/competition-summary": "scan",
+    "/api/transfers/free-vs-paid": "scan",
+    "/api/transfers/top-spenders": "scan",
+}
+ROUTE_CLASSES.update(
+    {
+        prefix: cls
+        for prefix, cls in parse_mapping(
+            os.getenv("ADMISSION_ROUTE_CLASSES", "")
+        ).items()
+        if prefix.startswith("/") and cls in CLASSES
+    }
+)
+
+
+def _class_ints(name: str, default: str) -> Dict[str, int]:
+    values = {cls: int(v) for cls, v in parse_mapping(default).items()}
+    for cls, v in parse_mapping(os.getenv(name, "")).items():
+        if cls in CLASSES:
+            values[cls] = max(0, int(v))
+    return values
+
+
+LIMITS = _class_ints("ADMISSION_LIMITS", "lookup=16,scan=4,bulk=2")
+QUEUE = _class_ints("ADMISSION_QUEUE", "lookup=64,scan=16,bulk=4")
+QUEUE_TIMEOUT_SECONDS = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "10"))
+RETRY_AFTER_SECONDS = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "1"))
+
+
+def route_class(path: str) -> str:
+    """Return the priority class for a request path."""
+    prefix = match_prefix(ROUTE_CLASSES, path)
+    return ROUTE_CLASSES[prefix] if prefix else "lookup"
+
+
+class Gate:
+    """Concurrency limit plus bounded wait queue for one class.
+
+    Only touched from the event loop, so plain counters are safe.
+    """
+
+    def __init__(self, limit: int, queue: int) -> None:
+        self.limit = limit
+        self.queue = queue
+        self._sem = asyncio.Semaphore(limit)
+        self.active = 0
+        self.waiting = 0
+        self.max_waiting = 0
+        self.admitted = 0
+        self.shed = 0
+        self.timed_out = 0
+
+    async def acquire(self) -> bool:
+        """Take a slot; return False if the request should be shed."""
+        if self.limit < 1:
+            # Class switched off: shed without queueing.
+            self.shed += 1
+            return False
+        if not self._sem.locked():
+            # A free slot is taken without suspending.
+            await self._sem.acquire()
+        elif self.waiting >= self.queue:
+            self.shed += 1
+            return False
+        else:
+            self.waiting += 1
+            self.max_waiting = max(self.max_waiting, self.waiting)
+            try:
+                await asyncio.wait_for(self._sem.acquire(), QUEUE_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                self.shed += 1
+                self.timed_out += 1
+                return False
+            finally:
+                self.waiting -= 1
+        self.active += 1
+        self.admitted += 1
+        return True
+
+    def release(self) -> None:
+        self.active -= 1
+        self._sem.release()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "limit": self.limit,
+            "queue_limit": self.queue,
+            "active": self.active,
+            "queue_depth": self.waiting,
+            "max_queue_depth": self.max_waiting,
+            "admitted": self.admitted,
+            "shed": self.shed,
+            "timed_out": self.timed_out,
+        }
+
+
+class AdmissionController:
+    """Per-class gates keyed by route class."""
+
+    def __init__(self, limits: Dict[str, int], queue: Dict[str, int]) -> None:
+        self.limits = limits
+        self.queue = queue
+        self.reset()
+
+    def reset(self) -> None:
+        """Start with fresh gates (e.g. in a forked worker with its own loop)."""
+        self.gates = {cls: Gate(self.limits[cls], self.queue[cls]) for cls in CLASSES}
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {cls: gate.stats() for cls, gate in self.gates.items()}
+
+
+admission = AdmissionController(LIMITS, QUEUE)
+
+
+class AdmissionMiddleware:
+    """ASGI middleware admitting `/api/` requests through their class gate."""
+
+    def __init__(self, app, controller: AdmissionController = admission) -> None:
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path", "")
+        if (
+            scope["type"] != "http"
+            or not path.startswith("/api/")
+            or path in UNCACHED_PATHS
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        gate = self.controller.gates[route_class(path)]
+        if not await gate.acquire():
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 503,
+                    "headers": [
+                        (b"content-type", b"application/json"),
+                        (b"retry-after", str(RETRY_AFTER_SECONDS).encode()),
+                    ],
+                }
+            )
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": b'{"detail":"Server busy, retry later"}',
+                }
+            )
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            gate.release()
@@ -0,0 +1,246 @@
+"""In-memory response cache for read-only GET endpoints.
+
+The serving DB is immutable for the lifetime of a process, so a successful
+response for a given request key (path + canonical query string) can be reused
+until the process restarts with a new DB. An optional lower tier (see
+`diskcache`) is consulted on memory misses and filled on every store, from a
+worker thread so SQLite never blocks the event loop. Entries
+carry precompressed gzip/brotli variants (see `compression`); hits are answered
+with the one the client accepts. A miss is answered right away and cached
+without variants; the high-quality variants are built in a background task
+that then stores the complete entry (in both tiers).
+
+Env vars:
+- RESPONSE_CACHE_MAX_ENTRIES: max cached responses (default 4096, 0 disables)
+- RESPONSE_CACHE_MAX_BYTES: max total body bytes held (default 128 MiB)
+- RESPONSE_PRECOMPRESS_TASKS: variant builds running at once (default 1)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+import anyio
+
+from .compression import (
+    COMPRESSION,
+    COMPRESSION_MIN_BYTES,
+    accept_encoding,
+    encode_variants,
+    encoded_headers,
+    negotiate,
+)
+
+PRECOMPRESS_TASKS = max(1, int(os.getenv("RESPONSE_PRECOMPRESS_TASKS", "1")))
+
+# Probes and build metadata must always reflect the live process.
+UNCACHED_PATHS = {"/api/health", "/api/version", "/api/limits", "/api/metrics"}
+
+Headers = List[Tuple[bytes, bytes]]
+# (status, headers, identity body, {content-encoding: encoded body})
+Entry = Tuple[int, Headers, bytes, Dict[str, bytes]]
+
+
+def entry_size(entry: Entry) -> int:
+    return len(entry[2]) + sum(len(data) for data in entry[3].values())
+
+
+def request_key(path: str, query_string: bytes | str = b"") -> str:
+    """Return the canonical cache key for a GET request.
+
+    Query params are sorted so `?a=1&b=2` and `?b=2&a=1` share one entry.
+    """
+    if isinstance(query_string, bytes):
+        query_string = query_string.decode("latin-1")
+    params = sorted(parse_qsl(query_string, keep_blank_values=True))
+    return f"{path}?{urlencode(params)}" if params else path
+
+
+def is_cacheable(scope: dict) -> bool:
+    """Return True for GET requests against cacheable API paths."""
+    if scope["type"] != "http" or scope["method"] != "GET":
+        return False
+    path = scope["path"]
+    return path.startswith("/api/") and path not in UNCACHED_PATHS
+
+
+class ResponseCache:
+    """Thread-safe LRU of `(status, headers, body)` bounded by entries and bytes."""
+
+    def __init__(self, max_entries: int, max_bytes: int) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[str, Entry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        # Optional slower tier with the same get/put/stats interface.
+        self.lower = None
+        # Background variant builds; the semaphore belongs to the loop that made it.
+        self._pending: Set[asyncio.Task] = set()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def memory_enabled(self) -> bool:
+        return self.max_entries > 0 and self.max_bytes > 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.memory_enabled or self.lower is not None
+
+    async def get(self, key: str) -> Optional[Entry]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+        if self.lower is None:
+            return None
+        entry = await anyio.to_thread.run_sync(self.lower.get, key)
+        if entry is not None:
+            self._put_memory(key, entry)
+        return entry
+
+    async def put(self, key: str, entry: Entry, lower: bool = True) -> None:
+        self._put_memory(key, entry)
+        if lower and self.lower is not None:
+            await anyio.to_thread.run_sync(self.lower.put, key, entry)
+
+    def precompress(self, key: str, entry: Entry) -> None:
+        """Build the stored variants of `entry` in the background, then store it."""
+        loop = asyncio.get_running_loop()
+        if self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(PRECOMPRESS_TASKS)
+            self._slots_loop = loop
+        task = loop.create_task(self._precompress(key, entry))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _precompress(self, key: str, entry: Entry) -> None:
+        status, headers, body, _ = entry
+        async with self._slots:
+            encoded = await anyio.to_thread.run_sync(encode_variants, body)
+        await self.put(key, (status, headers, body, encoded))
+
+    async def drain(self) -> None:
+        """Wait for pending variant builds (e.g. before the warm-up loop ends)."""
+        while self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+    def _put_memory(self, key: str, entry: Entry) -> None:
+        size = entry_size(entry)
+        if not self.memory_enabled or size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= entry_size(old)
+            self._data[key] = entry
+            self._bytes += size
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._data.popitem(last=False)
+                self._bytes -= entry_size(evicted)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            out: Dict[str, object] = {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+        if self.lower is not None:
+            out["disk"] = self.lower.stats()
+        return out
+
+
+response_cache = ResponseCache(
+    max_entries=int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "4096")),
+    max_bytes=int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(128 * 1024 * 1024))),
+)
+
+
+async def _send_entry(send, entry: Entry, accept: str, cache_status: bytes) -> None:
+    status, headers, body, encoded = entry
+    encoding = negotiate(accept, encoded)
+    if encoding is not None:
+        body = encoded[encoding]
+    if encoded:
+        headers = encoded_headers(headers, encoding, len(body))
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [*headers, (b"x-cache", cache_status)],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+class ResponseCacheMiddleware:
+    """ASGI middleware serving 200 responses for cacheable GETs from the cache.
+
+    Responses to store are buffered, sent unencoded (`CompressionMiddleware`
+    encodes them for the client) and cached; their stored variants follow in
+    the background.
+    """
+
+    def __init__(self, app, cache: ResponseCache = response_cache) -> None:
+        self.app = app
+        self.cache = cache
+
+    async def __call__(self, scope, receive, send):
+        if not self.cache.enabled or not is_cacheable(scope):
+            await self.app(scope, receive, send)
+            return
+
+        key = request_key(scope["path"], scope.get("query_string", b""))
+        accept = accept_encoding(scope)
+        hit = await self.cache.get(key)
+        if hit is not None:
+            await _send_entry(send, hit, accept, b"hit")
+            return
+
+        start: dict = {}
+        chunks: List[bytes] = []
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                start.update(message)
+                if message["status"] == 200:
+                    return
+                message = {
+                    **message,
+                    "headers": [*message.get("headers", []), (b"x-cache", b"miss")],
+                }
+            elif message["type"] == "http.response.body" and start.get("status") == 200:
+                chunks.append(message.get("body", b""))
+                if message.get("more_body", False):
+                    return
+                body = b"".join(chunks)
+                entry = (200, list(start.get("headers", [])), body, {})
+                if COMPRESSION and len(body) >= COMPRESSION_MIN_BYTES:
+                    # The disk tier gets the entry once its variants exist.
+                    await self.cache.put(key, entry, lower=False)
+                    await _send_entry(send, entry, accept, b"miss")
+                    self.cache.precompress(key, entry)
+                else:
+                    await _send_entry(send, entry, accept, b"miss")
+                    await self.cache.put(key, entry)
+                return
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,188 @@
+"""Content-encoding negotiation and precompressed response variants.
+
+Cached responses are stored with their gzip and brotli encodings next to the
+identity body (see `cache`), so compression runs once per request key and DB
+version at a high level, and hits only pick the variant the client accepts.
+Those variants are built in the background after the miss is answered; until
+then, and for every response that is not cached, `CompressionMiddleware`
+encodes the body for the requesting client at a fast level.
+Brotli is optional: without the `brotli` package only gzip is produced.
+
+Env vars:
+- RESPONSE_COMPRESSION: produce encoded responses (default true)
+- COMPRESSION_MIN_BYTES: smallest body worth encoding (default 512)
+- GZIP_LEVEL: zlib level for stored gzip variants (default 9)
+- BROTLI_QUALITY: brotli quality for stored br variants (default 11)
+- GZIP_FAST_LEVEL: zlib level on the request path (default 6)
+- BROTLI_FAST_QUALITY: brotli quality on the request path (default 4)
+"""
+
+from __future__ import annotations
+
+import os
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+import anyio
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+Headers = List[Tuple[bytes, bytes]]
+
+COMPRESSION = os.getenv("RESPONSE_COMPRESSION", "true").lower() in ("1", "true", "yes")
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "512"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "9"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "11"))
+GZIP_FAST_LEVEL = int(os.getenv("GZIP_FAST_LEVEL", "6"))
+BROTLI_FAST_QUALITY = int(os.getenv("BROTLI_FAST_QUALITY", "4"))
+
+# Server preference when the client accepts several encodings equally.
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def gzip_bytes(body: bytes, level: int = GZIP_LEVEL) -> bytes:
+    # wbits=31 writes a gzip container; mtime stays 0 so output is reproducible.
+    z = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return z.compress(body) + z.flush()
+
+
+def encode_fast(body: bytes, encoding: str) -> bytes:
+    """Encode `body` with `encoding` at the request-path level."""
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_FAST_QUALITY)
+    return gzip_bytes(body, GZIP_FAST_LEVEL)
+
+
+def encode_variants(body: bytes) -> Dict[str, bytes]:
+    """Return `{encoding: encoded_body}` for every encoding that shrinks `body`."""
+    if not COMPRESSION or len(body) < COMPRESSION_MIN_BYTES:
+        return {}
+    out = {"gzip": gzip_bytes(body)}
+    if brotli is not None:
+        out["br"] = brotli.compress(body, quality=BROTLI_QUALITY)
+    return {enc: data for enc, data in out.items() if len(data) < len(body)}
+
+
+def _accepted(header: str) -> Dict[str, float]:
+    accepted: Dict[str, float] = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[name] = q
+    return accepted
+
+
+def negotiate(accept_encoding: str, available) -> Optional[str]:
+    """Pick the encoding to send from `available`, or None for identity."""
+    if not accept_encoding:
+        return None
+    accepted = _accepted(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    best, best_q = None, 0.0
+    for enc in ENCODINGS:
+        if enc not in available:
+            continue
+        q = accepted.get(enc, wildcard)
+        if q > best_q:
+            best, best_q = enc, q
+    return best
+
+
+def accept_encoding(scope: dict) -> str:
+    for name, value in scope.get("headers", []):
+        if name == b"accept-encoding":
+            return value.decode("latin-1")
+    return ""
+
+
+def with_vary(headers: Headers) -> Headers:
+    """Return `headers` with `Vary: Accept-Encoding`, added once."""
+    for k, v in headers:
+        if k == b"vary" and b"accept-encoding" in v.lower():
+            return headers
+    return [*headers, (b"vary", b"Accept-Encoding")]
+
+
+def encoded_headers(headers: Headers, encoding: Optional[str], size: int) -> Headers:
+    """Return `headers` for a body of `size` bytes sent with `encoding`."""
+    out = [(k, v) for k, v in headers if k != b"content-length"]
+    out.append((b"content-length", str(size).encode()))
+    out = with_vary(out)
+    if encoding is not None:
+        out.append((b"content-encoding", encoding.encode()))
+    return out
+
+
+class CompressionMiddleware:
+    """ASGI middleware encoding responses that are not already encoded.
+
+    Precompressed cache and snapshot hits pass through untouched; everything
+    else at least `COMPRESSION_MIN_BYTES` long is buffered and encoded once,
+    off the event loop, with the client's preferred encoding. Every response
+    carries `Vary: Accept-Encoding`, encoded or not, so shared caches never
+    hand an identity body stored for one client to another.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not COMPRESSION:
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(accept_encoding(scope), ENCODINGS)
+        if encoding is None:
+
+            async def send_vary(message):
+                if message["type"] == "http.response.start":
+                    headers = with_vary(list(message.get("headers", [])))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_vary)
+            return
+
+        start: dict = {}
+        chunks: List[bytes] = []
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal passthrough
+            if message["type"] == "http.response.start":
+                headers = message.get("headers", [])
+                passthrough = any(k == b"content-encoding" for k, _ in headers)
+                if passthrough:
+                    await send({**message, "headers": with_vary(list(headers))})
+                else:
+                    start.update(message)
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            body = b"".join(chunks)
+            headers = with_vary(list(start.get("headers", [])))
+            if len(body) >= COMPRESSION_MIN_BYTES:
+                encoded = await anyio.to_thread.run_sync(encode_fast, body, encoding)
+                if len(encoded) < len(body):
+                    body = encoded
+                    headers = encoded_headers(headers, encoding, len(body))
+            await send({**start, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
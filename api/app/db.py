@@ -1,7 +1,23 @@
+import functools
+import hashlib
+import logging
 import os
 import pathlib
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
 import duckdb
 
+from .deadline import QueryCancelled, current_request
+from .executor import run_in_executor
+from .queries import QUERIES, timings
+from .settings import settings
+from .singleflight import flights
+
 ENV = os.getenv("ENV", "dev").lower()
 BASE_DIR = pathlib.Path(__file__).resolve().parents[2]
 _DEFAULT_DEV = "warehouse/transfermarkt_serving.duckdb"
@@ -12,11 +28,496 @@ LOCAL_DB = (
     else os.getenv("DEV_DB_PATH", _DEFAULT_DEV)
 )
 
+# Serving mode: "disk" opens the file read-only in place, "memory" copies it into
+# an in-memory DuckDB at startup, "shm" copies the file to tmpfs and opens it there.
+DB_MODE = os.getenv("DB_MODE", "disk").lower()
+DB_SHM_DIR = os.getenv("DB_SHM_DIR", "/dev/shm")
+# Hard cap for RAM modes in bytes (0 = derive from available memory only).
+DB_RAM_MAX_BYTES = int(os.getenv("DB_RAM_MAX_BYTES", "0"))
+# In-memory tables are stored less compactly than the on-disk file.
+DB_RAM_OVERHEAD = float(os.getenv("DB_RAM_OVERHEAD", "2.0"))
+# Idle cursors kept per lane; prepared statements live on each cursor.
+DUCKDB_POOL_SIZE = int(os.getenv("DUCKDB_POOL_SIZE", "16"))
+# Run parameterless registered queries as PREPARE/EXECUTE (false: plain execute).
+QUERY_PREPARE = os.getenv("QUERY_PREPARE", "true").lower() in ("1", "true", "yes")
+# Results kept for registered queries with cache="memo".
+QUERY_MEMO_MAX_ENTRIES = int(os.getenv("QUERY_MEMO_MAX_ENTRIES", "1024"))
+
+logger = logging.getLogger("api.db")
 
-def get_conn() -> duckdb.DuckDBPyConnection:
-    """Return DuckDB read-only connection."""
-    db_path = LOCAL_DB
+_database: Optional[duckdb.DuckDBPyConnection] = None
+_active_mode: Optional[str] = None
+_active_path: Optional[str] = None
+# Mode and path resolved in the gunicorn master; forked workers reopen exactly
+# these instead of deciding (and staging) again. Set by `close_db(pin=True)`.
+_pinned: Optional[Tuple[str, str]] = None
+# Extra instances keyed by thread count for DUCKDB_ROUTE_THREADS overrides.
+_lanes: Dict[int, duckdb.DuckDBPyConnection] = {}
+_lock = threading.Lock()
+# Path of the request being served; set by `RequestPathMiddleware`.
+request_path: ContextVar[Optional[str]] = ContextVar("request_path", default=None)
+
+
+def db_path() -> str:
+    """Return the absolute path of the serving DB for the current ENV."""
+    path = LOCAL_DB
     # If dev and path is relative, resolve under repo root for convenience.
-    if not pathlib.Path(db_path).is_absolute():
-        db_path = str((BASE_DIR / db_path).resolve())
-    return duckdb.connect(db_path, read_only=True)
+    if not pathlib.Path(path).is_absolute():
+        path = str((BASE_DIR / path).resolve())
+    return path
+
+
+def _available_memory() -> Optional[int]:
+    """Return bytes of memory still available to this process, if known.
+
+    Uses the cgroup v2 limit when running in a container, else MemAvailable.
+    """
+    try:
+        limit = pathlib.Path("/sys/fs/cgroup/memory.max").read_text().strip()
+        if limit != "max":
+            used = int(pathlib.Path("/sys/fs/cgroup/memory.current").read_text())
+            return int(limit) - used
+    except (OSError, ValueError):
+        pass
+    try:
+        for line in pathlib.Path("/proc/meminfo").read_text().splitlines():
+            if line.startswith("MemAvailable:"):
+                return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _fits_in_ram(required: int) -> bool:
+    """Return True if `required` bytes fit under the RAM cap and free memory."""
+    if DB_RAM_MAX_BYTES and required > DB_RAM_MAX_BYTES:
+        return False
+    available = _available_memory()
+    return available is None or required < available
+
+
+def _open_disk(path: str) -> duckdb.DuckDBPyConnection:
+    return duckdb.connect(path, read_only=True, config=settings.config())
+
+
+def _open_lane(path: str, threads: int) -> duckdb.DuckDBPyConnection:
+    """Open a separate instance with `threads` that attaches the file read-only.
+
+    Connecting to the same path again would reuse the cached instance (and its
+    thread count), so the lane starts in memory and attaches the file instead.
+    """
+    con = duckdb.connect(":memory:", config=settings.config(threads))
+    try:
+        quoted = path.replace("'", "''")
+        con.execute(f"ATTACH '{quoted}' AS serving (READ_ONLY)")
+    except Exception:
+        con.close()
+        raise
+    return con
+
+
+def _open_memory(path: str) -> duckdb.DuckDBPyConnection:
+    """Copy every table and view of the serving DB into an in-memory DuckDB."""
+    con = duckdb.connect(":memory:", config=settings.config())
+    try:
+        quoted = path.replace("'", "''")
+        con.execute(f"ATTACH '{quoted}' AS serving (READ_ONLY)")
+        con.execute("COPY FROM DATABASE serving TO memory")
+        con.execute("DETACH serving")
+    except Exception:
+        con.close()
+        raise
+    return con
+
+
+def _stage_shm(path: str) -> str:
+    """Copy the DB file to tmpfs (once per file version) and return the copy.
+
+    The copy is named by `db_fingerprint()`, the same hash that keys the caches
+    and snapshots, so a new release never reuses an older copy. The copy is
+    hashed as it is written and discarded if it does not match. Copies of other
+    versions are removed; processes still serving them keep their open handle.
+    """
+    src = pathlib.Path(path)
+    sha = db_fingerprint()
+    dst = pathlib.Path(DB_SHM_DIR) / f"{src.stem}-{sha[:16]}{src.suffix}"
+    st = src.stat()
+    # Older releases staged the copy under the source's own name.
+    staged = [*pathlib.Path(DB_SHM_DIR).glob(f"{src.stem}-*{src.suffix}")]
+    for stale in [pathlib.Path(DB_SHM_DIR) / src.name, *staged]:
+        if stale != dst:
+            stale.unlink(missing_ok=True)
+    if not (dst.exists() and dst.stat().st_size == st.st_size):
+        if shutil.disk_usage(DB_SHM_DIR).free < st.st_size * 1.1:
+            raise OSError(f"Not enough space in {DB_SHM_DIR} for {src.name}")
+        tmp = dst.with_suffix(dst.suffix + f".{os.getpid()}.part")
+        h = hashlib.sha256()
+        try:
+            with src.open("rb") as fin, tmp.open("wb") as fout:
+                for chunk in iter(lambda: fin.read(1024 * 1024), b""):
+                    h.update(chunk)
+                    fout.write(chunk)
+            if h.hexdigest() != sha:
+                raise OSError(f"{src.name} changed while staging to {DB_SHM_DIR}")
+            tmp.replace(dst)
+        finally:
+            tmp.unlink(missing_ok=True)
+    return str(dst)
+
+
+def init_db(mode: Optional[str] = None) -> str:
+    """Open the shared serving database once and return the effective mode.
+
+    RAM modes fall back to disk when the DB would not fit in memory or the copy
+    fails (e.g. DuckDB hits its memory limit or tmpfs is full).
+    """
+    global _database, _active_mode, _active_path
+    with _lock:
+        if _database is not None:
+            return _active_mode
+        if _pinned is not None:
+            mode, path = _pinned
+            con = _open_memory(path) if mode == "memory" else _open_disk(path)
+            _database, _active_mode, _active_path = con, mode, path
+            _open_lanes(path if mode != "memory" else None)
+            return mode
+        path = db_path()
+        mode = (mode or DB_MODE).lower()
+        size = pathlib.Path(path).stat().st_size
+        con = None
+        if mode in ("memory", "shm"):
+            factor = DB_RAM_OVERHEAD if mode == "memory" else 1.0
+            if not _fits_in_ram(int(size * factor)):
+                logger.warning("DB_MODE=%s does not fit in RAM; using disk", mode)
+            else:
+                try:
+                    if mode == "memory":
+                        con = _open_memory(path)
+                    else:
+                        path = _stage_shm(path)
+                        con = _open_disk(path)
+                except (duckdb.Error, OSError) as exc:
+                    logger.warning("DB_MODE=%s failed (%s); using disk", mode, exc)
+        if con is None:
+            mode, path = "disk", db_path()
+            con = _open_disk(path)
+        _database, _active_mode, _active_path = con, mode, path
+        _open_lanes(path if mode != "memory" else None)
+        return mode
+
+
+def close_db(pin: bool = False) -> None:
+    """Close the serving DB, its lanes and pooled cursors.
+
+    DuckDB instances own threads and must not cross a fork, so the gunicorn
+    master calls this after warming up. With `pin`, the next `init_db` (in each
+    worker) reopens the same mode and path.
+    """
+    global _database, _pinned
+    with _lock:
+        for idle in _idle.values():
+            for pooled in idle:
+                pooled.cur.close()
+        _idle.clear()
+        for lane in _lanes.values():
+            lane.close()
+        _lanes.clear()
+        if _database is None:
+            return
+        if pin:
+            _pinned = (_active_mode, _active_path)
+        _database.close()
+        _database = None
+
+
+def _open_lanes(path: Optional[str]) -> None:
+    """Open one instance per distinct route thread override."""
+    wanted = set(settings.route_threads.values()) - {settings.threads}
+    if not wanted:
+        return
+    if path is None:
+        # Each lane would need its own full copy of the DB in RAM.
+        logger.info("DUCKDB_ROUTE_THREADS ignored with DB_MODE=memory")
+        return
+    for threads in sorted(wanted):
+        try:
+            _lanes[threads] = _open_lane(path, threads)
+        except duckdb.Error as exc:
+            logger.warning("Thread lane %s failed (%s); using default", threads, exc)
+
+
+def active_mode() -> Optional[str]:
+    """Return the serving mode in effect, or None before `init_db`."""
+    return _active_mode
+
+
+def lanes() -> Dict[int, str]:
+    """Return the open thread lanes as `{threads: "default"|"route"}`."""
+    out = {settings.threads: "default"} if _database is not None else {}
+    out.update({threads: "route" for threads in _lanes})
+    return out
+
+
+def _lane_key(path: Optional[str]) -> int:
+    threads = settings.threads_for(path or request_path.get())
+    return threads if threads in _lanes else settings.threads
+
+
+def _cursor(lane_key: int) -> duckdb.DuckDBPyConnection:
+    if _database is None:
+        init_db()
+    lane = _lanes.get(lane_key)
+    with _lock:
+        if lane is None:
+            return _database.cursor()
+        cur = lane.cursor()
+    # Cursors start on the lane's in-memory catalog.
+    cur.execute("USE serving")
+    return cur
+
+
+def get_conn(path: Optional[str] = None) -> duckdb.DuckDBPyConnection:
+    """Return a read-only cursor on the serving DB.
+
+    The cursor comes from the thread lane configured for `path` (default: the
+    current request path), or from the shared default instance.
+    """
+    return _cursor(_lane_key(path))
+
+
+class _Pooled:
+    """A reusable cursor and the statements already prepared on it."""
+
+    __slots__ = ("cur", "lane", "prepared")
+
+    def __init__(self, cur: duckdb.DuckDBPyConnection, lane: int) -> None:
+        self.cur = cur
+        self.lane = lane
+        self.prepared: set = set()
+
+
+_idle: Dict[int, List[_Pooled]] = {}
+
+
+def _acquire() -> _Pooled:
+    lane = _lane_key(None)
+    with _lock:
+        idle = _idle.get(lane)
+        if idle:
+            return idle.pop()
+    return _Pooled(_cursor(lane), lane)
+
+
+def _release(pooled: _Pooled, reusable: bool) -> None:
+    if reusable:
+        with _lock:
+            idle = _idle.setdefault(pooled.lane, [])
+            if len(idle) < DUCKDB_POOL_SIZE:
+                idle.append(pooled)
+                return
+    pooled.cur.close()
+
+
+def _execute(
+    sql: str,
+    params: Sequence[Any],
+    one: bool,
+    statement: Optional[str] = None,
+):
+    """Run `sql` on a pooled cursor, always binding `params`.
+
+    DuckDB cannot bind parameters to `EXECUTE`, so only named statements
+    without parameters are prepared once per cursor.
+    """
+    # The cursor is registered on the request so a deadline or client
+    # disconnect can interrupt it from the event loop.
+    ctx = current_request.get()
+    pooled = _acquire()
+    con = pooled.cur
+    reusable = False
+    try:
+        if ctx is not None:
+            ctx.attach(con)
+        if params or not (statement and QUERY_PREPARE):
+            cur = con.execute(sql, list(params))
+        else:
+            if statement not in pooled.prepared:
+                con.execute(f"PREPARE {statement} AS {sql}")
+                pooled.prepared.add(statement)
+            cur = con.execute(f"EXECUTE {statement}")
+        result = cur.fetchone() if one else cur.fetchall()
+        reusable = True
+        return result
+    except duckdb.InterruptException as exc:
+        raise QueryCancelled(ctx.reason if ctx else "interrupted") from exc
+    finally:
+        if ctx is not None:
+            ctx.detach(con)
+        # Interrupted or failed cursors are dropped rather than reused.
+        _release(pooled, reusable)
+
+
+def _key(params: Tuple[Any, ...]) -> Tuple[Any, ...]:
+    # List params (e.g. id lists) must be hashable to key single-flight/memo.
+    return tuple(tuple(p) if isinstance(p, list) else p for p in params)
+
+
+def _coalesced(key: tuple, fn):
+    ctx = current_request.get()
+    # A leader cancelled by its own deadline or disconnect hands the query to a
+    # waiting request instead of failing it with 504.
+    try:
+        return flights.do(
+            key,
+            fn,
+            timeout=ctx.remaining() if ctx is not None else None,
+            retry_on=(QueryCancelled,),
+        )
+    except TimeoutError as exc:
+        raise QueryCancelled("deadline") from exc
+
+
+def fetchall(sql: str, params: Optional[Sequence[Any]] = None) -> List[tuple]:
+    """Run ad-hoc read SQL and return all rows.
+
+    Identical concurrent calls (same SQL and params) share one execution. Raises
+    `QueryCancelled` when the request's deadline passes or its client leaves.
+    Routers should prefer registered queries (`query`).
+    """
+    params = tuple(params or ())
+    return _coalesced(("all", sql, _key(params)), lambda: _execute(sql, params, False))
+
+
+def fetchone(sql: str, params: Optional[Sequence[Any]] = None) -> Optional[tuple]:
+    """Run ad-hoc read SQL and return the first row, like `fetchall`."""
+    params = tuple(params or ())
+    return _coalesced(("one", sql, _key(params)), lambda: _execute(sql, params, True))
+
+
+class _Memo:
+    """Thread-safe LRU of registered query results, bounded by entry count."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._data: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Tuple[bool, Any]:
+        with self._lock:
+            if key not in self._data:
+                return False, None
+            self._data.move_to_end(key)
+            return True, self._data[key]
+
+    def put(self, key: tuple, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+
+_memo = _Memo(QUERY_MEMO_MAX_ENTRIES)
+
+
+def _run_named(
+    name: str, params: Optional[Sequence[Any]], variant: Optional[str], one: bool
+):
+    spec = QUERIES[name]
+    statement, sql = spec.statement(variant)
+    params = tuple(params or ())
+    key = (statement, one, _key(params))
+    executed = False
+
+    def run():
+        nonlocal executed
+        executed = True
+        return _execute(sql, params, one, statement)
+
+    start = time.perf_counter()
+    try:
+        if spec.cache == "memo":
+            found, result = _memo.get(key)
+            if found:
+                return result
+            result = _coalesced(key, run)
+            _memo.put(key, result)
+            return result
+        if spec.cache == "flight":
+            return _coalesced(key, run)
+        return run()
+    finally:
+        timings.record(name, (time.perf_counter() - start) * 1000, executed)
+
+
+def query(
+    name: str,
+    params: Optional[Sequence[Any]] = None,
+    variant: Optional[str] = None,
+) -> List[tuple]:
+    """Run a registered query (see `queries`) and return all rows."""
+    return _run_named(name, params, variant, False)
+
+
+def query_one(
+    name: str,
+    params: Optional[Sequence[Any]] = None,
+    variant: Optional[str] = None,
+) -> Optional[tuple]:
+    """Run a registered query and return the first row."""
+    return _run_named(name, params, variant, True)
+
+
+async def aquery(
+    name: str,
+    params: Optional[Sequence[Any]] = None,
+    variant: Optional[str] = None,
+) -> List[tuple]:
+    """Async `query`: runs on the DuckDB executor, keeping the event loop free."""
+    return await run_in_executor(query, name, params, variant)
+
+
+async def aquery_one(
+    name: str,
+    params: Optional[Sequence[Any]] = None,
+    variant: Optional[str] = None,
+) -> Optional[tuple]:
+    """Async `query_one`."""
+    return await run_in_executor(query_one, name, params, variant)
+
+
+class RequestPathMiddleware:
+    """ASGI middleware exposing the request path to `get_conn` via a contextvar."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = request_path.set(scope["path"])
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            request_path.reset(token)
+
+
+@functools.lru_cache(maxsize=1)
+def db_fingerprint() -> str:
+    """Return the SHA256 of the serving DB.
+
+    Prefers the `.sha256` sidecar written by startup_db when it is at least as new
+    as the DB file; otherwise hashes the file in 1MB chunks.
+    """
+    path = pathlib.Path(db_path())
+    sidecar = path.with_suffix(path.suffix + ".sha256")
+    if sidecar.exists() and sidecar.stat().st_mtime >= path.stat().st_mtime:
+        return sidecar.read_text().strip().split()[0].lower()
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
@@ -0,0 +1,141 @@
+"""Per-request deadlines and cancellation of running DuckDB queries.
+
+Every `/api/` request gets a deadline (configurable per route prefix). DuckDB
+cursors used on behalf of the request are registered on its context; when the
+deadline passes or the HTTP client disconnects, `interrupt()` is called on them
+so the worker thread is freed, and the request is answered with 504.
+
+Env vars:
+- REQUEST_DEADLINE_SECONDS: default deadline (default 15, below the app's
+  20s client timeout; 0 disables)
+- ROUTE_DEADLINES: comma-separated `path_prefix=seconds` overrides
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+from .cache import UNCACHED_PATHS
+from .settings import match_prefix, parse_mapping
+
+DEFAULT_DEADLINE_SECONDS = float(os.getenv("REQUEST_DEADLINE_SECONDS", "15"))
+ROUTE_DEADLINES = {
+    prefix: float(value)
+    for prefix, value in parse_mapping(os.getenv("ROUTE_DEADLINES", "")).items()
+    if prefix.startswith("/")
+}
+
+
+def deadline_for(path: str) -> float:
+    """Return the deadline in seconds for a request path (0 = none)."""
+    prefix = match_prefix(ROUTE_DEADLINES, path)
+    return ROUTE_DEADLINES[prefix] if prefix else DEFAULT_DEADLINE_SECONDS
+
+
+class QueryCancelled(Exception):
+    """Raised in the handler thread when its request was cancelled."""
+
+    def __init__(self, reason: str) -> None:
+        super().__init__(reason)
+        self.reason = reason
+
+
+class RequestContext:
+    """Deadline, cancellation state and live cursors of one request."""
+
+    def __init__(self, seconds: float) -> None:
+        self.expires = time.monotonic() + seconds if seconds > 0 else None
+        self.reason: Optional[str] = None
+        self._cursors: set = set()
+        self._lock = threading.Lock()
+
+    def remaining(self) -> Optional[float]:
+        if self.expires is None:
+            return None
+        return max(0.0, self.expires - time.monotonic())
+
+    def cancel(self, reason: str) -> None:
+        """Mark the request cancelled and interrupt its running queries."""
+        # interrupt() only sets a flag; holding the lock keeps a cursor that was
+        # just detached (and possibly reused by another request) untouched.
+        with self._lock:
+            if self.reason is not None:
+                return
+            self.reason = reason
+            for cur in self._cursors:
+                cur.interrupt()
+
+    def attach(self, cursor) -> None:
+        """Register a cursor; raise if the request is already cancelled."""
+        with self._lock:
+            if self.reason is not None:
+                raise QueryCancelled(self.reason)
+            self._cursors.add(cursor)
+
+    def detach(self, cursor) -> None:
+        with self._lock:
+            self._cursors.discard(cursor)
+
+
+current_request: ContextVar[Optional[RequestContext]] = ContextVar(
+    "current_request", default=None
+)
+
+
+class DeadlineMiddleware:
+    """ASGI middleware arming the deadline and watching for client disconnects."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path", "")
+        if (
+            scope["type"] != "http"
+            or not path.startswith("/api/")
+            or path in UNCACHED_PATHS
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        seconds = deadline_for(path)
+        ctx = RequestContext(seconds)
+        token = current_request.set(ctx)
+        loop = asyncio.get_running_loop()
+        timer = loop.call_later(seconds, ctx.cancel, "deadline") if seconds else None
+
+        # Read the client side in the background so a disconnect is seen while
+        # the handler is still running; the app reads from the queue instead.
+        messages: asyncio.Queue = asyncio.Queue()
+
+        async def pump():
+            while True:
+                message = await receive()
+                await messages.put(message)
+                if message["type"] == "http.disconnect":
+                    ctx.cancel("disconnect")
+                    return
+
+        pump_task = asyncio.create_task(pump())
+        try:
+            await self.app(scope, messages.get, send)
+        finally:
+            pump_task.cancel()
+            if timer is not None:
+                timer.cancel()
+            current_request.reset(token)
+
+
+async def query_cancelled_handler(request: Request, exc: QueryCancelled):
+    """Answer cancelled requests with 504."""
+    return JSONResponse(
+        status_code=504, content={"detail": f"Query cancelled ({exc.reason})"}
+    )
@@ -0,0 +1,67 @@
+"""Immutable in-process lookups for the meta endpoints.
+
+The `dim_season`, `dim_competition` and `dim_club_season` marts are small and
+fixed for the lifetime of a serving DB, so they are read once at startup into
+tuples and a read-only mapping. `/api/seasons`, `/api/competitions` and
+`/api/clubs` then answer without touching DuckDB. Serving DBs built before
+the dims existed fall back to the registered `DISTINCT` queries.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
+
+import duckdb
+
+from .db import query
+
+logger = logging.getLogger("api.dims")
+
+Club = Tuple[int, str]
+
+
+@dataclass(frozen=True)
+class Dimensions:
+    seasons: Tuple[int, ...]
+    competitions: Tuple[Tuple[str, str], ...]
+    clubs: Mapping[Tuple[str, int], Tuple[Club, ...]]
+
+    def clubs_for(self, competition_id: str, season: str) -> Tuple[Club, ...]:
+        """Return `(club_id, club_name)` pairs, ordered by name."""
+        try:
+            return self.clubs.get((competition_id, int(season)), ())
+        except ValueError:
+            return ()
+
+
+_dims: Optional[Dimensions] = None
+
+
+def load() -> Optional[Dimensions]:
+    """Read the dimension marts; return None if the serving DB lacks them."""
+    global _dims
+    try:
+        seasons = tuple(r[0] for r in query("dim_seasons"))
+        competitions = tuple((r[0], r[1]) for r in query("dim_competitions"))
+        clubs = defaultdict(list)
+        for competition_id, season, club_id, club_name in query("dim_club_seasons"):
+            clubs[(competition_id, season)].append((club_id, club_name))
+    except duckdb.CatalogException as exc:
+        logger.warning("Dimension marts unavailable (%s); using DISTINCT scans", exc)
+        _dims = None
+        return None
+    _dims = Dimensions(
+        seasons=seasons,
+        competitions=competitions,
+        clubs=MappingProxyType({k: tuple(v) for k, v in clubs.items()}),
+    )
+    return _dims
+
+
+def get() -> Optional[Dimensions]:
+    """Return the loaded dimensions, or None before `load` / without dims."""
+    return _dims
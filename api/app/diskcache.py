@@ -0,0 +1,204 @@
+"""Optional SQLite-backed response cache tier that survives restarts.
+
+Entries are keyed by `(db_sha256, request_key)`, so a new serving DB never sees
+responses computed from an older one. Total body size is bounded; the least
+recently accessed entries are evicted first. Rows for other DB versions are
+purged when the cache is opened.
+
+The size total lives in the file (kept by triggers), so gunicorn workers
+sharing one cache file share one budget. Hits do not write: access times are
+buffered and flushed in batches. Calls block on SQLite, so async callers run
+them in a worker thread (see `cache.ResponseCache`).
+
+Env vars:
+- RESPONSE_DISK_CACHE_PATH: SQLite file path (unset disables the disk tier)
+- RESPONSE_DISK_CACHE_MAX_BYTES: max total body bytes on disk (default 512 MiB)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from .cache import Entry, entry_size
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    db_sha   TEXT    NOT NULL,
+    key      TEXT    NOT NULL,
+    status   INTEGER NOT NULL,
+    headers  TEXT    NOT NULL,
+    body     BLOB    NOT NULL,
+    gzip     BLOB,
+    br       BLOB,
+    size     INTEGER NOT NULL,
+    accessed REAL    NOT NULL,
+    PRIMARY KEY (db_sha, key)
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+CREATE TABLE IF NOT EXISTS usage (
+    id    INTEGER PRIMARY KEY CHECK (id = 0),
+    bytes INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO usage VALUES (0, 0);
+CREATE TRIGGER IF NOT EXISTS responses_insert AFTER INSERT ON responses
+BEGIN UPDATE usage SET bytes = bytes + NEW.size; END;
+CREATE TRIGGER IF NOT EXISTS responses_delete AFTER DELETE ON responses
+BEGIN UPDATE usage SET bytes = bytes - OLD.size; END;
+CREATE TRIGGER IF NOT EXISTS responses_update AFTER UPDATE OF size ON responses
+BEGIN UPDATE usage SET bytes = bytes + NEW.size - OLD.size; END;
+"""
+
+# Buffered access times are written once this many hits have accumulated.
+TOUCH_BATCH = 256
+
+DISK_CACHE_PATH = os.getenv("RESPONSE_DISK_CACHE_PATH")
+DISK_CACHE_MAX_BYTES = int(
+    os.getenv("RESPONSE_DISK_CACHE_MAX_BYTES", str(512 * 1024 * 1024))
+)
+
+
+class DiskCache:
+    """Size-bounded, LRU-evicting response store in a single SQLite file."""
+
+    def __init__(self, path: str, db_sha: str, max_bytes: int) -> None:
+        self.path = Path(path)
+        self.db_sha = db_sha
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._touched: Dict[str, float] = {}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._con = sqlite3.connect(
+            str(self.path), check_same_thread=False, isolation_level=None
+        )
+        self._con.execute("PRAGMA journal_mode=WAL")
+        self._con.execute("PRAGMA synchronous=NORMAL")
+        # Other workers may hold the write lock for the length of a put.
+        self._con.execute("PRAGMA busy_timeout=5000")
+        columns = {row[1] for row in self._con.execute("PRAGMA table_info(responses)")}
+        if columns and "br" not in columns:
+            # Pre-compression layout; entries are cheap to rebuild.
+            self._con.execute("DROP TABLE responses")
+        self._con.executescript(_SCHEMA)
+        with self._con:
+            self._con.execute("BEGIN IMMEDIATE")
+            self._con.execute("DELETE FROM responses WHERE db_sha <> ?", [db_sha])
+            # Resync in case the file predates the triggers.
+            self._con.execute(
+                "UPDATE usage SET bytes = (SELECT COALESCE(SUM(size), 0) FROM responses)"
+            )
+
+    def get(self, key: str) -> Optional[Entry]:
+        with self._lock:
+            row = self._con.execute(
+                "SELECT status, headers, body, gzip, br FROM responses "
+                "WHERE db_sha = ? AND key = ?",
+                [self.db_sha, key],
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._touched[key] = time.time()
+            if len(self._touched) >= TOUCH_BATCH:
+                with self._con:
+                    self._con.execute("BEGIN IMMEDIATE")
+                    self._flush_touched()
+        status, headers, body, gzip, br = row
+        encoded = {
+            enc: bytes(data) for enc, data in (("gzip", gzip), ("br", br)) if data
+        }
+        return (
+            status,
+            [
+                (k.encode("latin-1"), v.encode("latin-1"))
+                for k, v in json.loads(headers)
+            ],
+            bytes(body),
+            encoded,
+        )
+
+    def put(self, key: str, entry: Entry) -> None:
+        status, headers, body, encoded = entry
+        size = entry_size(entry)
+        if size > self.max_bytes:
+            return
+        header_json = json.dumps(
+            [[k.decode("latin-1"), v.decode("latin-1")] for k, v in headers]
+        )
+        with self._lock, self._con:
+            self._con.execute("BEGIN IMMEDIATE")
+            self._flush_touched()
+            self._con.execute(
+                "INSERT INTO responses "
+                "(db_sha, key, status, headers, body, gzip, br, size, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (db_sha, key) DO UPDATE SET status = excluded.status, "
+                "headers = excluded.headers, body = excluded.body, "
+                "gzip = excluded.gzip, br = excluded.br, size = excluded.size, "
+                "accessed = excluded.accessed",
+                [
+                    self.db_sha,
+                    key,
+                    status,
+                    header_json,
+                    body,
+                    encoded.get("gzip"),
+                    encoded.get("br"),
+                    size,
+                    time.time(),
+                ],
+            )
+            total = self._total()
+            if total > self.max_bytes:
+                self._evict(total)
+
+    def _total(self) -> int:
+        return self._con.execute("SELECT bytes FROM usage").fetchone()[0]
+
+    def _flush_touched(self) -> None:
+        if self._touched:
+            self._con.executemany(
+                "UPDATE responses SET accessed = ? WHERE db_sha = ? AND key = ?",
+                [(at, self.db_sha, key) for key, at in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def _evict(self, total: int) -> None:
+        # Drop the oldest entries until ~90% of the budget to amortize deletes.
+        # The cursor walks the `accessed` index and stops once enough is freed.
+        target = int(self.max_bytes * 0.9)
+        doomed = []
+        for rowid, size in self._con.execute(
+            "SELECT rowid, size FROM responses ORDER BY accessed"
+        ):
+            if total <= target:
+                break
+            doomed.append((rowid,))
+            total -= size
+        self._con.executemany("DELETE FROM responses WHERE rowid = ?", doomed)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"bytes": self._total(), "hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        with self._lock:
+            with self._con:
+                self._con.execute("BEGIN IMMEDIATE")
+                self._flush_touched()
+            self._con.close()
+
+
+def open_disk_cache(db_sha: str) -> Optional[DiskCache]:
+    """Return a DiskCache when RESPONSE_DISK_CACHE_PATH is set, else None."""
+    if not DISK_CACHE_PATH:
+        return None
+    return DiskCache(DISK_CACHE_PATH, db_sha, DISK_CACHE_MAX_BYTES)
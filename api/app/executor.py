@@ -0,0 +1,83 @@
+"""Dedicated thread pool for DuckDB work.
+
+Handlers are `async def` and hand their queries to this pool instead of
+FastAPI's shared threadpool, so the event loop stays free for cache hits,
+health checks and other cheap responses while DuckDB is busy. DuckDB releases
+the GIL while executing, so threads (not processes) are enough to use all
+cores, and they share the one open database and its buffer pool.
+
+Env vars:
+- DUCKDB_EXECUTOR_THREADS: pool size (default: sum of ADMISSION_LIMITS, so every
+  admitted request has a thread; at least 1)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from .admission import LIMITS
+
+# At least one thread: all-zero limits (every class shed) still leave routes
+# outside ADMISSION_ROUTE_CLASSES and the pre-fork replay running.
+EXECUTOR_THREADS = max(
+    1,
+    max(0, int(os.getenv("DUCKDB_EXECUTOR_THREADS", "0"))) or sum(LIMITS.values()),
+)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_lock = threading.Lock()
+_active = 0
+_submitted = 0
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=EXECUTOR_THREADS, thread_name_prefix="duckdb"
+            )
+        return _executor
+
+
+def _tracked(fn: Callable[..., Any], *args: Any) -> Any:
+    global _active
+    with _lock:
+        _active += 1
+    try:
+        return fn(*args)
+    finally:
+        with _lock:
+            _active -= 1
+
+
+async def run_in_executor(fn: Callable[..., Any], *args: Any) -> Any:
+    """Run `fn(*args)` on the DuckDB pool with the caller's contextvars."""
+    global _submitted
+    # Request path and deadline live in contextvars; carry them to the thread.
+    ctx = contextvars.copy_context()
+    with _lock:
+        _submitted += 1
+    return await asyncio.get_running_loop().run_in_executor(
+        _get_executor(), functools.partial(ctx.run, _tracked, fn, *args)
+    )
+
+
+def shutdown() -> None:
+    """Stop the pool; a new one is created on next use."""
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def stats() -> Dict[str, int]:
+    with _lock:
+        return {"threads": EXECUTOR_THREADS, "active": _active, "submitted": _submitted}
@@ -1,9 +1,25 @@
+import asyncio
+import contextlib
 import os
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .db import get_conn
+from .accesslog import (
+    FLUSH_SECONDS,
+    AccessLogMiddleware,
+    access_log,
+    replay,
+)
+from .admission import AdmissionMiddleware
+from .cache import ResponseCacheMiddleware, response_cache
+from .compression import CompressionMiddleware
+from .deadline import DeadlineMiddleware, QueryCancelled, query_cancelled_handler
+from .db import RequestPathMiddleware, db_fingerprint, fetchone, init_db
+from .diskcache import open_disk_cache
+from .executor import shutdown as shutdown_executor
+from .snapshots import SNAPSHOT_DIR, SnapshotMiddleware, snapshots
+from . import dims, prefork
 from .routers import (
     meta,
     league,
@@ -20,24 +36,67 @@ from .routers import (
 )
 
 
+async def _flush_access_log_periodically() -> None:
+    while True:
+        await asyncio.sleep(FLUSH_SECONDS)
+        with contextlib.suppress(OSError):
+            access_log.flush()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Open a DuckDB connection and run a trivial query to ensure readiness."""
+    """Ensure DuckDB readiness, then warm the response cache from the access log."""
     try:
-        con = get_conn()
-        try:
-            con.execute("SELECT 1").fetchone()
-        finally:
-            con.close()
+        # Loads the DB into RAM up front when DB_MODE=memory|shm.
+        init_db()
+        fetchone("SELECT 1")
+        # Gunicorn workers inherit the lookups loaded by the master.
+        if dims.get() is None:
+            dims.load()
     except Exception as exc:
         raise RuntimeError(
             "Failed to open DuckDB with current ENV/paths. "
             "Ensure startup_db ran and ENV/DEV_DB_PATH/PROD_DB_PATH are set."
         ) from exc
-    yield
+
+    snapshots.load(SNAPSHOT_DIR, db_fingerprint())
+    # The disk tier sits under the memory tier; replay then promotes from disk.
+    response_cache.lower = open_disk_cache(db_fingerprint())
+    # Replay the most frequent keys before serving so the cache starts warm.
+    # Gunicorn workers inherit a cache already warmed by the master.
+    if not prefork.warmed():
+        await replay(app)
+    flusher = None
+    if access_log.enabled:
+        flusher = asyncio.create_task(_flush_access_log_periodically())
+    try:
+        yield
+    finally:
+        if flusher is not None:
+            flusher.cancel()
+            with contextlib.suppress(OSError):
+                access_log.flush()
+        if response_cache.lower is not None:
+            response_cache.lower.close()
+            response_cache.lower = None
+        shutdown_executor()
 
 
 app = FastAPI(title="OpenFootball API", lifespan=lifespan)
+app.add_exception_handler(QueryCancelled, query_cancelled_handler)
+
+# Middleware added last runs outermost: keys are recorded for cache hits too, and
+# cache hits are answered before admission control.
+app.add_middleware(RequestPathMiddleware)
+app.add_middleware(AdmissionMiddleware)
+# Outside admission so time spent queued counts against the deadline.
+app.add_middleware(DeadlineMiddleware)
+app.add_middleware(ResponseCacheMiddleware)
+# Snapshot hits are static files; they need neither a cache slot nor DuckDB.
+app.add_middleware(SnapshotMiddleware)
+# Encodes whatever the cache and snapshots did not serve precompressed.
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(AccessLogMiddleware)
 
 # Allow browser apps (e.g., Streamlit) to call the API from other origins
 allow_origins = os.getenv("CORS_ALLOW_ORIGINS", "*")
@@ -65,6 +124,6 @@ app.include_router(system.router, prefix="/api", tags=["system"])
 
 
 @app.get("/health")
-def health():
+async def health():
     """Basic health endpoint."""
     return {"status": "ok"}
@@ -0,0 +1,75 @@
+"""Pre-fork warm-up for multi-worker serving under gunicorn.
+
+With `preload_app`, the gunicorn master imports the app once and calls
+`prepare` before forking workers. It resolves the serving DB once (staging it to
+tmpfs for `DB_MODE=shm`; `memory` becomes `shm` so N workers do not hold N
+private copies), loads the meta dimensions, fills the memoized query results
+and warms the response cache from the access log. Workers inherit those Python
+objects copy-on-write and open the shared read-only file after the fork, so its
+pages sit in the OS page cache once for all of them.
+
+DuckDB instances, the executor pool and SQLite handles own threads or file
+locks and are closed again before the fork; each worker reopens them in the
+app lifespan.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+
+from . import db, dims
+from .accesslog import access_log, replay
+from .admission import admission
+from .cache import response_cache
+from .diskcache import open_disk_cache
+from .executor import shutdown as shutdown_executor
+from .queries import QUERIES
+from .snapshots import SNAPSHOT_DIR, snapshots
+
+logger = logging.getLogger("api.prefork")
+
+_warmed = False
+
+
+def warmed() -> bool:
+    """Return True in workers forked from a master that ran `prepare`."""
+    return _warmed
+
+
+def prepare(app) -> None:
+    """Open the DB, warm shared state and close DB handles; call pre-fork."""
+    global _warmed
+    # Every worker would copy the whole DB into its own heap.
+    mode = "shm" if db.DB_MODE == "memory" else None
+    mode = db.init_db(mode)
+    dims.load()
+    for name, spec in QUERIES.items():
+        if spec.cache == "memo":
+            db.query(name)
+    snapshots.load(SNAPSHOT_DIR, db.db_fingerprint())
+    response_cache.lower = open_disk_cache(db.db_fingerprint())
+    try:
+        warmed = asyncio.run(replay(app))
+    finally:
+        if response_cache.lower is not None:
+            response_cache.lower.close()
+            response_cache.lower = None
+        shutdown_executor()
+        db.close_db(pin=True)
+    _warmed = True
+    logger.info(
+        "Pre-fork warm-up done: mode=%s, %d keys replayed, %d cached responses",
+        mode,
+        warmed,
+        response_cache.stats()["entries"],
+    )
+
+
+def after_fork() -> None:
+    """Reset per-process state inherited from the master."""
+    random.seed()
+    admission.reset()
+    # Only samples taken in this worker are flushed from it.
+    access_log.reset()
@@ -0,0 +1,699 @@
+"""Named SQL queries used by the API routers.
+
+Every query is declared once here and run by name through `db.query` /
+`db.query_one`. Request values are always bound as parameters. DuckDB cannot
+bind parameters to `EXECUTE`, so only queries without parameters are prepared
+(`PREPARE`) once per pooled connection and then run with `EXECUTE`. Queries
+whose `ORDER BY` depends on a request parameter list their variants up front,
+each a separate statement, so no SQL is ever built from request input.
+
+Cache policy (`cache=`):
+- "flight": identical concurrent calls share one execution (default)
+- "memo": results are kept for the life of the process (small reference data)
+- "none": always executed (high-cardinality inputs such as search terms)
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+CACHE_POLICIES = ("flight", "memo", "none")
+
+
+@dataclass(frozen=True)
+class NamedQuery:
+    name: str
+    sql: str
+    # Variant key -> text substituted for `{variant}` in `sql`.
+    variants: Dict[str, str] = field(default_factory=dict)
+    cache: str = "flight"
+
+    def statement(self, variant: Optional[str] = None) -> Tuple[str, str]:
+        """Return `(prepared statement name, SQL)` for a variant."""
+        if not self.variants:
+            return self.name, self.sql
+        if variant not in self.variants:
+            raise KeyError(f"Unknown variant {variant!r} for query {self.name!r}")
+        return (
+            f"{self.name}__{variant}",
+            self.sql.format(variant=self.variants[variant]),
+        )
+
+
+QUERIES: Dict[str, NamedQuery] = {}
+
+
+def register(name: str, sql: str, **kwargs: Any) -> NamedQuery:
+    if name in QUERIES:
+        raise ValueError(f"Query {name!r} registered twice")
+    query = NamedQuery(name, sql, **kwargs)
+    if query.cache not in CACHE_POLICIES:
+        raise ValueError(f"Unknown cache policy {query.cache!r}")
+    QUERIES[name] = query
+    return query
+
+
+class QueryTimings:
+    """Per-query call counts and latency, including coalesced and memo hits."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._data: Dict[str, Dict[str, float]] = {}
+
+    def record(self, name: str, ms: float, executed: bool) -> None:
+        with self._lock:
+            t = self._data.setdefault(
+                name, {"calls": 0, "executions": 0, "total_ms": 0.0, "max_ms": 0.0}
+            )
+            t["calls"] += 1
+            t["executions"] += int(executed)
+            t["total_ms"] += ms
+            t["max_ms"] = max(t["max_ms"], ms)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                name: {
+                    "calls": int(t["calls"]),
+                    "executions": int(t["executions"]),
+                    "avg_ms": round(t["total_ms"] / t["calls"], 3),
+                    "max_ms": round(t["max_ms"], 3),
+                }
+                for name, t in sorted(self._data.items())
+            }
+
+
+timings = QueryTimings()
+
+
+# --- meta -------------------------------------------------------------------
+
+register(
+    "seasons",
+    """
+    SELECT DISTINCT season
+    FROM mart_competition_club_season
+    ORDER BY season DESC
+    """,
+    cache="memo",
+)
+
+register(
+    "competitions",
+    """
+    SELECT DISTINCT m.competition_id, m.competition_name
+    FROM mart_competition_club_season m
+    JOIN main.stg_competitions s
+    ON s.competition_id = m.competition_id
+    WHERE s.competition_type IN ('domestic_league', 'international_cup')
+    ORDER BY m.competition_name
+    """,
+    cache="memo",
+)
+
+# Dimension marts, read once at startup by `dims.load`.
+register(
+    "dim_seasons",
+    """
+    SELECT season
+    FROM dim_season
+    ORDER BY season DESC
+    """,
+    cache="none",
+)
+
+register(
+    "dim_competitions",
+    """
+    SELECT competition_id, competition_name
+    FROM dim_competition
+    WHERE competition_type IN ('domestic_league', 'international_cup')
+    ORDER BY competition_name
+    """,
+    cache="none",
+)
+
+register(
+    "dim_club_seasons",
+    """
+    SELECT competition_id, season, club_id, club_name
+    FROM dim_club_season
+    ORDER BY competition_id, season, club_name
+    """,
+    cache="none",
+)
+
+register(
+    "competition_clubs",
+    """
+    SELECT DISTINCT club_id, club_name
+    FROM mart_competition_club_season
+    WHERE competition_id = $1 AND season_start = $2
+    ORDER BY club_name
+    """,
+)
+
+# --- league -----------------------------------------------------------------
+
+register(
+    "league_table",
+    """
+    SELECT club_id, club_name, games_played, wins, draws, losses,
+           points, goals_for, goals_against, goal_difference
+    FROM mart_competition_club_season
+    WHERE competition_id = $1 AND season_start = $2
+    ORDER BY points DESC, goal_difference DESC
+    """,
+)
+
+register(
+    "league_stats",
+    """
+    SELECT
+      COUNT(*) AS club_count,
+      AVG(points) AS avg_points,
+      AVG(goal_difference) AS avg_gd,
+      SUM(goals_for) AS total_goals
+    FROM mart_competition_club_season
+    WHERE competition_id = $1 AND season_start = $2
+    """,
+)
+
+# --- clubs ------------------------------------------------------------------
+
+register(
+    "club_season",
+    """
+    SELECT name, games_played, wins, draws, losses, points,
+           goals_for, goals_against, goal_difference,
+           squad_size, squad_goals, squad_assists, squad_yellow_cards, squad_red_cards
+    FROM mart_club_season
+    WHERE club_id = $1 AND season_start = $2
+    """,
+)
+
+register(
+    "club_league_split",
+    """
+    SELECT competition_id, competition_name, games_played, wins, draws, losses,
+           points, goals_for, goals_against, goal_difference
+    FROM mart_competition_club_season
+    WHERE club_id = $1 AND season_start = $2
+    ORDER BY points DESC
+    """,
+)
+
+register(
+    "club_history",
+    """
+    SELECT season, points, goals_for, goals_against, goal_difference
+    FROM mart_club_season
+    WHERE club_id = $1
+    ORDER BY season
+    """,
+)
+
+register(
+    "club_history_competition",
+    """
+    SELECT season, points, goals_for, goals_against, goal_difference
+    FROM mart_competition_club_season
+    WHERE club_id = $1 AND competition_id = $2
+    ORDER BY season
+    """,
+)
+
+register(
+    "club_formations",
+    """
+    SELECT club_formation, games_played, wins, draws, losses, ppg, win_percentage,
+           goals_for, goals_against
+    FROM mart_club_formation_season
+    WHERE club_id = $1 AND season_start = $2 AND competition_id = $3
+    ORDER BY ppg DESC
+    """,
+)
+
+# --- players ----------------------------------------------------------------
+
+PLAYER_TOP_METRICS = (
+    "minutes_played",
+    "goals",
+    "assists",
+    "total_goals_and_assists",
+    "yellow_cards",
+    "red_cards",
+    "goals_per90",
+    "assists_per90",
+    "goal_plus_assist_per90",
+    "efficiency_score",
+)
+
+_PLAYERS_TOP = """
+    SELECT player_id, player_name, games_played, minutes_played,
+           goals, assists, (goals + assists) AS total_goals_and_assists,
+           yellow_cards, red_cards,
+           goals_per90, assists_per90, goal_plus_assist_per90, efficiency_score
+    FROM {table}
+    WHERE season_start = $1 AND minutes_played >= $2{competition_filter}
+    ORDER BY {{variant}} DESC
+    LIMIT $3
+    """
+
+register(
+    "players_top",
+    _PLAYERS_TOP.format(table="mart_player_season", competition_filter=""),
+    variants={m: m for m in PLAYER_TOP_METRICS},
+)
+
+register(
+    "players_top_competition",
+    _PLAYERS_TOP.format(
+        table="mart_competition_player_season",
+        competition_filter=" AND competition_id = $4",
+    ),
+    variants={m: m for m in PLAYER_TOP_METRICS},
+)
+
+register(
+    "player_season",
+    """
+    SELECT player_name, games_played, minutes_played, goals, assists,
+           yellow_cards, red_cards,
+           goals_per90, assists_per90, goal_plus_assist_per90, efficiency_score,
+           season_last_value_eur
+    FROM mart_player_season
+    WHERE player_id = $1 AND season_start = $2
+    """,
+)
+
+register(
+    "player_season_competition",
+    """
+    SELECT player_name, competition_id, competition_name,
+           games_played, minutes_played, goals, assists,
+           yellow_cards, red_cards,
+           goals_per90, assists_per90, goal_plus_assist_per90, efficiency_score,
+           season_last_value_eur
+    FROM mart_competition_player_season
+    WHERE player_id = $1 AND season_start = $2 AND competition_id = $3
+    """,
+)
+
+register(
+    "player_valuation_season",
+    """
+    SELECT first_market_value, last_market_value, min_market_value, max_market_value,
+           value_change_amount, value_change_percentage
+    FROM mart_player_valuation_season
+    WHERE player_id = $1 AND season_start = TRY_CAST(LEFT($2, 4) AS INTEGER)
+    """,
+)
+
+register(
+    "player_career",
+    """
+    SELECT season, games_played, minutes_played, goals, assists,
+           goals_per90, assists_per90, goal_plus_assist_per90, efficiency_score,
+           season_last_value_eur
+    FROM mart_player_season
+    WHERE player_id = $1
+    ORDER BY season
+    """,
+)
+
+register(
+    "player_valuation_history",
+    """
+    SELECT season, first_market_value, last_market_value, min_market_value, max_market_value
+    FROM mart_player_valuation_season
+    WHERE player_id = $1
+    ORDER BY season
+    """,
+)
+
+LEADER_METRICS = (
+    "minutes_played",
+    "goals",
+    "assists",
+    "goal_plus_assist_per90",
+    "goals_per90",
+    "assists_per90",
+    "efficiency_score",
+)
+
+register(
+    "player_leaders",
+    """
+    SELECT player_id, player_name, minutes_played, goals, assists,
+           goals_per90, assists_per90, goal_plus_assist_per90, efficiency_score
+    FROM mart_competition_player_season
+    WHERE season_start = $1
+      AND competition_id = $2
+      AND minutes_played >= $3
+    ORDER BY {variant} DESC
+    LIMIT $4
+    """,
+    variants={m: m for m in LEADER_METRICS},
+)
+
+# --- market & analytics -----------------------------------------------------
+
+register(
+    "market_movers",
+    """
+    SELECT player_id, name, first_market_value, last_market_value,
+           value_change_amount, value_change_percentage
+    FROM mart_player_valuation_season
+    WHERE season_start = TRY_CAST(LEFT($1, 4) AS INTEGER)
+    ORDER BY value_change_amount {variant}
+    LIMIT $2
+    """,
+    variants={"up": "DESC", "down": "ASC"},
+)
+
+register(
+    "value_perf",
+    """
+    SELECT player_id, player_name, age_in_season, minutes_played,
+           goals_per90, assists_per90, goal_plus_assist_per90, efficiency_score,
+           first_market_value, last_market_value, value_change_amount, value_change_percentage
+    FROM mart_player_value_performance_corr
+    WHERE season_start = $1
+    ORDER BY last_market_value DESC
+    LIMIT 1000
+    """,
+)
+
+EFFICIENCY_METRICS = (
+    "goals_per90",
+    "assists_per90",
+    "goal_plus_assist_per90",
+    "efficiency_score",
+)
+
+register(
+    "efficiency_screener",
+    """
+    SELECT player_id, player_name, age_in_season, minutes_played,
+           last_market_value, goals_per90, assists_per90, goal_plus_assist_per90, efficiency_score
+    FROM mart_player_value_performance_corr
+    WHERE season_start = $1
+      AND minutes_played >= $2
+      AND ($3 IS NULL OR last_market_value <= $3)
+    ORDER BY {variant} DESC
+    LIMIT $4
+    """,
+    variants={m: m for m in EFFICIENCY_METRICS},
+)
+
+register(
+    "age_buckets",
+    """
+    SELECT v.age_in_season, COUNT(*) AS player_count
+    FROM mart_player_value_performance_corr v
+    JOIN mart_competition_club_season c USING (club_id, season_start)
+    WHERE v.season_start = $1 AND c.competition_id = $2
+    GROUP BY v.age_in_season
+    ORDER BY v.age_in_season
+    """,
+)
+
+# --- formations -------------------------------------------------------------
+
+register(
+    "league_formations",
+    """
+    SELECT club_formation, games_played, wins, draws, losses,
+           goals_for, goals_against, avg_goals_for, avg_goals_against, ppg, win_percentage
+    FROM mart_competition_formation_season
+    WHERE competition_id = $1 AND season_start = $2
+    ORDER BY games_played DESC, ppg DESC
+    """,
+)
+
+register(
+    "formation_history",
+    """
+    SELECT club_formation, games_played, wins, draws, losses,
+           goals_for, goals_against, avg_goals_for, avg_goals_against, ppg, win_percentage
+    FROM mart_formation_history_performance
+    ORDER BY games_played DESC, ppg DESC
+    """,
+    cache="memo",
+)
+
+# --- managers ---------------------------------------------------------------
+
+register(
+    "manager_performance",
+    """
+    SELECT manager_name, games_played, points, ppg, win_rate
+    FROM mart_manager_performance
+    ORDER BY games_played DESC, ppg DESC
+    LIMIT $1
+    """,
+)
+
+register(
+    "manager_formation",
+    """
+    SELECT club_formation, games_played, avg_goals_for, avg_goals_against,
+           wins, draws, losses, points, ppg, win_rate
+    FROM mart_manager_formation_performance
+    WHERE manager_name = $1
+    ORDER BY ppg DESC
+    """,
+)
+
+register(
+    "managers_best_formations",
+    """
+    SELECT manager_name, club_formation, ppg, win_rate, games_played
+    FROM mart_manager_formation_performance
+    WHERE games_played >= $1
+    ORDER BY ppg DESC
+    LIMIT $2
+    """,
+)
+
+# --- transfers --------------------------------------------------------------
+
+register(
+    "player_transfers",
+    """
+    SELECT transfer_date, season, from_club_id, from_club_name,
+           to_club_id, to_club_name, is_free_transfer, is_loan_out, is_loan_return,
+           market_value_in_eur, transfer_fee, fee_norm, transfer_category
+    FROM mart_transfer_player
+    WHERE player_id = $1
+    ORDER BY transfer_date DESC
+    """,
+)
+
+register(
+    "club_transfers",
+    """
+    SELECT club_name, incoming_total, outgoing_total,
+           incoming_free_cnt, incoming_paid_cnt, incoming_loan_cnt, incoming_loan_return_cnt,
+           outgoing_free_cnt, outgoing_paid_cnt, outgoing_loan_cnt, outgoing_loan_return_cnt,
+           transfer_spend, transfer_income, net_spend,
+           incoming_free_rate, incoming_paid_rate, outgoing_paid_rate
+    FROM mart_transfer_club
+    WHERE club_id = $1 AND season_start = TRY_CAST(LEFT($2, 4) AS INTEGER)
+    """,
+)
+
+register(
+    "transfer_age_fee_profile",
+    """
+    SELECT age_bucket, transfer_count, avg_transfer_fee
+    FROM mart_transfer_age_fee_profile
+    ORDER BY age_bucket
+    """,
+    cache="memo",
+)
+
+register(
+    "club_transfers_in",
+    """
+    SELECT player_id, player_name, transfer_date, season,
+           from_club_name, to_club_name, is_free_transfer, is_loan_out, is_loan_return,
+           transfer_fee, transfer_category
+    FROM mart_transfer_player
+    WHERE to_club_id = $1 AND season_start = TRY_CAST(LEFT($2, 4) AS INTEGER)
+    ORDER BY transfer_date DESC
+    """,
+)
+
+register(
+    "club_transfers_out",
+    """
+    SELECT player_id, player_name, transfer_date, season,
+           from_club_name, to_club_name, is_free_transfer, is_loan_out, is_loan_return,
+           transfer_fee, transfer_category
+    FROM mart_transfer_player
+    WHERE from_club_id = $1 AND season_start = TRY_CAST(LEFT($2, 4) AS INTEGER)
+    ORDER BY transfer_date DESC
+    """,
+)
+
+register(
+    "transfer_top_spenders",
+    """
+    SELECT club_id, club_name, transfer_spend, transfer_income, net_spend
+    FROM mart_competition_transfer_club
+    WHERE season_start = TRY_CAST(LEFT($1, 4) AS INTEGER) AND competition_id = $2
+    ORDER BY net_spend DESC, club_id
+    LIMIT $3
+    """,
+)
+
+register(
+    "transfer_competition_summary",
+    """
+    SELECT competition_id, competition_name,
+           SUM(transfer_spend) AS total_spend,
+           SUM(transfer_income) AS total_income,
+           SUM(net_spend) AS total_net
+    FROM mart_competition_transfer_club
+    WHERE season_start = TRY_CAST(LEFT($1, 4) AS INTEGER)
+    GROUP BY competition_id, competition_name
+    ORDER BY total_net DESC
+    """,
+)
+
+register(
+    "transfer_free_vs_paid",
+    """
+    SELECT
+      SUM(incoming_free_cnt) AS inc_free,
+      SUM(incoming_paid_cnt) AS inc_paid,
+      SUM(outgoing_free_cnt) AS out_free,
+      SUM(outgoing_paid_cnt) AS out_paid
+    FROM mart_competition_transfer_club
+    WHERE season_start = TRY_CAST(LEFT($1, 4) AS INTEGER) AND competition_id = $2
+    """,
+)
+
+# --- search -----------------------------------------------------------------
+
+register(
+    "search_players",
+    """
+    WITH candidates AS (
+        SELECT DISTINCT player_id
+        FROM mart_player_season
+        WHERE player_name ILIKE '%' || $1 || '%'
+        LIMIT $2
+    )
+    SELECT pcs.player_id,
+           pcs.player_name,
+           pcs.total_matches,
+           pcs.total_minutes,
+           pcs.total_goals,
+           pcs.total_assists,
+           pcs.total_goal_contributions,
+           pcs.total_yellow_cards,
+           pcs.total_red_cards,
+           pcs.gpg,
+           pcs.apg,
+           pcs.total_goal_contributions_pg
+    FROM mart_player_career_summary pcs
+    JOIN candidates c
+      ON pcs.player_id = c.player_id
+    ORDER BY pcs.player_name
+    """,
+    cache="none",
+)
+
+register(
+    "search_managers",
+    """
+    WITH ranked AS (
+        SELECT manager_name,
+               games_played,
+               ppg,
+               win_rate,
+               ROW_NUMBER() OVER (
+                   PARTITION BY manager_name
+                   ORDER BY games_played DESC, ppg DESC
+               ) AS rn
+        FROM mart_manager_performance
+        WHERE manager_name ILIKE '%' || $1 || '%'
+    )
+    SELECT manager_name, games_played, ppg, win_rate
+    FROM ranked
+    WHERE rn = 1
+    ORDER BY manager_name
+    LIMIT $2
+    """,
+    cache="none",
+)
+
+register(
+    "search_clubs",
+    """
+    WITH candidates AS (
+        SELECT DISTINCT club_id, club_name
+        FROM mart_competition_club_season
+        WHERE club_name ILIKE '%' || $1 || '%'
+        ORDER BY club_name
+        LIMIT $2
+    ),
+    agg AS (
+        SELECT club_id,
+               SUM(games_played)      AS total_games_played,
+               SUM(wins)              AS total_wins,
+               SUM(draws)             AS total_draws,
+               SUM(losses)            AS total_losses,
+               SUM(points)            AS total_points,
+               SUM(goals_for)         AS total_goals_for,
+               SUM(goals_against)     AS total_goals_against,
+               SUM(goal_difference)   AS total_goal_difference
+        FROM mart_competition_club_season
+        GROUP BY club_id
+    )
+    SELECT c.club_id,
+           c.club_name,
+           COALESCE(a.total_games_played, 0),
+           COALESCE(a.total_wins, 0),
+           COALESCE(a.total_draws, 0),
+           COALESCE(a.total_losses, 0),
+           COALESCE(a.total_points, 0),
+           COALESCE(a.total_goals_for, 0),
+           COALESCE(a.total_goals_against, 0),
+           COALESCE(a.total_goal_difference, 0)
+    FROM candidates c
+    LEFT JOIN agg a USING (club_id)
+    ORDER BY c.club_name
+    """,
+    cache="none",
+)
+
+# --- compare ----------------------------------------------------------------
+
+# Id lists are bound as one LIST parameter so a single statement serves any size.
+register(
+    "compare_players",
+    """
+    SELECT player_id, player_name, minutes_played, goals, assists,
+           goals_per90, assists_per90, goal_plus_assist_per90, efficiency_score,
+           season_last_value_eur
+    FROM mart_player_season
+    WHERE season_start = $1 AND list_contains($2, player_id)
+    ORDER BY player_name
+    """,
+)
+
+register(
+    "compare_clubs",
+    """
+    SELECT club_id, club_name, games_played, points, goals_for, goals_against, goal_difference
+    FROM mart_competition_club_season
+    WHERE season_start = $1 AND list_contains($2, club_id)
+    ORDER BY club_name
+    """,
+)
@@ -1,19 +1,12 @@
 from typing import List, Optional, Literal
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
-from ..db import get_conn
+from ..db import aquery
+from ..queries import EFFICIENCY_METRICS
 
 router = APIRouter()
 
 
-EFFICIENCY_METRICS = [
-    "goals_per90",
-    "assists_per90",
-    "goal_plus_assist_per90",
-    "efficiency_score",
-]
-
-
 class EfficiencyRow(BaseModel):
     player_id: int
     player_name: str
@@ -36,7 +29,7 @@ class AgeBucket(BaseModel):
     response_model=List[EfficiencyRow],
     response_model_exclude_none=True,
 )
-def efficiency_screener(
+async def efficiency_screener(
     season: str,
     min_minutes: int = Query(ge=0, default=0),
     value_max: Optional[int] = Query(default=None),
@@ -48,18 +41,11 @@ def efficiency_screener(
     """Screen players by efficiency metric with value and minutes filters."""
     if metric not in EFFICIENCY_METRICS:
         raise HTTPException(status_code=400, detail="Invalid metric")
-    con = get_conn()
-    q = f"""
-    SELECT player_id, player_name, age_in_season, minutes_played,
-           last_market_value, goals_per90, assists_per90, goal_plus_assist_per90, efficiency_score
-    FROM mart_player_value_performance_corr
-    WHERE season = ?
-      AND minutes_played >= ?
-      AND (? IS NULL OR last_market_value <= ?)
-    ORDER BY {metric} DESC
-    LIMIT ?
-    """
-    rows = con.execute(q, [season, min_minutes, value_max, value_max, limit]).fetchall()
+    rows = await aquery(
+        "efficiency_screener",
+        [season, min_minutes, value_max, limit],
+        variant=metric,
+    )
     return [
         EfficiencyRow(
             player_id=r[0],
@@ -81,16 +67,7 @@ def efficiency_screener(
     response_model=List[AgeBucket],
     response_model_exclude_none=True,
 )
-def age_buckets(season: str, competition_id: str):
+async def age_buckets(season: str, competition_id: str):
     """Return age histogram for players in a competition and season."""
-    con = get_conn()
-    q = """
-    SELECT v.age_in_season, COUNT(*) AS player_count
-    FROM mart_player_value_performance_corr v
-    JOIN mart_competition_club_season c USING (club_id, season)
-    WHERE v.season = ? AND c.competition_id = ?
-    GROUP BY v.age_in_season
-    ORDER BY v.age_in_season
-    """
-    rows = con.execute(q, [season, competition_id]).fetchall()
+    rows = await aquery("age_buckets", [season, competition_id])
     return [AgeBucket(age_in_season=r[0], player_count=r[1]) for r in rows]
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, HTTPException, status
 from typing import List
 from pydantic import BaseModel
-from ..db import get_conn
+from ..db import aquery, aquery_one
 
 router = APIRouter()
 
@@ -49,17 +49,9 @@ class ClubFormation(BaseModel):
 
 
 @router.get("/clubs/{club_id}/season", response_model=ClubSeason)
-def club_season(club_id: int, season: str):
+async def club_season(club_id: int, season: str):
     """Return club season summary."""
-    con = get_conn()
-    q = """
-    SELECT name, games_played, wins, draws, losses, points,
-           goals_for, goals_against, goal_difference,
-           squad_size, squad_goals, squad_assists, squad_yellow_cards, squad_red_cards
-    FROM mart_club_season
-    WHERE club_id = ? AND season = ?
-    """
-    r = con.execute(q, [club_id, season]).fetchone()
+    r = await aquery_one("club_season", [club_id, season])
     if r is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -84,17 +76,9 @@ def club_season(club_id: int, season: str):
 
 
 @router.get("/clubs/{club_id}/league-split", response_model=List[ClubLeagueSplit])
-def club_league_split(club_id: int, season: str):
+async def club_league_split(club_id: int, season: str):
     """Return club performance split by competition."""
-    con = get_conn()
-    q = """
-    SELECT competition_id, competition_name, games_played, wins, draws, losses,
-           points, goals_for, goals_against, goal_difference
-    FROM mart_competition_club_season
-    WHERE club_id = ? AND season = ?
-    ORDER BY points DESC
-    """
-    rows = con.execute(q, [club_id, season]).fetchall()
+    rows = await aquery("club_league_split", [club_id, season])
     return [
         ClubLeagueSplit(
             competition_id=r[0],
@@ -124,16 +108,9 @@ class ClubHistoryRow(BaseModel):
     "/clubs/{club_id}/history",
     response_model=List[ClubHistoryRow],
 )
-def club_history(club_id: int):
+async def club_history(club_id: int):
     """Return club season history for charting."""
-    con = get_conn()
-    q = """
-    SELECT season, points, goals_for, goals_against, goal_difference
-    FROM mart_club_season
-    WHERE club_id = ?
-    ORDER BY season
-    """
-    rows = con.execute(q, [club_id]).fetchall()
+    rows = await aquery("club_history", [club_id])
     return [
         ClubHistoryRow(
             season=r[0],
@@ -150,16 +127,9 @@ def club_history(club_id: int):
     "/clubs/{club_id}/history-competition",
     response_model=List[ClubHistoryRow],
 )
-def club_history_competition(club_id: int, competition_id: str):
+async def club_history_competition(club_id: int, competition_id: str):
     """Return club season history filtered by competition for charting."""
-    con = get_conn()
-    q = """
-    SELECT season, points, goals_for, goals_against, goal_difference
-    FROM mart_competition_club_season
-    WHERE club_id = ? AND competition_id = ?
-    ORDER BY season
-    """
-    rows = con.execute(q, [club_id, competition_id]).fetchall()
+    rows = await aquery("club_history_competition", [club_id, competition_id])
     return [
         ClubHistoryRow(
             season=r[0],
@@ -173,17 +143,9 @@ def club_history_competition(club_id: int, competition_id: str):
 
 
 @router.get("/clubs/{club_id}/formations", response_model=List[ClubFormation])
-def club_formations(club_id: int, season: str, competition_id: str):
+async def club_formations(club_id: int, season: str, competition_id: str):
     """Return club formation performance for given season and competition."""
-    con = get_conn()
-    q = """
-    SELECT club_formation, games_played, wins, draws, losses, ppg, win_percentage,
-           goals_for, goals_against
-    FROM mart_club_formation_season
-    WHERE club_id = ? AND season = ? AND competition_id = ?
-    ORDER BY ppg DESC
-    """
-    rows = con.execute(q, [club_id, season, competition_id]).fetchall()
+    rows = await aquery("club_formations", [club_id, season, competition_id])
     return [
         ClubFormation(
             club_formation=r[0],
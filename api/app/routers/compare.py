@@ -1,7 +1,7 @@
 from typing import List, Optional
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
-from ..db import get_conn
+from ..db import aquery
 
 router = APIRouter()
 
@@ -46,23 +46,14 @@ def _parse_ids(ids: Optional[str]) -> List[int]:
     response_model=List[ComparePlayer],
     response_model_exclude_none=True,
 )
-def compare_players(ids: Optional[str] = Query(default=""), season: str = Query(...)):
+async def compare_players(
+    ids: Optional[str] = Query(default=""), season: str = Query(...)
+):
     """Compare players by selected metrics for a season."""
     id_list = _parse_ids(ids)
     if not id_list:
         return []
-    con = get_conn()
-    placeholders = ",".join(["?"] * len(id_list))
-    q = f"""
-    SELECT player_id, player_name, minutes_played, goals, assists,
-           goals_per90, assists_per90, goal_plus_assist_per90, efficiency_score,
-           season_last_value_eur
-    FROM mart_player_season
-    WHERE season = ? AND player_id IN ({placeholders})
-    ORDER BY player_name
-    """
-    params: List[object] = [season, *id_list]
-    rows = con.execute(q, params).fetchall()
+    rows = await aquery("compare_players", [season, id_list])
     return [
         ComparePlayer(
             player_id=r[0],
@@ -85,21 +76,14 @@ def compare_players(ids: Optional[str] = Query(default=""), season: str = Query(
     response_model=List[CompareClub],
     response_model_exclude_none=True,
 )
-def compare_clubs(ids: Optional[str] = Query(default=""), season: str = Query(...)):
+async def compare_clubs(
+    ids: Optional[str] = Query(default=""), season: str = Query(...)
+):
     """Compare clubs within a competition for a season."""
     id_list = _parse_ids(ids)
     if not id_list:
         return []
-    con = get_conn()
-    placeholders = ",".join(["?"] * len(id_list))
-    q = f"""
-    SELECT club_id, club_name, games_played, points, goals_for, goals_against, goal_difference
-    FROM mart_competition_club_season
-    WHERE season = ? AND club_id IN ({placeholders})
-    ORDER BY club_name
-    """
-    params: List[object] = [season, *id_list]
-    rows = con.execute(q, params).fetchall()
+    rows = await aquery("compare_clubs", [season, id_list])
     return [
         CompareClub(
             club_id=r[0],
@@ -1,7 +1,7 @@
 from fastapi import APIRouter
 from typing import List
 from pydantic import BaseModel
-from ..db import get_conn
+from ..db import aquery
 
 router = APIRouter()
 
@@ -21,17 +21,9 @@ class LeagueFormation(BaseModel):
 
 
 @router.get("/formations/league", response_model=List[LeagueFormation])
-def league_formations(competition_id: str, season: str):
+async def league_formations(competition_id: str, season: str):
     """Return formation performance for a league and season."""
-    con = get_conn()
-    q = """
-    SELECT club_formation, games_played, wins, draws, losses,
-           goals_for, goals_against, avg_goals_for, avg_goals_against, ppg, win_percentage
-    FROM mart_competition_formation_season
-    WHERE competition_id = ? AND season = ?
-    ORDER BY games_played DESC, ppg DESC
-    """
-    rows = con.execute(q, [competition_id, season]).fetchall()
+    rows = await aquery("league_formations", [competition_id, season])
     return [
         LeagueFormation(
             club_formation=r[0],
@@ -51,16 +43,9 @@ def league_formations(competition_id: str, season: str):
 
 
 @router.get("/formations/history", response_model=List[LeagueFormation])
-def formation_history():
+async def formation_history():
     """Return global formation performance history."""
-    con = get_conn()
-    q = """
-    SELECT club_formation, games_played, wins, draws, losses,
-           goals_for, goals_against, avg_goals_for, avg_goals_against, ppg, win_percentage
-    FROM mart_formation_history_performance
-    ORDER BY games_played DESC, ppg DESC
-    """
-    rows = con.execute(q).fetchall()
+    rows = await aquery("formation_history")
     return [
         LeagueFormation(
             club_formation=r[0],
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Query, HTTPException, status
 from typing import List
 from pydantic import BaseModel
-from ..db import get_conn
+from ..db import aquery, aquery_one
 
 router = APIRouter()
 
@@ -27,17 +27,9 @@ class LeagueStats(BaseModel):
 
 
 @router.get("/league-table", response_model=List[LeagueRow])
-def league_table(competition_id: str = Query(...), season: str = Query(...)):
+async def league_table(competition_id: str = Query(...), season: str = Query(...)):
     """Return league table for given competition and season."""
-    con = get_conn()
-    q = """
-    SELECT club_id, club_name, games_played, wins, draws, losses,
-           points, goals_for, goals_against, goal_difference
-    FROM mart_competition_club_season
-    WHERE competition_id = ? AND season = ?
-    ORDER BY points DESC, goal_difference DESC
-    """
-    rows = con.execute(q, [competition_id, season]).fetchall()
+    rows = await aquery("league_table", [competition_id, season])
     return [
         LeagueRow(
             club_id=r[0],
@@ -56,19 +48,9 @@ def league_table(competition_id: str = Query(...), season: str = Query(...)):
 
 
 @router.get("/league-stats", response_model=LeagueStats)
-def league_stats(competition_id: str, season: str):
+async def league_stats(competition_id: str, season: str):
     """Return league summary stats for given competition and season."""
-    con = get_conn()
-    q = """
-    SELECT
-      COUNT(*) AS club_count,
-      AVG(points) AS avg_points,
-      AVG(goal_difference) AS avg_gd,
-      SUM(goals_for) AS total_goals
-    FROM mart_competition_club_season
-    WHERE competition_id = ? AND season = ?
-    """
-    r = con.execute(q, [competition_id, season]).fetchone()
+    r = await aquery_one("league_stats", [competition_id, season])
     # If no clubs found for given filters, return 404
     if r is None or (r[0] is not None and isinstance(r[0], int) and r[0] == 0):
         raise HTTPException(
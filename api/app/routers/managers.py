@@ -2,7 +2,7 @@ from fastapi import APIRouter, Query
 from typing import Annotated
 from typing import List
 from pydantic import BaseModel
-from ..db import get_conn
+from ..db import aquery
 
 router = APIRouter()
 
@@ -29,16 +29,9 @@ class ManagerFormation(BaseModel):
 
 
 @router.get("/managers/performance", response_model=List[ManagerPerf])
-def manager_performance(limit: Annotated[int, Query(ge=1, le=500)] = 100):
+async def manager_performance(limit: Annotated[int, Query(ge=1, le=500)] = 100):
     """Return manager performance for a season."""
-    con = get_conn()
-    q = """
-    SELECT manager_name, games_played, points, ppg, win_rate
-    FROM mart_manager_performance
-    ORDER BY games_played DESC, ppg DESC
-    LIMIT ?
-    """
-    rows = con.execute(q, [limit]).fetchall()
+    rows = await aquery("manager_performance", [limit])
     return [
         ManagerPerf(
             manager_name=r[0], games_played=r[1], points=r[2], ppg=r[3], win_rate=r[4]
@@ -48,17 +41,9 @@ def manager_performance(limit: Annotated[int, Query(ge=1, le=500)] = 100):
 
 
 @router.get("/managers/formation", response_model=List[ManagerFormation])
-def manager_formation(manager_name: str):
+async def manager_formation(manager_name: str):
     """Return formation performance for a manager."""
-    con = get_conn()
-    q = """
-    SELECT club_formation, games_played, avg_goals_for, avg_goals_against,
-           wins, draws, losses, points, ppg, win_rate
-    FROM mart_manager_formation_performance
-    WHERE manager_name = ?
-    ORDER BY ppg DESC
-    """
-    rows = con.execute(q, [manager_name]).fetchall()
+    rows = await aquery("manager_formation", [manager_name])
     return [
         ManagerFormation(
             club_formation=r[0],
@@ -85,20 +70,12 @@ class ManagerBestFormation(BaseModel):
 
 
 @router.get("/managers/best-formations", response_model=List[ManagerBestFormation])
-def managers_best_formations(
+async def managers_best_formations(
     limit: Annotated[int, Query(ge=1, le=500)] = 50,
     min_games: Annotated[int, Query(ge=0)] = 10,
 ):
     """Return managers' best-performing formations ordered by PPG."""
-    con = get_conn()
-    q = """
-    SELECT manager_name, club_formation, ppg, win_rate, games_played
-    FROM mart_manager_formation_performance
-    WHERE games_played >= ?
-    ORDER BY ppg DESC
-    LIMIT ?
-    """
-    rows = con.execute(q, [min_games, limit]).fetchall()
+    rows = await aquery("managers_best_formations", [min_games, limit])
     return [
         ManagerBestFormation(
             manager_name=r[0],
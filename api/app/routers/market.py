@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Query
 from typing import List, Optional, Literal, Annotated
 from pydantic import BaseModel
-from ..db import get_conn
+from ..db import aquery
 
 router = APIRouter()
 
@@ -31,23 +31,13 @@ class ValuePerf(BaseModel):
 
 
 @router.get("/market/movers", response_model=List[MarketMover])
-def market_movers(
+async def market_movers(
     season: str,
     direction: Literal["up", "down"] = "up",
     limit: Annotated[int, Query(ge=1, le=500)] = 50,
 ):
     """Return top value gainers or losers for given season."""
-    con = get_conn()
-    order = "DESC" if direction == "up" else "ASC"
-    q = f"""
-    SELECT player_id, name, first_market_value, last_market_value,
-           value_change_amount, value_change_percentage
-    FROM mart_player_valuation_season
-    WHERE season = ?
-    ORDER BY value_change_amount {order}
-    LIMIT ?
-    """
-    rows = con.execute(q, [season, limit]).fetchall()
+    rows = await aquery("market_movers", [season, limit], variant=direction)
     return [
         MarketMover(
             player_id=r[0],
@@ -62,19 +52,9 @@ def market_movers(
 
 
 @router.get("/analytics/value-perf", response_model=List[ValuePerf])
-def value_perf(season: str):
+async def value_perf(season: str):
     """Return value vs performance dataset for given season."""
-    con = get_conn()
-    q = """
-    SELECT player_id, player_name, age_in_season, minutes_played,
-           goals_per90, assists_per90, goal_plus_assist_per90, efficiency_score,
-           first_market_value, last_market_value, value_change_amount, value_change_percentage
-    FROM mart_player_value_performance_corr
-    WHERE season = ?
-    ORDER BY last_market_value DESC
-    LIMIT 1000
-    """
-    rows = con.execute(q, [season]).fetchall()
+    rows = await aquery("value_perf", [season])
     return [
         ValuePerf(
             player_id=r[0],
@@ -1,7 +1,8 @@
 from fastapi import APIRouter
 from typing import List
 from pydantic import BaseModel
-from ..db import get_conn
+from .. import dims
+from ..db import aquery
 
 router = APIRouter()
 
@@ -16,31 +17,20 @@ class CompetitionOut(BaseModel):
 
 
 @router.get("/seasons", response_model=List[SeasonOut])
-def seasons():
+async def seasons():
     """Return all available seasons."""
-    con = get_conn()
-    q = """
-    SELECT DISTINCT season
-    FROM mart_competition_club_season
-    ORDER BY season DESC
-    """
-    rows = con.execute(q).fetchall()
+    d = dims.get()
+    if d is not None:
+        return [SeasonOut(season=s) for s in d.seasons]
+    rows = await aquery("seasons")
     return [SeasonOut(season=r[0]) for r in rows]
 
 
 @router.get("/competitions", response_model=List[CompetitionOut])
-def competitions():
+async def competitions():
     """Return competitions."""
-    con = get_conn()
-    q = """
-    SELECT DISTINCT m.competition_id, m.competition_name
-    FROM mart_competition_club_season m
-    JOIN main.stg_competitions s
-    ON s.competition_id = m.competition_id
-    WHERE s.competition_type IN ('domestic_league', 'international_cup')
-    ORDER BY m.competition_name
-    """
-    rows = con.execute(q).fetchall()
+    d = dims.get()
+    rows = d.competitions if d is not None else await aquery("competitions")
     return [CompetitionOut(competition_id=r[0], competition_name=r[1]) for r in rows]
 
 
@@ -54,14 +44,11 @@ class ClubLite(BaseModel):
     response_model=List[ClubLite],
     response_model_exclude_none=True,
 )
-def clubs(competition_id: str, season: str):
+async def clubs(competition_id: str, season: str):
     """Return clubs for a competition and season (non-autocomplete)."""
-    con = get_conn()
-    q = """
-    SELECT DISTINCT club_id, club_name
-    FROM mart_competition_club_season
-    WHERE competition_id = ? AND season = ?
-    ORDER BY club_name
-    """
-    rows = con.execute(q, [competition_id, season]).fetchall()
+    d = dims.get()
+    if d is not None:
+        rows = d.clubs_for(competition_id, season)
+    else:
+        rows = await aquery("competition_clubs", [competition_id, season])
     return [ClubLite(club_id=r[0], club_name=r[1]) for r in rows]
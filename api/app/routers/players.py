@@ -1,7 +1,8 @@
 from fastapi import APIRouter, HTTPException, status, Query
 from typing import List, Optional, Literal, Annotated
 from pydantic import BaseModel
-from ..db import get_conn
+from ..db import aquery, aquery_one
+from ..queries import LEADER_METRICS
 
 router = APIRouter()
 
@@ -47,7 +48,7 @@ class PlayerValuationSeason(BaseModel):
 
 
 @router.get("/players/top", response_model=List[PlayerTop])
-def players_top(
+async def players_top(
     season: str,
     metric: Literal[
         "minutes_played",
@@ -70,25 +71,14 @@ def players_top(
     If `competition_id` is provided, results are scoped to that competition
     using `mart_competition_player_season`; otherwise `mart_player_season`.
     """
-    con = get_conn()
-    table = "mart_competition_player_season" if competition_id else "mart_player_season"
-    where = ["season = ?", "minutes_played >= ?"]
-    params = [season, min_minutes]
     if competition_id:
-        where.append("competition_id = ?")
-        params.append(competition_id)
-    where_clause = " AND ".join(where)
-    q = f"""
-    SELECT player_id, player_name, games_played, minutes_played,
-           goals, assists, (goals + assists) AS total_goals_and_assists,
-           yellow_cards, red_cards,
-           goals_per90, assists_per90, goal_plus_assist_per90, efficiency_score
-    FROM {table}
-    WHERE {where_clause}
-    ORDER BY {metric} DESC
-    LIMIT ?
-    """
-    rows = con.execute(q, [*params, limit]).fetchall()
+        rows = await aquery(
+            "players_top_competition",
+            [season, min_minutes, limit, competition_id],
+            variant=metric,
+        )
+    else:
+        rows = await aquery("players_top", [season, min_minutes, limit], variant=metric)
     return [
         PlayerTop(
             player_id=r[0],
@@ -110,18 +100,9 @@ def players_top(
 
 
 @router.get("/players/{player_id}/season", response_model=PlayerSeason)
-def player_season(player_id: int, season: str):
+async def player_season(player_id: int, season: str):
     """Return player stats for given season."""
-    con = get_conn()
-    q = """
-    SELECT player_name, games_played, minutes_played, goals, assists,
-           yellow_cards, red_cards,
-           goals_per90, assists_per90, goal_plus_assist_per90, efficiency_score,
-           season_last_value_eur
-    FROM mart_player_season
-    WHERE player_id = ? AND season = ?
-    """
-    r = con.execute(q, [player_id, season]).fetchone()
+    r = await aquery_one("player_season", [player_id, season])
     if r is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -164,22 +145,14 @@ class PlayerSeasonCompetition(BaseModel):
     "/players/{player_id}/season-competition",
     response_model=PlayerSeasonCompetition,
 )
-def player_season_competition(player_id: int, season: str, competition_id: str):
+async def player_season_competition(player_id: int, season: str, competition_id: str):
     """Return player stats for a given season within a competition.
 
     Backed by mart_competition_player_season (grain: player, season, competition).
     """
-    con = get_conn()
-    q = """
-    SELECT player_name, competition_id, competition_name,
-           games_played, minutes_played, goals, assists,
-           yellow_cards, red_cards,
-           goals_per90, assists_per90, goal_plus_assist_per90, efficiency_score,
-           season_last_value_eur
-    FROM mart_competition_player_season
-    WHERE player_id = ? AND season = ? AND competition_id = ?
-    """
-    r = con.execute(q, [player_id, season, competition_id]).fetchone()
+    r = await aquery_one(
+        "player_season_competition", [player_id, season, competition_id]
+    )
     if r is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -206,16 +179,9 @@ def player_season_competition(player_id: int, season: str, competition_id: str):
 @router.get(
     "/players/{player_id}/valuation-season", response_model=PlayerValuationSeason
 )
-def valuation_season(player_id: int, season: str):
+async def valuation_season(player_id: int, season: str):
     """Return player valuation changes for given season."""
-    con = get_conn()
-    q = """
-    SELECT first_market_value, last_market_value, min_market_value, max_market_value,
-           value_change_amount, value_change_percentage
-    FROM mart_player_valuation_season
-    WHERE player_id = ? AND season = ?
-    """
-    r = con.execute(q, [player_id, season]).fetchone()
+    r = await aquery_one("player_valuation_season", [player_id, season])
     if r is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -249,18 +215,9 @@ class PlayerCareerRow(BaseModel):
     response_model=List[PlayerCareerRow],
     response_model_exclude_none=True,
 )
-def player_career(player_id: int):
+async def player_career(player_id: int):
     """Return player season-by-season performance history."""
-    con = get_conn()
-    q = """
-    SELECT season, games_played, minutes_played, goals, assists,
-           goals_per90, assists_per90, goal_plus_assist_per90, efficiency_score,
-           season_last_value_eur
-    FROM mart_player_season
-    WHERE player_id = ?
-    ORDER BY season
-    """
-    rows = con.execute(q, [player_id]).fetchall()
+    rows = await aquery("player_career", [player_id])
     return [
         PlayerCareerRow(
             season=r[0],
@@ -290,16 +247,9 @@ class PlayerValuationHistoryRow(BaseModel):
     "/players/{player_id}/valuation-history",
     response_model=List[PlayerValuationHistoryRow],
 )
-def player_valuation_history(player_id: int):
+async def player_valuation_history(player_id: int):
     """Return market value trend by season for a player."""
-    con = get_conn()
-    q = """
-    SELECT season, first_market_value, last_market_value, min_market_value, max_market_value
-    FROM mart_player_valuation_season
-    WHERE player_id = ?
-    ORDER BY season
-    """
-    rows = con.execute(q, [player_id]).fetchall()
+    rows = await aquery("player_valuation_history", [player_id])
     return [
         PlayerValuationHistoryRow(
             season=r[0],
@@ -312,17 +262,6 @@ def player_valuation_history(player_id: int):
     ]
 
 
-LEADER_METRICS = [
-    "minutes_played",
-    "goals",
-    "assists",
-    "goal_plus_assist_per90",
-    "goals_per90",
-    "assists_per90",
-    "efficiency_score",
-]
-
-
 class PlayerLeaderRow(BaseModel):
     player_id: int
     player_name: str
@@ -340,7 +279,7 @@ class PlayerLeaderRow(BaseModel):
     response_model=List[PlayerLeaderRow],
     response_model_exclude_none=True,
 )
-def player_leaders(
+async def player_leaders(
     season: str,
     competition_id: str,
     metric: Literal[
@@ -358,18 +297,11 @@ def player_leaders(
     """Return leaders by metric for a season and competition (club-independent)."""
     if metric not in LEADER_METRICS:
         raise HTTPException(status_code=400, detail="Invalid metric")
-    con = get_conn()
-    q = f"""
-    SELECT player_id, player_name, minutes_played, goals, assists,
-           goals_per90, assists_per90, goal_plus_assist_per90, efficiency_score
-    FROM mart_competition_player_season
-    WHERE season = ?
-      AND competition_id = ?
-      AND minutes_played >= ?
-    ORDER BY {metric} DESC
-    LIMIT ?
-    """
-    rows = con.execute(q, [season, competition_id, min_minutes, limit]).fetchall()
+    rows = await aquery(
+        "player_leaders",
+        [season, competition_id, min_minutes, limit],
+        variant=metric,
+    )
     return [
         PlayerLeaderRow(
             player_id=r[0],
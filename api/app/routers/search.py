@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Query
 from typing import List, Annotated
 from pydantic import BaseModel
-from ..db import get_conn
+from ..db import aquery
 
 router = APIRouter()
 
@@ -39,37 +39,12 @@ class ClubSearch(BaseModel):
     response_model=List[PlayerSearch],
     response_model_exclude_none=True,
 )
-def search_players(
+async def search_players(
     q: str,
     limit: Annotated[int, Query(ge=1, le=100)] = 20,
 ):
     """Player autocomplete for a season with career summary fields."""
-    con = get_conn()
-    qsql = """
-        WITH candidates AS (
-            SELECT DISTINCT player_id
-            FROM mart_player_season
-            WHERE player_name ILIKE '%' || ? || '%'
-            LIMIT ?
-        )
-        SELECT pcs.player_id,
-               pcs.player_name,
-               pcs.total_matches,
-               pcs.total_minutes,
-               pcs.total_goals,
-               pcs.total_assists,
-               pcs.total_goal_contributions,
-               pcs.total_yellow_cards,
-               pcs.total_red_cards,
-               pcs.gpg,
-               pcs.apg,
-               pcs.total_goal_contributions_pg
-        FROM mart_player_career_summary pcs
-        JOIN candidates c
-          ON pcs.player_id = c.player_id
-        ORDER BY pcs.player_name
-        """
-    rows = con.execute(qsql, [q, limit]).fetchall()
+    rows = await aquery("search_players", [q, limit])
     return [
         PlayerSearch(
             player_id=r[0],
@@ -101,32 +76,12 @@ class ManagerSearch(BaseModel):
     response_model=List[ManagerSearch],
     response_model_exclude_none=True,
 )
-def search_managers(
+async def search_managers(
     q: str,
     limit: Annotated[int, Query(ge=1, le=100)] = 20,
 ):
     """Manager autocomplete with best-available season summary per manager."""
-    con = get_conn()
-    qsql = """
-        WITH ranked AS (
-            SELECT manager_name,
-                   games_played,
-                   ppg,
-                   win_rate,
-                   ROW_NUMBER() OVER (
-                       PARTITION BY manager_name
-                       ORDER BY games_played DESC, ppg DESC
-                   ) AS rn
-            FROM mart_manager_performance
-            WHERE manager_name ILIKE '%' || ? || '%'
-        )
-        SELECT manager_name, games_played, ppg, win_rate
-        FROM ranked
-        WHERE rn = 1
-        ORDER BY manager_name
-        LIMIT ?
-        """
-    rows = con.execute(qsql, [q, limit]).fetchall()
+    rows = await aquery("search_managers", [q, limit])
     return [
         ManagerSearch(
             manager_name=r[0],
@@ -143,48 +98,12 @@ def search_managers(
     response_model=List[ClubSearch],
     response_model_exclude_none=True,
 )
-def search_clubs(
+async def search_clubs(
     q: str,
     limit: Annotated[int, Query(ge=1, le=100)] = 20,
 ):
     """Club autocomplete across all competitions with aggregated totals."""
-    con = get_conn()
-    qsql = """
-        WITH candidates AS (
-            SELECT DISTINCT club_id, club_name
-            FROM mart_competition_club_season
-            WHERE club_name ILIKE '%' || ? || '%'
-            ORDER BY club_name
-            LIMIT ?
-        ),
-        agg AS (
-            SELECT club_id,
-                   SUM(games_played)      AS total_games_played,
-                   SUM(wins)              AS total_wins,
-                   SUM(draws)             AS total_draws,
-                   SUM(losses)            AS total_losses,
-                   SUM(points)            AS total_points,
-                   SUM(goals_for)         AS total_goals_for,
-                   SUM(goals_against)     AS total_goals_against,
-                   SUM(goal_difference)   AS total_goal_difference
-            FROM mart_competition_club_season
-            GROUP BY club_id
-        )
-        SELECT c.club_id,
-               c.club_name,
-               COALESCE(a.total_games_played, 0),
-               COALESCE(a.total_wins, 0),
-               COALESCE(a.total_draws, 0),
-               COALESCE(a.total_losses, 0),
-               COALESCE(a.total_points, 0),
-               COALESCE(a.total_goals_for, 0),
-               COALESCE(a.total_goals_against, 0),
-               COALESCE(a.total_goal_difference, 0)
-        FROM candidates c
-        LEFT JOIN agg a USING (club_id)
-        ORDER BY c.club_name
-        """
-    rows = con.execute(qsql, [q, limit]).fetchall()
+    rows = await aquery("search_clubs", [q, limit])
     return [
         ClubSearch(
             club_id=r[0],
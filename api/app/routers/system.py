@@ -1,17 +1,26 @@
 import os
 from fastapi import APIRouter
 
+from ..admission import admission
+from ..cache import response_cache
+from ..db import active_mode, lanes
+from ..executor import stats as executor_stats
+from ..queries import timings
+from ..settings import settings
+from ..singleflight import flights
+from ..snapshots import snapshots
+
 router = APIRouter()
 
 
 @router.get("/health")
-def api_health():
+async def api_health():
     """Health probe for API service."""
     return {"status": "ok"}
 
 
 @router.get("/version")
-def version():
+async def version():
     """Return build/version metadata if available."""
     git_sha = os.getenv("GIT_SHA") or os.getenv("COMMIT_SHA")
     build_time = os.getenv("BUILD_TIME")
@@ -22,9 +31,27 @@ def version():
 
 
 @router.get("/limits")
-def limits():
-    """Return API default limits and thresholds."""
+async def limits():
+    """Return API default limits, thresholds and DuckDB resource settings."""
     return {
         "value_perf_default_limit": 500,
         "efficiency_screener_default_limit": 100,
+        "duckdb": {
+            **settings.as_dict(),
+            "db_mode": active_mode(),
+            "lanes": lanes(),
+        },
+    }
+
+
+@router.get("/metrics")
+async def metrics():
+    """Return live counters for the cache, admission, coalescing and queries."""
+    return {
+        "cache": response_cache.stats(),
+        "snapshots": snapshots.stats(),
+        "admission": admission.stats(),
+        "singleflight": flights.stats(),
+        "queries": timings.stats(),
+        "executor": executor_stats(),
     }
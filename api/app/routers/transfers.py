@@ -1,7 +1,7 @@
 from fastapi import APIRouter, HTTPException, status
 from typing import List, Optional, Dict
 from pydantic import BaseModel
-from ..db import get_conn
+from ..db import aquery, aquery_one
 from datetime import date
 
 router = APIRouter()
@@ -64,18 +64,9 @@ class AgeFeeProfile(BaseModel):
 
 
 @router.get("/transfers/player/{player_id}", response_model=List[TransferPlayer])
-def player_transfers(player_id: int):
+async def player_transfers(player_id: int):
     """Return player transfer history."""
-    con = get_conn()
-    q = """
-    SELECT transfer_date, season, from_club_id, from_club_name,
-           to_club_id, to_club_name, is_free_transfer, is_loan_out, is_loan_return,
-           market_value_in_eur, transfer_fee, fee_norm, transfer_category
-    FROM mart_transfer_player
-    WHERE player_id = ?
-    ORDER BY transfer_date DESC
-    """
-    rows = con.execute(q, [player_id]).fetchall()
+    rows = await aquery("player_transfers", [player_id])
     return [
         TransferPlayer(
             transfer_date=r[0],
@@ -97,19 +88,9 @@ def player_transfers(player_id: int):
 
 
 @router.get("/transfers/club/{club_id}", response_model=TransferClub)
-def club_transfers(club_id: int, season: str):
+async def club_transfers(club_id: int, season: str):
     """Return club transfer summary for a season."""
-    con = get_conn()
-    q = """
-    SELECT club_name, incoming_total, outgoing_total,
-           incoming_free_cnt, incoming_paid_cnt, incoming_loan_cnt, incoming_loan_return_cnt,
-           outgoing_free_cnt, outgoing_paid_cnt, outgoing_loan_cnt, outgoing_loan_return_cnt,
-           transfer_spend, transfer_income, net_spend,
-           incoming_free_rate, incoming_paid_rate, outgoing_paid_rate
-    FROM mart_transfer_club
-    WHERE club_id = ? AND season = ?
-    """
-    r = con.execute(q, [club_id, season]).fetchone()
+    r = await aquery_one("club_transfers", [club_id, season])
     if r is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -137,15 +118,9 @@ def club_transfers(club_id: int, season: str):
 
 
 @router.get("/transfers/age-fee-profile", response_model=List[AgeFeeProfile])
-def age_fee_profile():
+async def age_fee_profile():
     """Return transfer fee distribution by age bucket."""
-    con = get_conn()
-    q = """
-    SELECT age_bucket, transfer_count, avg_transfer_fee
-    FROM mart_transfer_age_fee_profile
-    ORDER BY age_bucket
-    """
-    rows = con.execute(q).fetchall()
+    rows = await aquery("transfer_age_fee_profile")
     return [
         AgeFeeProfile(age_bucket=r[0], transfer_count=r[1], avg_transfer_fee=r[2])
         for r in rows
@@ -153,29 +128,12 @@ def age_fee_profile():
 
 
 @router.get("/transfers/club/{club_id}/players")
-def club_transfers_players(
+async def club_transfers_players(
     club_id: int, season: str
 ) -> Dict[str, List[ClubTransferItem]]:
     """Return incoming and outgoing transfers for a club in a season."""
-    con = get_conn()
-    q_in = """
-    SELECT player_id, player_name, transfer_date, season,
-           from_club_name, to_club_name, is_free_transfer, is_loan_out, is_loan_return,
-           transfer_fee, transfer_category
-    FROM mart_transfer_player
-    WHERE to_club_id = ? AND season = ?
-    ORDER BY transfer_date DESC
-    """
-    q_out = """
-    SELECT player_id, player_name, transfer_date, season,
-           from_club_name, to_club_name, is_free_transfer, is_loan_out, is_loan_return,
-           transfer_fee, transfer_category
-    FROM mart_transfer_player
-    WHERE from_club_id = ? AND season = ?
-    ORDER BY transfer_date DESC
-    """
-    rows_in = con.execute(q_in, [club_id, season]).fetchall()
-    rows_out = con.execute(q_out, [club_id, season]).fetchall()
+    rows_in = await aquery("club_transfers_in", [club_id, season])
+    rows_out = await aquery("club_transfers_out", [club_id, season])
     incoming: List[ClubTransferItem] = [
         ClubTransferItem(
             player_id=r[0],
@@ -223,20 +181,9 @@ class TransferSpendRow(BaseModel):
     "/transfers/top-spenders",
     response_model=List[TransferSpendRow],
 )
-def top_spenders(season: str, competition_id: str, limit: int = 20):
+async def top_spenders(season: str, competition_id: str, limit: int = 20):
     """Return top net spenders for a competition and season."""
-    con = get_conn()
-    q = """
-    SELECT t.club_id, c.club_name, t.transfer_spend, t.transfer_income, t.net_spend
-    FROM mart_transfer_club t
-    JOIN mart_competition_club_season c
-      ON c.club_id = t.club_id
-     AND LEFT(t.season, 4) = c.season
-    WHERE t.season = ? AND c.competition_id = ?
-    ORDER BY t.net_spend DESC
-    LIMIT ?
-    """
-    rows = con.execute(q, [season, competition_id, limit]).fetchall()
+    rows = await aquery("transfer_top_spenders", [season, competition_id, limit])
     return [
         TransferSpendRow(
             club_id=r[0],
@@ -261,23 +208,9 @@ class CompetitionTransferSummary(BaseModel):
     "/transfers/competition-summary",
     response_model=List[CompetitionTransferSummary],
 )
-def competition_summary(season: str):
+async def competition_summary(season: str):
     """Return transfer spend/income totals per competition for a season."""
-    con = get_conn()
-    q = """
-    SELECT c.competition_id, c.competition_name,
-           SUM(t.transfer_spend) AS total_spend,
-           SUM(t.transfer_income) AS total_income,
-           SUM(t.net_spend) AS total_net
-    FROM mart_transfer_club t
-    JOIN mart_competition_club_season c
-    ON c.club_id = t.club_id
-    AND LEFT(t.season, 4) = c.season
-    WHERE t.season = ?
-    GROUP BY c.competition_id, c.competition_name
-    ORDER BY total_net DESC
-    """
-    rows = con.execute(q, [season]).fetchall()
+    rows = await aquery("transfer_competition_summary", [season])
     return [
         CompetitionTransferSummary(
             competition_id=r[0],
@@ -301,22 +234,9 @@ class FreeVsPaid(BaseModel):
     "/transfers/free-vs-paid",
     response_model=FreeVsPaid,
 )
-def free_vs_paid(season: str, competition_id: str):
+async def free_vs_paid(season: str, competition_id: str):
     """Return free vs paid transfer counts aggregated for a competition and season."""
-    con = get_conn()
-    q = """
-    SELECT
-      SUM(t.incoming_free_cnt) AS inc_free,
-      SUM(t.incoming_paid_cnt) AS inc_paid,
-      SUM(t.outgoing_free_cnt) AS out_free,
-      SUM(t.outgoing_paid_cnt) AS out_paid
-    FROM mart_transfer_club t
-    JOIN mart_competition_club_season c
-    ON c.club_id = t.club_id
-    AND LEFT(t.season, 4) = c.season
-    WHERE t.season = ? AND c.competition_id = ?
-    """
-    r = con.execute(q, [season, competition_id]).fetchone()
+    r = await aquery_one("transfer_free_vs_paid", [season, competition_id])
     if r is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="No data found"
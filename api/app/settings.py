@@ -0,0 +1,119 @@
+"""DuckDB resource settings for the serving API.
+
+Settings are read once from env vars and passed as `config` when a DuckDB
+instance is opened. DuckDB applies them per instance (`SET threads` cannot be
+scoped to one connection), so every cursor handed out by `db.get_conn` shares
+them. A route with a thread override is served from its own read-only instance
+("lane") on the same file, so heavy scans can fan out without letting cheap
+lookups oversubscribe the CPU.
+
+Env vars:
+- DUCKDB_THREADS: threads per instance (default: half the CPUs, at least 1)
+- DUCKDB_MEMORY_LIMIT: e.g. `2GB` (default: DuckDB's own, 80% of RAM)
+- DUCKDB_TEMP_DIRECTORY: spill directory for larger-than-memory operators
+- DUCKDB_PRESERVE_INSERTION_ORDER: `true|false` (default true)
+- DUCKDB_ENABLE_OBJECT_CACHE: `true|false` cache file metadata (default false)
+- DUCKDB_ROUTE_THREADS: comma-separated `path_prefix=threads` overrides, e.g.
+  `/api/analytics=4,/api/transfers/age-fee-profile=4`
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    raw = os.getenv(name)
+    if raw is None or raw.strip() == "":
+        return default
+    return raw.strip().lower() in ("1", "true", "yes", "on")
+
+
+def parse_mapping(raw: str) -> Dict[str, str]:
+    """Parse `key=value,key=value` into a dict (items without `=` are skipped)."""
+    out: Dict[str, str] = {}
+    for item in raw.split(","):
+        key, sep, value = item.strip().partition("=")
+        if sep and key.strip():
+            out[key.strip()] = value.strip()
+    return out
+
+
+def match_prefix(prefixes: Iterable[str], path: Optional[str]) -> Optional[str]:
+    """Return the longest prefix that matches `path` on a segment boundary."""
+    best = None
+    for prefix in prefixes:
+        base = prefix.rstrip("/")
+        if path and (path == base or path.startswith(base + "/")):
+            if best is None or len(prefix) > len(best):
+                best = prefix
+    return best
+
+
+def _parse_route_threads(raw: str) -> Dict[str, int]:
+    """Parse `prefix=threads,...` into a dict (bad items are skipped)."""
+    out: Dict[str, int] = {}
+    for prefix, value in parse_mapping(raw).items():
+        if not prefix.startswith("/"):
+            continue
+        try:
+            out[prefix] = max(1, int(value))
+        except ValueError:
+            continue
+    return out
+
+
+@dataclass(frozen=True)
+class DuckDBSettings:
+    threads: int
+    memory_limit: Optional[str] = None
+    temp_directory: Optional[str] = None
+    preserve_insertion_order: bool = True
+    enable_object_cache: bool = False
+    route_threads: Dict[str, int] = field(default_factory=dict)
+
+    def config(self, threads: Optional[int] = None) -> Dict[str, object]:
+        """Return the `duckdb.connect(config=...)` dict, optionally re-threaded."""
+        cfg: Dict[str, object] = {
+            "threads": threads or self.threads,
+            "preserve_insertion_order": self.preserve_insertion_order,
+            "enable_object_cache": self.enable_object_cache,
+        }
+        if self.memory_limit:
+            cfg["memory_limit"] = self.memory_limit
+        if self.temp_directory:
+            cfg["temp_directory"] = self.temp_directory
+        return cfg
+
+    def threads_for(self, path: Optional[str]) -> int:
+        """Return the thread count for a request path (longest prefix wins)."""
+        prefix = match_prefix(self.route_threads, path)
+        return self.route_threads[prefix] if prefix else self.threads
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "threads": self.threads,
+            "memory_limit": self.memory_limit,
+            "temp_directory": self.temp_directory,
+            "preserve_insertion_order": self.preserve_insertion_order,
+            "enable_object_cache": self.enable_object_cache,
+            "route_threads": dict(self.route_threads),
+        }
+
+
+def load_settings() -> DuckDBSettings:
+    """Build settings from the environment."""
+    threads = os.getenv("DUCKDB_THREADS")
+    return DuckDBSettings(
+        threads=max(1, int(threads)) if threads else max(1, (os.cpu_count() or 2) // 2),
+        memory_limit=os.getenv("DUCKDB_MEMORY_LIMIT") or None,
+        temp_directory=os.getenv("DUCKDB_TEMP_DIRECTORY") or None,
+        preserve_insertion_order=_env_bool("DUCKDB_PRESERVE_INSERTION_ORDER", True),
+        enable_object_cache=_env_bool("DUCKDB_ENABLE_OBJECT_CACHE", False),
+        route_threads=_parse_route_threads(os.getenv("DUCKDB_ROUTE_THREADS", "")),
+    )
+
+
+settings = load_settings()
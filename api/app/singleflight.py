@@ -0,0 +1,97 @@
+"""Single-flight coalescing of identical concurrent queries.
+
+When several requests run the same (SQL, params) at once, e.g. a dashboard full
+of users opening a new season's league table, the first caller executes it and
+the others block until it finishes and share its result (or its exception).
+Errors that only concern the leader's own request (e.g. its deadline passed or
+its client left) are not shared: a waiting caller takes over and runs `fn`
+again. Nothing is kept after the call completes; repeated work across time is the
+response cache's job.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, Type
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Thread-safe map of in-flight calls keyed by a hashable key."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.executions = 0
+        self.saved = 0
+        self.retried = 0
+
+    def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Any],
+        timeout: Optional[float] = None,
+        retry_on: Tuple[Type[BaseException], ...] = (),
+    ) -> Any:
+        """Return `fn()`, sharing one execution among concurrent callers of `key`.
+
+        Callers that join an in-flight call wait at most `timeout` seconds and
+        then raise TimeoutError; the leader is not affected. When the leader
+        fails with one of `retry_on`, waiting callers do not inherit the error:
+        one of them becomes the new leader and the rest wait for it.
+        """
+        expires = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                leader = call is None
+                if leader:
+                    call = self._calls[key] = _Call()
+                    self.executions += 1
+                else:
+                    self.saved += 1
+            if leader:
+                break
+            remaining = (
+                None if expires is None else max(0.0, expires - time.monotonic())
+            )
+            if not call.done.wait(remaining):
+                raise TimeoutError(f"single-flight wait exceeded {timeout}s")
+            if call.error is None:
+                return call.result
+            if not isinstance(call.error, retry_on):
+                raise call.error
+            with self._lock:
+                self.saved -= 1
+                self.retried += 1
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "executions": self.executions,
+                "saved_executions": self.saved,
+                "retried": self.retried,
+                "in_flight": len(self._calls),
+            }
+
+
+flights = SingleFlight()
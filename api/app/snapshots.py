@@ -0,0 +1,216 @@
+"""Build-time static snapshots of hot endpoints, served without touching DuckDB.
+
+`python -m api.app.snapshots --out DIR` (or `python -m app.snapshots` from
+`api/`) enumerates every (competition, season) in
+`mart_competition_club_season`, renders the league table, league stats, league
+formations and per-metric leaders (default params) plus the global lists through
+the app in-process, and writes each 200 response as
+`DIR/<path>/<canonical query>.json` with `.json.gz` / `.json.br` next to it.
+`manifest.json` records the request keys and the SHA256 of the serving DB.
+
+At startup the API loads the manifest from SNAPSHOT_DIR when its DB hash matches
+the serving DB and answers those request keys straight from the files. The
+layout also works behind any static server or CDN that maps
+`/api/league-table?competition_id=GB1&season=2023` to
+`/api/league-table/competition_id=GB1&season=2023.json` (query params sorted).
+
+Env vars:
+- SNAPSHOT_DIR: directory with `manifest.json` to serve from (unset disables)
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import urlencode
+
+import anyio
+
+from .cache import is_cacheable, request_key
+from .compression import accept_encoding, encode_variants, encoded_headers, negotiate
+from .queries import LEADER_METRICS
+
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR")
+MANIFEST = "manifest.json"
+_SUFFIXES = {"gzip": ".gz", "br": ".br"}
+
+logger = logging.getLogger("api.snapshots")
+
+
+def snapshot_path(key: str) -> str:
+    """Return the file path (relative to the snapshot dir) for a request key."""
+    path, _, query = key.partition("?")
+    return path.lstrip("/") + (f"/{query}" if query else "") + ".json"
+
+
+def hot_keys(pairs) -> Iterator[str]:
+    """Yield the request keys to snapshot for `(competition_id, season)` pairs."""
+    yield from ("/api/seasons", "/api/competitions", "/api/formations/history")
+    for competition_id, season in pairs:
+        params = {"competition_id": competition_id, "season": season}
+        for path in (
+            "/api/league-table",
+            "/api/league-stats",
+            "/api/formations/league",
+        ):
+            yield request_key(path, urlencode(params))
+        for metric in LEADER_METRICS:
+            yield request_key(
+                "/api/players/leaders", urlencode({**params, "metric": metric})
+            )
+
+
+class Snapshots:
+    """Index of snapshotted request keys and the encodings on disk for each."""
+
+    def __init__(self) -> None:
+        self.root: Optional[Path] = None
+        self.entries: Dict[str, List[str]] = {}
+        self.hits = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.root is not None
+
+    def load(self, root: Optional[str], db_sha: str) -> int:
+        """Serve from `root` if its manifest matches `db_sha`; return entry count."""
+        self.root, self.entries = None, {}
+        if not root:
+            return 0
+        try:
+            manifest = json.loads((Path(root) / MANIFEST).read_text())
+        except (OSError, ValueError) as exc:
+            logger.warning("Snapshots in %s not loaded (%s)", root, exc)
+            return 0
+        if manifest.get("db_sha256") != db_sha:
+            logger.warning("Snapshots in %s were built from another DB; ignored", root)
+            return 0
+        self.root = Path(root)
+        self.entries = manifest.get("entries", {})
+        return len(self.entries)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "enabled": self.enabled,
+            "entries": len(self.entries),
+            "hits": self.hits,
+        }
+
+
+snapshots = Snapshots()
+
+
+class SnapshotMiddleware:
+    """ASGI middleware answering snapshotted request keys from static files."""
+
+    def __init__(self, app, index: Snapshots = snapshots) -> None:
+        self.app = app
+        self.index = index
+
+    async def __call__(self, scope, receive, send):
+        if not self.index.enabled or not is_cacheable(scope):
+            await self.app(scope, receive, send)
+            return
+        key = request_key(scope["path"], scope.get("query_string", b""))
+        encodings = self.index.entries.get(key)
+        if encodings is None:
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(accept_encoding(scope), encodings)
+        path = self.index.root / (snapshot_path(key) + _SUFFIXES.get(encoding, ""))
+        try:
+            body = await anyio.to_thread.run_sync(path.read_bytes)
+        except OSError:
+            # Files removed under a running server: fall back to the live route.
+            await self.app(scope, receive, send)
+            return
+        self.index.hits += 1
+        headers = [(b"content-type", b"application/json")]
+        if encodings:
+            headers = encoded_headers(headers, encoding, len(body))
+        else:
+            headers.append((b"content-length", str(len(body)).encode()))
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [*headers, (b"x-cache", b"snapshot")],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+def _write(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+
+
+async def build(app, out: str) -> Dict[str, int]:
+    """Render the hot keys through `app` into `out`, replacing it atomically."""
+    from .accesslog import dispatch
+    from .db import db_fingerprint, fetchall, init_db
+
+    init_db()
+    pairs = fetchall(
+        "SELECT DISTINCT competition_id, season "
+        "FROM mart_competition_club_season ORDER BY competition_id, season"
+    )
+    dst = Path(out)
+    tmp = dst.with_name(dst.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    entries: Dict[str, List[str]] = {}
+    written = skipped = 0
+    for key in hot_keys(pairs):
+        status, body = await dispatch(app, key)
+        if status != 200:
+            skipped += 1
+            continue
+        rel = snapshot_path(key)
+        _write(tmp / rel, body)
+        variants = await anyio.to_thread.run_sync(encode_variants, body)
+        for encoding, data in variants.items():
+            _write(tmp / (rel + _SUFFIXES[encoding]), data)
+        entries[key] = sorted(variants)
+        written += 1 + len(variants)
+    manifest = {
+        "version": 1,
+        "db_sha256": db_fingerprint(),
+        "built_at": int(time.time()),
+        "entries": entries,
+    }
+    tmp.mkdir(parents=True, exist_ok=True)
+    (tmp / MANIFEST).write_text(json.dumps(manifest, separators=(",", ":")))
+    old = dst.with_name(dst.name + ".old")
+    shutil.rmtree(old, ignore_errors=True)
+    if dst.exists():
+        dst.replace(old)
+    tmp.replace(dst)
+    shutil.rmtree(old, ignore_errors=True)
+    return {"entries": len(entries), "files": written, "skipped": skipped}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Build static snapshots of hot endpoints")
+    ap.add_argument("--out", default=SNAPSHOT_DIR, required=SNAPSHOT_DIR is None)
+    args = ap.parse_args()
+    from .main import app
+
+    start = time.perf_counter()
+    result = asyncio.run(build(app, args.out))
+    print(
+        f"Snapshots: {result['entries']} keys, {result['files']} files, "
+        f"{result['skipped']} skipped in {time.perf_counter() - start:.1f}s "
+        f"-> {args.out}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Gunicorn config for multi-worker serving with a pre-fork warm-up.
+
+Run from `api/`:        gunicorn -c gunicorn.conf.py app.main:app
+Run from the repo root: gunicorn -c api/gunicorn.conf.py api.app.main:app
+
+The master imports the app (`preload_app`), resolves and warms the serving DB
+once (see `app/prefork.py`), then forks `WEB_CONCURRENCY` uvicorn workers that
+share the read-only DB file and the warmed caches copy-on-write.
+
+Env vars:
+- PORT: listen port (default 8000)
+- WEB_CONCURRENCY: worker processes (default 1; raise it only after measuring
+  with `bench/worker_scaling.py` on the target hardware)
+- GUNICORN_TIMEOUT: seconds before a silent worker is restarted (default 60)
+DUCKDB_THREADS and DUCKDB_MEMORY_LIMIT default to an even share of the CPUs and
+80% of the memory per worker instead of the per-process DuckDB defaults. Both
+are read from the container's cgroup limits (CPU quota, `memory.max`) when set,
+since `os.cpu_count()` and the physical page count describe the host.
+"""
+
+import importlib
+import math
+import os
+from pathlib import Path
+
+
+def _read(path: str) -> str:
+    try:
+        return Path(path).read_text().strip()
+    except OSError:
+        return ""
+
+
+def _cpu_limit() -> int:
+    """CPUs this process may use: its affinity, capped by a cgroup CPU quota."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    quota, _, period = _read("/sys/fs/cgroup/cpu.max").partition(" ")  # cgroup v2
+    if not quota:  # cgroup v1
+        quota = _read("/sys/fs/cgroup/cpu/cpu.cfs_quota_us")
+        period = _read("/sys/fs/cgroup/cpu/cpu.cfs_period_us")
+    try:
+        if int(quota) > 0:
+            cpus = min(cpus, math.ceil(int(quota) / int(period)))
+    except ValueError:  # "max", "-1" or missing: no quota
+        pass
+    return max(1, cpus)
+
+
+def _memory_limit() -> int:
+    """Bytes of memory for this container: the cgroup limit, else physical RAM."""
+    ram = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    for path in (
+        "/sys/fs/cgroup/memory.max",  # cgroup v2, "max" when unlimited
+        "/sys/fs/cgroup/memory/memory.limit_in_bytes",  # v1, huge when unlimited
+    ):
+        raw = _read(path)
+        if raw.isdigit():
+            return min(ram, int(raw))
+    return ram
+
+
+_cpus = _cpu_limit()
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = max(1, int(os.getenv("WEB_CONCURRENCY") or "1"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = 30
+keepalive = 5
+
+# The app reads these at import time, which happens after this file is loaded.
+os.environ.setdefault("DUCKDB_THREADS", str(max(1, _cpus // workers)))
+_ram = _memory_limit()
+os.environ.setdefault(
+    "DUCKDB_MEMORY_LIMIT", f"{int(_ram * 0.8 / workers) // (1024 * 1024)}MB"
+)
+
+
+def _prefork(server):
+    # `app.main:app` or `api.app.main:app` -> `app.prefork` / `api.app.prefork`.
+    package = server.app.app_uri.split(":")[0].rpartition(".")[0]
+    return importlib.import_module(f"{package}.prefork")
+
+
+def on_starting(server):
+    # Runs in the master after the preloaded import, before the port is bound.
+    _prefork(server).prepare(server.app.wsgi())
+
+
+def post_fork(server, worker):
+    _prefork(server).after_fork()
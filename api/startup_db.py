@@ -63,7 +63,7 @@ def ensure_db(local_path: str, asset_url: str, sha_url: str) -> str:
     - Download to a temporary `.part` file.
     - Fetch SHA256 from `sha_url`, compare with the actual checksum.
     - On mismatch, delete the partial file and raise RuntimeError (fail loud).
-    - On match, atomically move the file into place.
+    - On match, atomically move the file into place and write a `.sha256` sidecar.
     """
     target = Path(local_path)
     if target.exists():
@@ -93,6 +93,8 @@ def ensure_db(local_path: str, asset_url: str, sha_url: str) -> str:
 
     # Atomic move avoids readers observing partial state.
     tmp_path.replace(target)
+    # Record the verified checksum so the API can key caches without rehashing.
+    target.with_suffix(target.suffix + ".sha256").write_text(actual.lower() + "\n")
     return str(target)
 
 
@@ -0,0 +1,158 @@
+"""Compare query tail latency across serving DB modes (disk, shm, memory).
+
+Each mode runs in a fresh subprocess so module state and DuckDB instances do not
+leak between runs. The workload mixes point lookups and scans taken from the
+routers and runs them from a thread pool to mimic concurrent requests.
+
+Usage (from repo root, serving DB in place):
+    python bench/db_modes.py --iterations 200 --concurrency 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WORKLOAD = [
+    (
+        "league_table",
+        """
+        SELECT club_id, club_name, games_played, wins, draws, losses,
+               points, goals_for, goals_against, goal_difference
+        FROM mart_competition_club_season
+        WHERE competition_id = ? AND season = ?
+        ORDER BY points DESC, goal_difference DESC
+        """,
+        lambda s: ["GB1", s],
+    ),
+    (
+        "players_top",
+        """
+        SELECT player_id, player_name, goals
+        FROM mart_player_season
+        WHERE season = ? AND minutes_played >= 600
+        ORDER BY goals DESC
+        LIMIT 50
+        """,
+        lambda s: [s],
+    ),
+    (
+        "value_perf",
+        """
+        SELECT *
+        FROM mart_player_value_performance_corr
+        WHERE season = ?
+        ORDER BY last_market_value DESC
+        LIMIT 1000
+        """,
+        lambda s: [s],
+    ),
+    (
+        "player_career",
+        "SELECT * FROM mart_player_season WHERE player_id = ? ORDER BY season",
+        lambda s: [1],
+    ),
+    (
+        "search_clubs",
+        """
+        SELECT DISTINCT club_id, club_name
+        FROM mart_competition_club_season
+        WHERE club_name ILIKE '%' || ? || '%'
+        ORDER BY club_name
+        LIMIT 20
+        """,
+        lambda s: ["a"],
+    ),
+]
+
+
+def _percentile(values, pct):
+    values = sorted(values)
+    idx = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[idx]
+
+
+def _child(mode: str, iterations: int, concurrency: int) -> dict:
+    sys.path.insert(0, REPO_ROOT)
+    from api.app import db
+
+    t0 = time.perf_counter()
+    effective = db.init_db(mode)
+    load_s = time.perf_counter() - t0
+    season = (
+        db.get_conn()
+        .execute("SELECT MAX(season) FROM mart_competition_club_season")
+        .fetchone()[0]
+    )
+
+    def run(i):
+        name, sql, params = WORKLOAD[i % len(WORKLOAD)]
+        con = db.get_conn()
+        start = time.perf_counter()
+        con.execute(sql, params(season)).fetchall()
+        con.close()
+        return name, (time.perf_counter() - start) * 1000
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(run, range(len(WORKLOAD))))  # warm-up
+        results = list(pool.map(run, range(iterations * len(WORKLOAD))))
+
+    latencies = [ms for _, ms in results]
+    return {
+        "mode": mode,
+        "effective_mode": effective,
+        "load_s": round(load_s, 3),
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(_percentile(latencies, 95), 2),
+        "p99_ms": round(_percentile(latencies, 99), 2),
+        "max_ms": round(max(latencies), 2),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--modes", default="disk,shm,memory")
+    ap.add_argument("--iterations", type=int, default=100)
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--child", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        print(json.dumps(_child(args.child, args.iterations, args.concurrency)))
+        return
+
+    cols = ("p50", "p95", "p99", "max")
+    print(f"{'mode':<8} {'eff':<8} {'load_s':>7} " + " ".join(f"{c:>8}" for c in cols))
+    for mode in args.modes.split(","):
+        out = subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                "--child",
+                mode,
+                "--iterations",
+                str(args.iterations),
+                "--concurrency",
+                str(args.concurrency),
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        r = json.loads(out.stdout.strip().splitlines()[-1])
+        print(
+            f"{r['mode']:<8} {r['effective_mode']:<8} {r['load_s']:>7} "
+            f"{r['p50_ms']:>8} {r['p95_ms']:>8} {r['p99_ms']:>8} {r['max_ms']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Incremental vs full `dbt run` for the season-incremental marts.
+
+Builds two warehouses from Parquet snapshots with `warehouse/load_duckdb.py`:
+
+- incremental: `--old` loaded and built with `--full-refresh`, then `--new`
+  loaded on top and built with a plain (incremental) `dbt run`
+- full: `--new` loaded and built with `--full-refresh`
+
+and compares the incremental models (rows as multisets) between the two, so it
+fails if an incremental run drifts from a full rebuild. Without `--old`, the old
+snapshot is derived from `--new` by dropping a `--drop` fraction of the games
+(with their appearances, events, lineups and club games) and of the latest
+valuations, i.e. the new snapshot adds those games and valuations.
+
+Usage (from repo root; needs `dbt deps` done in the project):
+    python bench/incremental_marts.py --new data/parquet/<ts> [--old data/parquet/<prev>]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import os
+import pathlib as P
+import subprocess
+import sys
+import tempfile
+import time
+
+import duckdb
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "warehouse"))
+
+from load_duckdb import main as load  # noqa: E402
+
+PROFILE = """openfootball_duckdb:
+  target: bench
+  outputs:
+    bench:
+      type: duckdb
+      path: {db}
+      threads: {threads}
+"""
+
+INCREMENTAL = [
+    "mart_player_season",
+    "mart_competition_player_season",
+    "mart_club_season",
+    "mart_competition_club_season",
+    "mart_player_career_summary",
+]
+GAME_TABLES = ["appearances", "club_games", "game_events", "game_lineups", "games"]
+
+
+def _derive_old(new: P.Path, old: P.Path, drop: float) -> None:
+    """Copy `new` without a sample of its games and its latest valuations."""
+    old.mkdir(parents=True)
+    con = duckdb.connect()
+    games = (new / "games.parquet").as_posix()
+    con.execute(
+        f"CREATE TABLE dropped AS SELECT game_id FROM read_parquet('{games}') "
+        f"USING SAMPLE {drop * 100}% (bernoulli, 42)"
+    )
+    vals = (new / "player_valuations.parquet").as_posix()
+    cutoff = con.execute(
+        f"SELECT quantile_disc(date, {1 - drop}) FROM read_parquet('{vals}')"
+    ).fetchone()[0]
+    for src in sorted(new.glob("*.parquet")):
+        dst = (old / src.name).as_posix()
+        where = ""
+        if src.stem in GAME_TABLES:
+            where = "WHERE game_id NOT IN (SELECT game_id FROM dropped)"
+        elif src.stem == "player_valuations":
+            where = f"WHERE date < DATE '{cutoff}'"
+        con.execute(
+            f"COPY (SELECT * FROM read_parquet('{src.as_posix()}') {where}) "
+            f"TO '{dst}' (FORMAT parquet)"
+        )
+
+
+def _dbt(project: str, work: P.Path, *extra: str) -> float:
+    env = {**os.environ, "DBT_LOG_PATH": str(work / "logs")}
+    cmd = ["dbt", "run", "--project-dir", project, "--profiles-dir", str(work)]
+    cmd += ["--target-path", str(work / "target"), *extra]
+    start = time.perf_counter()
+    subprocess.run(cmd, env=env, check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def _build(project: str, work: P.Path, threads: int, steps) -> list:
+    """Load each Parquet dir into a fresh warehouse and dbt run after it."""
+    work.mkdir(parents=True)
+    db = work / "warehouse.duckdb"
+    (work / "profiles.yml").write_text(
+        PROFILE.format(db=db.as_posix(), threads=threads)
+    )
+    times = []
+    for pq_dir, extra in steps:
+        with contextlib.redirect_stdout(io.StringIO()):
+            load(str(db), str(pq_dir))
+        times.append(_dbt(project, work, *extra))
+    return times
+
+
+def _compare(a: P.Path, b: P.Path) -> int:
+    con = duckdb.connect()
+    con.execute(f"ATTACH '{a.as_posix()}' AS incr (READ_ONLY)")
+    con.execute(f"ATTACH '{b.as_posix()}' AS rebuilt (READ_ONLY)")
+    bad = 0
+    print(f"{'model':<40} {'rows':>9} {'diff':>6}")
+    for t in ["mart_season_inputs", *INCREMENTAL]:
+        rows = con.execute(f"SELECT COUNT(*) FROM rebuilt.main.{t}").fetchone()[0]
+        diff = con.execute(
+            f"SELECT (SELECT COUNT(*) FROM (SELECT * FROM incr.main.{t} "
+            f"EXCEPT ALL SELECT * FROM rebuilt.main.{t})) + (SELECT COUNT(*) FROM "
+            f"(SELECT * FROM rebuilt.main.{t} EXCEPT ALL SELECT * FROM incr.main.{t}))"
+        ).fetchone()[0]
+        print(f"{t:<40} {rows:>9} {diff:>6}")
+        bad += diff > 0
+    return bad
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--new", required=True, help="newer Parquet snapshot")
+    ap.add_argument("--old", help="older Parquet snapshot (default: derived)")
+    ap.add_argument("--drop", type=float, default=0.05)
+    ap.add_argument("--project-dir", default=os.path.join(REPO_ROOT, "transform"))
+    ap.add_argument("--threads", type=int, default=os.cpu_count() or 1)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = P.Path(tmp)
+        old = P.Path(args.old) if args.old else tmp / "old"
+        if not args.old:
+            _derive_old(P.Path(args.new), old, args.drop)
+        inc = _build(
+            args.project_dir,
+            tmp / "incremental",
+            args.threads,
+            [(old, ["--full-refresh"]), (P.Path(args.new), [])],
+        )
+        full = _build(
+            args.project_dir,
+            tmp / "full",
+            args.threads,
+            [(P.Path(args.new), ["--full-refresh"])],
+        )
+        print(f"old: {old}  new: {args.new}  threads: {args.threads}")
+        print(f"dbt run --full-refresh: {full[0]:.2f}s  incremental: {inc[1]:.2f}s")
+        bad = _compare(
+            tmp / "incremental" / "warehouse.duckdb", tmp / "full" / "warehouse.duckdb"
+        )
+    if bad:
+        sys.exit(f"{bad} models differ between incremental and full builds")
+    print("incremental and full builds match")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Latency of cheap requests while heavy scans run, against a live uvicorn server.
+
+Starts `uvicorn api.app.main:app` from `--app-dir` (default: this checkout) with
+the response cache, access log and boot replay disabled, then runs three client
+groups concurrently for `--seconds`:
+- bulk: value-perf / formation history / manager performance scans
+- lookup: player career / club season point reads
+- probe: `/api/health` every 50 ms (never touches DuckDB)
+
+To compare two revisions, check the older one out into a worktree and pass it:
+    git worktree add /tmp/before <rev>
+    python bench/mixed_workload.py --app-dir /tmp/before
+    python bench/mixed_workload.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+import httpx
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _percentile(values, pct):
+    values = sorted(values)
+    idx = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[idx]
+
+
+async def _wait_ready(client: httpx.AsyncClient, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("server did not become ready")
+
+
+async def _worker(client, group, paths, stop_at, results, pause=0.0):
+    i = 0
+    while time.monotonic() < stop_at:
+        path = paths[i % len(paths)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            r = await client.get(path)
+            status = r.status_code
+        except httpx.TransportError:
+            status = 0
+        results[group].append(((time.perf_counter() - start) * 1000, status))
+        if pause:
+            await asyncio.sleep(pause)
+
+
+async def _run(base_url: str, args) -> dict:
+    limits = httpx.Limits(max_connections=256, max_keepalive_connections=256)
+    async with httpx.AsyncClient(
+        base_url=base_url, timeout=60, limits=limits
+    ) as client:
+        await _wait_ready(client)
+        seasons = [r["season"] for r in (await client.get("/api/seasons")).json()]
+        bulk = [f"/api/analytics/value-perf?season={s}" for s in seasons]
+        bulk += ["/api/formations/history", "/api/managers/performance?limit=500"]
+        lookup = [f"/api/players/{pid}/career" for pid in range(1, 200)]
+        lookup += [f"/api/clubs/{cid}/season?season={seasons[0]}" for cid in (1, 2)]
+
+        results = defaultdict(list)
+        stop_at = time.monotonic() + args.seconds
+        tasks = [
+            _worker(client, "bulk", bulk[i:] + bulk[:i], stop_at, results)
+            for i in range(args.bulk)
+        ]
+        tasks += [
+            _worker(client, "lookup", lookup[i:] + lookup[:i], stop_at, results)
+            for i in range(args.lookup)
+        ]
+        tasks.append(_worker(client, "probe", ["/api/health"], stop_at, results, 0.05))
+        await asyncio.gather(*tasks)
+    return results
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--app-dir", default=REPO_ROOT)
+    ap.add_argument("--seconds", type=float, default=20)
+    ap.add_argument("--bulk", type=int, default=8, help="concurrent bulk clients")
+    ap.add_argument("--lookup", type=int, default=16, help="concurrent lookup clients")
+    args = ap.parse_args()
+
+    port = _free_port()
+    env = {
+        **os.environ,
+        "RESPONSE_CACHE_MAX_ENTRIES": "0",
+        "ACCESS_LOG_SAMPLE_RATE": "0",
+        "ACCESS_LOG_REPLAY_TOP": "0",
+    }
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "api.app.main:app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        cwd=args.app_dir,
+        env=env,
+    )
+    try:
+        results = asyncio.run(_run(f"http://127.0.0.1:{port}", args))
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    print(f"app-dir: {args.app_dir}")
+    print(
+        f"{'group':<8} {'ok':>6} {'non200':>6} {'rps':>7} "
+        f"{'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}"
+    )
+    for group in ("bulk", "lookup", "probe"):
+        rows = results[group]
+        ok = [ms for ms, status in rows if status == 200]
+        if not ok:
+            print(f"{group:<8} {0:>6} {len(rows):>6}")
+            continue
+        print(
+            f"{group:<8} {len(ok):>6} {len(rows) - len(ok):>6} "
+            f"{len(ok) / args.seconds:>7.1f} "
+            f"{statistics.median(ok):>8.1f} {_percentile(ok, 95):>8.1f} "
+            f"{_percentile(ok, 99):>8.1f} {max(ok):>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
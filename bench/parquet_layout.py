@@ -0,0 +1,132 @@
+"""`dbt run` time and Parquet pruning for CSV-order vs sorted Parquet layouts.
+
+Converts `--src` twice with `ingest/csv_to_parquet.py`: once as before (CSV row
+order, polars' default 262144-row groups) and once with the tuned layout (rows
+sorted by `ingest/schemas.SORT_KEYS`, `--row-group-size` groups, page index).
+Each set is loaded into a fresh warehouse with `warehouse/load_duckdb.py`, then
+`dbt run` is timed `--runs` times against it through a temporary profile. A
+`game_id` range probe on `appearances.parquet` shows the effect of row-group
+skipping when DuckDB reads the files directly.
+
+Usage (from repo root; needs `dbt deps` done in the project):
+    python bench/parquet_layout.py --src data/raw/<ts> --runs 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import os
+import pathlib as P
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import duckdb
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "ingest"))
+sys.path.insert(0, os.path.join(REPO_ROOT, "warehouse"))
+
+from csv_to_parquet import Layout, convert  # noqa: E402
+from load_duckdb import main as load  # noqa: E402
+
+PROFILE = """openfootball_duckdb:
+  target: bench
+  outputs:
+    bench:
+      type: duckdb
+      path: {db}
+      threads: {threads}
+"""
+
+
+def _build(src: P.Path, out: P.Path, layout: Layout) -> int:
+    out.mkdir(parents=True)
+    for csv in sorted(src.glob("*.csv")):
+        convert(csv, out, layout=layout)
+    return sum(p.stat().st_size for p in out.glob("*.parquet"))
+
+
+def _dbt(project: str, work: P.Path, runs: int) -> list:
+    env = {**os.environ, "DBT_LOG_PATH": str(work / "logs")}
+    cmd = [
+        "dbt",
+        "run",
+        "--project-dir",
+        project,
+        "--profiles-dir",
+        str(work),
+        "--target-path",
+        str(work / "target"),
+    ]
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, env=env, check=True, stdout=subprocess.DEVNULL)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _probe(pq_dir: P.Path, iterations: int = 50):
+    """Median ms of a game_id range scan on appearances.parquet."""
+    path = (pq_dir / "appearances.parquet").as_posix()
+    con = duckdb.connect()
+    lo, hi = con.execute(
+        f"SELECT MIN(game_id), MAX(game_id) FROM read_parquet('{path}')"
+    ).fetchone()
+    width = max(1, (hi - lo) // 100)
+    samples = []
+    for i in range(iterations):
+        start_id = lo + (i * 37 % 100) * width
+        t = time.perf_counter()
+        con.execute(
+            f"SELECT COUNT(*), SUM(minutes_played) FROM read_parquet('{path}') "
+            f"WHERE game_id BETWEEN {start_id} AND {start_id + width}"
+        ).fetchall()
+        samples.append((time.perf_counter() - t) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--src", required=True, help="raw CSV directory")
+    ap.add_argument("--project-dir", default=os.path.join(REPO_ROOT, "transform"))
+    ap.add_argument("--runs", type=int, default=3)
+    ap.add_argument("--row-group-size", type=int, default=Layout.row_group_size)
+    ap.add_argument("--threads", type=int, default=os.cpu_count() or 1)
+    args = ap.parse_args()
+
+    layouts = {
+        "csv-order": Layout(sort=False, row_group_size=262_144),
+        "sorted": Layout(row_group_size=args.row_group_size),
+    }
+    print(f"src: {args.src}  project: {args.project_dir}  runs: {args.runs}")
+    print(
+        f"{'layout':<10} {'pq_mb':>7} {'load_s':>7} {'dbt_min':>8} "
+        f"{'dbt_med':>8} {'probe_ms':>9}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, layout in layouts.items():
+            work = P.Path(tmp) / name
+            size = _build(P.Path(args.src), work / "pq", layout)
+            db = work / "warehouse.duckdb"
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                load(str(db), str(work / "pq"))
+            load_s = time.perf_counter() - start
+            (work / "profiles.yml").write_text(
+                PROFILE.format(db=db.as_posix(), threads=args.threads)
+            )
+            runs = _dbt(args.project_dir, work, args.runs)
+            print(
+                f"{name:<10} {size / 1e6:>7.1f} {load_s:>7.2f} {min(runs):>8.2f} "
+                f"{statistics.median(runs):>8.2f} {_probe(work / 'pq'):>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Peak RSS of CSV -> Parquet conversion vs file size, in-memory vs streaming.
+
+Takes one CSV (by default the largest in `--src`), writes copies of it with the
+data rows repeated `--scales` times, and converts each copy with
+`ingest/csv_to_parquet.convert` in a fresh process per mode, so every reading
+is that process's own peak, sampled from `/proc/<pid>/status` (Linux only).
+Modes: in-memory (sorted, the default layout), streaming (unsorted, the
+`--streaming` default) and streaming with `--streaming-sort`. `anon` is heap
+memory and is what the ceiling bounds: the in-memory mode grows with the file,
+plain streaming should stay near `--memory-mb` above the interpreter baseline,
+and the sort makes streaming hold the table again. `file` is the memory-mapped
+CSV, which the kernel can reclaim under pressure. All outputs are read back and
+compared (the unsorted one after sorting it by the table's keys) before a row
+is printed.
+
+Usage:
+    python bench/parquet_memory.py --src data/raw/<ts> --scales 1,4,16 --memory-mb 256
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import pathlib as P
+import subprocess
+import sys
+import tempfile
+import time
+
+import polars as pl
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "ingest"))
+
+from schemas import sort_keys  # noqa: E402
+
+_CHILD = """
+import pathlib as P, sys
+sys.path.insert(0, {ingest!r})
+from csv_to_parquet import Layout, convert
+convert(P.Path({csv!r}), P.Path({dst!r}), streaming={streaming}, memory_mb={mb},
+        layout=Layout(sort={sort}))
+"""
+
+
+def _scaled(csv: P.Path, factor: int, out: P.Path) -> P.Path:
+    """Write `csv` with its data rows repeated `factor` times."""
+    with open(csv, "rb") as f:
+        header = f.readline()
+        body = f.read()
+    if body and not body.endswith(b"\n"):
+        body += b"\n"
+    with open(out, "wb") as f:
+        f.write(header)
+        for _ in range(factor):
+            f.write(body)
+    return out
+
+
+def _run(csv: P.Path, dst: P.Path, streaming: bool, memory_mb: int, sort: bool):
+    """Convert in a child process; return (seconds, peak anon MiB, peak file MiB)."""
+    dst.mkdir(parents=True, exist_ok=True)
+    code = _CHILD.format(
+        ingest=os.path.join(REPO_ROOT, "ingest"),
+        csv=str(csv),
+        dst=str(dst),
+        streaming=streaming,
+        mb=memory_mb,
+        sort=sort,
+    )
+    peak = {"RssAnon": 0, "RssFile": 0}
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-c", code])
+    while proc.poll() is None:
+        try:
+            with open(f"/proc/{proc.pid}/status") as f:
+                for line in f:
+                    key, _, value = line.partition(":")
+                    if key in peak:
+                        peak[key] = max(peak[key], int(value.split()[0]))
+        except OSError:
+            pass
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise SystemExit(f"conversion of {csv.name} failed ({proc.returncode})")
+    return elapsed, peak["RssAnon"] / 1024, peak["RssFile"] / 1024
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--src", required=True, help="raw CSV directory")
+    ap.add_argument("--file", help="CSV name in --src (default: the largest)")
+    ap.add_argument("--scales", default="1,4,16", help="comma-separated row repeats")
+    ap.add_argument("--memory-mb", type=int, default=256)
+    args = ap.parse_args()
+
+    src = P.Path(args.src)
+    csv = (
+        src / args.file
+        if args.file
+        else max(src.glob("*.csv"), key=lambda p: p.stat().st_size)
+    )
+    print(f"file: {csv.name}  memory-mb: {args.memory_mb}")
+    print(
+        f"{'scale':>5} {'csv_mb':>8} {'mem_s':>7} {'mem_anon':>8} {'mem_file':>8} "
+        f"{'stream_s':>8} {'st_anon':>8} {'st_file':>8} "
+        f"{'sorted_s':>8} {'so_anon':>8} {'so_file':>8}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_p = P.Path(tmp)
+        for factor in (int(s) for s in args.scales.split(",")):
+            scaled = _scaled(csv, factor, tmp_p / csv.name)
+            mem = _run(scaled, tmp_p / "mem", False, args.memory_mb, True)
+            st = _run(scaled, tmp_p / "stream", True, args.memory_mb, False)
+            so = _run(scaled, tmp_p / "sorted", True, args.memory_mb, True)
+            name = csv.with_suffix(".parquet").name
+            a = pl.read_parquet(tmp_p / "mem" / name)
+            b = pl.read_parquet(tmp_p / "stream" / name)
+            c = pl.read_parquet(tmp_p / "sorted" / name)
+            keys = sort_keys(csv.stem, a.columns)
+            if keys:
+                b = b.sort(keys, maintain_order=True, nulls_last=True)
+            for label, df in (("streaming", b), ("streaming-sort", c)):
+                if a.schema != df.schema or not a.equals(df):
+                    raise SystemExit(f"scale {factor}: {label} output differs")
+            print(
+                f"{factor:>5} {scaled.stat().st_size / 1e6:>8.1f} "
+                + " ".join(
+                    f"{r[0]:>{7 if i == 0 else 8}.2f} {r[1]:>8.1f} {r[2]:>8.1f}"
+                    for i, r in enumerate((mem, st, so))
+                )
+            )
+            scaled.unlink()
+
+
+if __name__ == "__main__":
+    main()
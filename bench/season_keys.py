@@ -0,0 +1,135 @@
+"""Before/after latency of the transfer queries for the integer season key.
+
+"before" is the old SQL, joining `mart_transfer_club` to
+`mart_competition_club_season` on `LEFT(t.season, 4) = c.season` and filtering
+on the "YYYY/YYYY" string. "after" is the registered query from
+`api/app/queries.py`: a filtered scan of the pre-joined
+`mart_competition_transfer_club` on `season_start`. Both run against the same
+serving DB on one connection with plain parameter binding.
+
+Usage (from repo root, serving DB in place):
+    python bench/season_keys.py --iterations 300
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import duckdb
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from api.app.db import db_path  # noqa: E402
+from api.app.queries import QUERIES  # noqa: E402
+
+BEFORE = {
+    "transfer_top_spenders": """
+    SELECT t.club_id, c.club_name, t.transfer_spend, t.transfer_income, t.net_spend
+    FROM mart_transfer_club t
+    JOIN mart_competition_club_season c
+      ON c.club_id = t.club_id
+     AND LEFT(t.season, 4) = c.season
+    WHERE t.season = $1 AND c.competition_id = $2
+    ORDER BY t.net_spend DESC
+    LIMIT $3
+    """,
+    "transfer_competition_summary": """
+    SELECT c.competition_id, c.competition_name,
+           SUM(t.transfer_spend) AS total_spend,
+           SUM(t.transfer_income) AS total_income,
+           SUM(t.net_spend) AS total_net
+    FROM mart_transfer_club t
+    JOIN mart_competition_club_season c
+    ON c.club_id = t.club_id
+    AND LEFT(t.season, 4) = c.season
+    WHERE t.season = $1
+    GROUP BY c.competition_id, c.competition_name
+    ORDER BY total_net DESC
+    """,
+    "transfer_free_vs_paid": """
+    SELECT
+      SUM(t.incoming_free_cnt) AS inc_free,
+      SUM(t.incoming_paid_cnt) AS inc_paid,
+      SUM(t.outgoing_free_cnt) AS out_free,
+      SUM(t.outgoing_paid_cnt) AS out_paid
+    FROM mart_transfer_club t
+    JOIN mart_competition_club_season c
+    ON c.club_id = t.club_id
+    AND LEFT(t.season, 4) = c.season
+    WHERE t.season = $1 AND c.competition_id = $2
+    """,
+}
+
+
+def _params(name: str, season: str, competition_id: str):
+    if name == "transfer_top_spenders":
+        return [season, competition_id, 20]
+    if name == "transfer_free_vs_paid":
+        return [season, competition_id]
+    return [season]
+
+
+def _time(con, sql, params_list, iterations):
+    samples = []
+    for i in range(iterations):
+        params = params_list[i % len(params_list)]
+        start = time.perf_counter()
+        con.execute(sql, params).fetchall()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--iterations", type=int, default=300)
+    args = ap.parse_args()
+
+    con = duckdb.connect(db_path(), read_only=True)
+    seasons = [
+        r[0]
+        for r in con.execute(
+            "SELECT DISTINCT season FROM mart_transfer_club"
+        ).fetchall()
+    ]
+    competitions = [
+        r[0]
+        for r in con.execute(
+            "SELECT DISTINCT competition_id FROM mart_competition_club_season"
+        ).fetchall()
+    ]
+    combos = [(s, c) for s in seasons for c in competitions]
+
+    print(f"db: {db_path()}  iterations: {args.iterations}")
+    print(
+        f"{'query':<30} {'before p50':>10} {'after p50':>10} "
+        f"{'before p95':>10} {'after p95':>10} {'speedup':>8}"
+    )
+    for name, before_sql in BEFORE.items():
+        after_sql = QUERIES[name].sql
+        params_list = [_params(name, s, c) for s, c in combos]
+        # Results must match before the timings mean anything; the old SQL left
+        # the order of tied rows unspecified, so compare them as sets.
+        before_rows = [
+            sorted(con.execute(before_sql, p).fetchall()) for p in params_list
+        ]
+        after_rows = [sorted(con.execute(after_sql, p).fetchall()) for p in params_list]
+        if before_rows != after_rows:
+            raise SystemExit(f"{name}: results differ between before and after")
+        before = _time(con, before_sql, params_list, args.iterations)
+        after = _time(con, after_sql, params_list, args.iterations)
+        b50, a50 = statistics.median(before), statistics.median(after)
+        b95 = statistics.quantiles(before, n=20)[-1]
+        a95 = statistics.quantiles(after, n=20)[-1]
+        print(
+            f"{name:<30} {b50:>10.3f} {a50:>10.3f} {b95:>10.3f} {a95:>10.3f} "
+            f"{b50 / a50:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
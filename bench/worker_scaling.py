@@ -0,0 +1,179 @@
+"""Throughput and memory of the gunicorn multi-worker mode from 1 to N workers.
+
+For each worker count, starts `gunicorn -c api/gunicorn.conf.py` from
+`--app-dir` with the response cache, access log and boot replay disabled (so
+every request reaches DuckDB), drives it with `--concurrency` closed-loop
+clients for `--seconds`, and prints requests/s, latency percentiles and the
+summed PSS (proportional set size) of the master and workers. PSS splits shared
+pages between the processes mapping them, so it stays flat when the DB file and
+pre-fork state are shared and grows by a full copy per worker when they are not.
+
+Run it on a machine with at least N cores and pin the DB mode under test, e.g.
+    DB_MODE=shm python bench/worker_scaling.py --workers 1,2,4,8
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import time
+
+import httpx
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _percentile(values, pct):
+    values = sorted(values)
+    idx = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[idx]
+
+
+def _pss_mb(pid: int) -> float:
+    """Return the summed PSS of `pid` and its children in MiB (Linux only)."""
+    pids = [pid]
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            pids += [int(p) for p in f.read().split()]
+    except OSError:
+        pass
+    total_kb = 0
+    for p in pids:
+        try:
+            with open(f"/proc/{p}/smaps_rollup") as f:
+                for line in f:
+                    if line.startswith("Pss:"):
+                        total_kb += int(line.split()[1])
+        except OSError:
+            continue
+    return total_kb / 1024
+
+
+async def _wait_ready(client: httpx.AsyncClient, timeout: float = 120) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("server did not become ready")
+
+
+async def _worker(client, paths, stop_at, results):
+    i = 0
+    while time.monotonic() < stop_at:
+        path = paths[i % len(paths)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            status = (await client.get(path)).status_code
+        except httpx.TransportError:
+            status = 0
+        results.append(((time.perf_counter() - start) * 1000, status))
+
+
+async def _run(base_url: str, args) -> list:
+    limits = httpx.Limits(max_connections=256, max_keepalive_connections=256)
+    async with httpx.AsyncClient(
+        base_url=base_url, timeout=60, limits=limits
+    ) as client:
+        await _wait_ready(client)
+        seasons = [r["season"] for r in (await client.get("/api/seasons")).json()]
+        paths = [f"/api/analytics/value-perf?season={s}" for s in seasons]
+        paths += [f"/api/players/{pid}/career" for pid in range(1, 50)]
+        paths += [f"/api/clubs/{cid}/season?season={seasons[0]}" for cid in (1, 2)]
+        paths += ["/api/search/players?q=a", "/api/managers/performance?limit=100"]
+
+        results: list = []
+        stop_at = time.monotonic() + args.seconds
+        await asyncio.gather(
+            *[
+                _worker(client, paths[i:] + paths[:i], stop_at, results)
+                for i in range(args.concurrency)
+            ]
+        )
+    return results
+
+
+def _measure(workers: int, args) -> dict:
+    port = _free_port()
+    env = {
+        **os.environ,
+        "WEB_CONCURRENCY": str(workers),
+        "RESPONSE_CACHE_MAX_ENTRIES": "0",
+        "ACCESS_LOG_SAMPLE_RATE": "0",
+        "ACCESS_LOG_REPLAY_TOP": "0",
+    }
+    server = subprocess.Popen(
+        [
+            "gunicorn",
+            "-c",
+            "api/gunicorn.conf.py",
+            "api.app.main:app",
+            "--bind",
+            f"127.0.0.1:{port}",
+            "--log-level",
+            "warning",
+        ],
+        cwd=args.app_dir,
+        env=env,
+    )
+    try:
+        results = asyncio.run(_run(f"http://127.0.0.1:{port}", args))
+        pss = _pss_mb(server.pid)
+    finally:
+        server.terminate()
+        server.wait(timeout=60)
+    ok = [ms for ms, status in results if status == 200]
+    return {
+        "workers": workers,
+        "ok": len(ok),
+        "non200": len(results) - len(ok),
+        "rps": len(ok) / args.seconds,
+        "p50": statistics.median(ok) if ok else 0.0,
+        "p99": _percentile(ok, 99) if ok else 0.0,
+        "pss": pss,
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--app-dir", default=REPO_ROOT)
+    ap.add_argument(
+        "--workers",
+        default=",".join(str(n) for n in sorted({1, 2, 4, os.cpu_count() or 1})),
+        help="comma-separated worker counts",
+    )
+    ap.add_argument("--seconds", type=float, default=20)
+    ap.add_argument("--concurrency", type=int, default=32, help="concurrent clients")
+    args = ap.parse_args()
+
+    rows = [_measure(int(n), args) for n in args.workers.split(",")]
+    base = rows[0]["rps"] or 1.0
+    print(f"app-dir: {args.app_dir}  cpus: {os.cpu_count()}")
+    print(
+        f"{'workers':>7} {'ok':>7} {'non200':>6} {'rps':>8} {'speedup':>7} "
+        f"{'p50':>8} {'p99':>8} {'pss_mb':>8}"
+    )
+    for r in rows:
+        print(
+            f"{r['workers']:>7} {r['ok']:>7} {r['non200']:>6} {r['rps']:>8.1f} "
+            f"{r['rps'] / base:>7.2f} {r['p50']:>8.1f} {r['p99']:>8.1f} "
+            f"{r['pss']:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
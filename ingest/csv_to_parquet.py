@@ -1,28 +1,446 @@
 import argparse
+import dataclasses
+import os
 import pathlib as P
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from multiprocessing import get_context
+from typing import Optional
+
 import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import manifest
+from schemas import SCHEMAS, SORT_KEYS, casts, read_overrides, sort_keys
+
+INFER_SCHEMA_LENGTH = 10000
+# Rough in-memory size of a parsed row relative to its CSV bytes, across the
+# reader's chunk, the row group being written and Arrow buffer overhead.
+_ROW_EXPANSION = 4
+
+
+@dataclass(frozen=True)
+class Layout:
+    """How Parquet files are laid out on disk."""
+
+    sort: bool = True  # order rows by `schemas.SORT_KEYS`
+    row_group_size: int = 122_880  # DuckDB's own row group size
+    zstd_level: int = 3
+    dictionary: bool = True  # in-memory path only; polars' sink picks its own
+
+
+def parquet_writer(
+    out: P.Path, schema: pa.Schema, keys: list, layout: Layout
+) -> pq.ParquetWriter:
+    """Writer laying out `out` per `layout`, declaring `keys` as its sort order."""
+    return pq.ParquetWriter(
+        out,
+        schema,
+        compression="zstd",
+        compression_level=layout.zstd_level,
+        use_dictionary=layout.dictionary,
+        write_statistics=True,
+        write_page_index=True,
+        sorting_columns=[
+            pq.SortingColumn(schema.get_field_index(k), nulls_first=False) for k in keys
+        ]
+        or None,
+    )
+
+
+def _write(df: pl.DataFrame, out: P.Path, keys: list, layout: Layout) -> None:
+    table = df.to_arrow()
+    with parquet_writer(out, table.schema, keys, layout) as writer:
+        writer.write_table(table, row_group_size=layout.row_group_size)
+
+
+def _row_bytes(csv: P.Path, sample: int = INFER_SCHEMA_LENGTH) -> float:
+    """Average CSV line length over the first `sample` data lines."""
+    with open(csv, "rb") as f:
+        f.readline()
+        n = size = 0
+        for line in f:
+            n += 1
+            size += len(line)
+            if n >= sample:
+                break
+    return size / n if n else 1.0
+
+
+def streaming_rows(csv: P.Path, memory_mb: int, threads: int) -> int:
+    """Rows per streaming chunk and row group that keep `csv` under `memory_mb`."""
+    per_row = _row_bytes(csv) * _ROW_EXPANSION
+    # Every thread holds a chunk in flight; the writer holds one row group.
+    rows = int(memory_mb * 1024 * 1024 / (per_row * (threads + 1)))
+    return max(1_000, min(rows, 1_000_000))
+
+
+def write_typed(source, table: str, out: P.Path, layout: Layout = Layout()) -> int:
+    """Read CSV `source` (a path or the bytes of one) whole and write it to `out`.
+
+    Applies the registered types and sort keys of `table`; returns the row count.
+    """
+    columns = pl.read_csv(source, n_rows=0).columns
+    df = pl.read_csv(
+        source,
+        infer_schema_length=INFER_SCHEMA_LENGTH,
+        schema_overrides=read_overrides(table, columns),
+    ).with_columns(casts(table, columns))
+    keys = sort_keys(table, columns) if layout.sort else []
+    if keys:
+        df = df.sort(keys, maintain_order=True, nulls_last=True)
+    _write(df, out, keys, layout)
+    return df.height
+
+
+def convert(
+    csv: P.Path,
+    dst_p: P.Path,
+    streaming: bool = False,
+    memory_mb: int = 512,
+    layout: Layout = Layout(),
+) -> dict:
+    """Convert one CSV to Parquet and return its timing and size stats.
+
+    Columns listed in `schemas.SCHEMAS` for the table get their registered
+    types; the rest are inferred from the first rows. The default path reads
+    the whole file into memory. `streaming` scans it in chunks and writes row
+    groups as they fill, so peak memory follows `memory_mb` instead of the file
+    size, with the same resulting table. With `layout.sort`, rows are sorted
+    by the table's `schemas.SORT_KEYS`; a sort needs the whole table in memory,
+    so under `streaming` it lifts the `memory_mb` bound (`main` turns it off for
+    streaming unless asked). Files are written zstd-compressed in row groups of
+    `layout.row_group_size` with min/max statistics.
+    """
+    start = time.perf_counter()
+    out = dst_p / csv.with_suffix(".parquet").name
+    # Write beside and swap in: `out` may be a hardlink into an older snapshot.
+    tmp = out.with_name(out.name + ".tmp")
+    if streaming:
+        columns = pl.read_csv(csv, n_rows=0).columns
+        keys = sort_keys(csv.stem, columns) if layout.sort else []
+        threads = pl.thread_pool_size()
+        rows = streaming_rows(csv, memory_mb, threads)
+        pl.Config.set_streaming_chunk_size(rows)
+        lf = pl.scan_csv(
+            csv,
+            infer_schema_length=INFER_SCHEMA_LENGTH,
+            schema_overrides=read_overrides(csv.stem, columns),
+            low_memory=True,
+        ).with_columns(casts(csv.stem, columns))
+        if keys:
+            lf = lf.sort(keys, maintain_order=True, nulls_last=True)
+        lf.sink_parquet(
+            tmp,
+            compression="zstd",
+            compression_level=layout.zstd_level,
+            statistics=True,
+            row_group_size=min(rows, layout.row_group_size),
+            engine="streaming",
+        )
+        height = pl.scan_parquet(tmp).select(pl.len()).collect().item()
+    else:
+        height = write_typed(csv, csv.stem, tmp, layout)
+    os.replace(tmp, out)
+    return {
+        "file": csv.name,
+        "rows": height,
+        "bytes_in": csv.stat().st_size,
+        "bytes_out": out.stat().st_size,
+        "seconds": time.perf_counter() - start,
+    }
 
 
-def main(src: str, dst: str) -> None:
+def reuse_result(
+    name: str, digest: str, bytes_in: int, out: P.Path, reuse: dict, start: float
+) -> dict:
+    """Link the previous snapshot's Parquet to `out` and describe it as a result."""
+    method = manifest.link_or_copy(reuse["path"], out)
+    return {
+        "file": name,
+        "rows": reuse["rows"],
+        "bytes_in": bytes_in,
+        "bytes_out": out.stat().st_size,
+        "seconds": time.perf_counter() - start,
+        "sha256": digest,
+        "reused": method,
+    }
+
+
+def error_result(name: str, e: Exception) -> dict:
+    first_line = str(e).strip().splitlines()[0] if str(e).strip() else ""
+    return {"file": name, "error": f"{type(e).__name__}: {first_line}"}
+
+
+def _convert_safe(
+    csv: P.Path,
+    dst_p: P.Path,
+    streaming: bool = False,
+    memory_mb: int = 512,
+    layout: Layout = Layout(),
+    reuse: Optional[dict] = None,
+) -> dict:
+    """Convert `csv`, or link `reuse["path"]` if the CSV hash is unchanged."""
+    try:
+        start = time.perf_counter()
+        digest = manifest.sha256_file(csv)
+        if reuse is not None and reuse["csv_sha256"] == digest:
+            out = dst_p / csv.with_suffix(".parquet").name
+            return reuse_result(csv.name, digest, csv.stat().st_size, out, reuse, start)
+        r = convert(csv, dst_p, streaming, memory_mb, layout)
+        r["sha256"] = digest
+        return r
+    except Exception as e:
+        return error_result(csv.name, e)
+
+
+def _limit_threads(n: int) -> None:
+    # Runs in each worker before polars starts its pool, so N workers share the
+    # cores instead of each spawning one thread per core.
+    os.environ["POLARS_MAX_THREADS"] = str(n)
+
+
+def _report(r: dict) -> None:
+    if "reused" in r:
+        print(f"reused: {r['file']:<24} {r['rows']:>10} rows unchanged ({r['reused']})")
+        return
+    mb_in, mb_out = r["bytes_in"] / 1e6, r["bytes_out"] / 1e6
+    rate = r["rows"] / r["seconds"] if r["seconds"] else 0.0
+    print(
+        f"ok: {r['file']:<28} {r['rows']:>10} rows {r['seconds']:>7.2f}s "
+        f"{rate:>11,.0f} rows/s {mb_in:>9.1f} MB -> {mb_out:>7.1f} MB"
+    )
+
+
+def run(
+    tasks: list,
+    source: str,
+    dst_p: P.Path,
+    workers: int = 1,
+    layout: Layout = Layout(),
+    previous: Optional[str] = "auto",
+    note: str = "",
+) -> list:
+    """Run conversion `tasks` into `dst_p`, reusing unchanged tables, and write
+    the snapshot manifest.
+
+    Each task is `(table, fn, args)`; `fn(*args, reuse)` converts one table and
+    returns a result dict (see `_convert_safe`), where `reuse` describes the
+    previous snapshot's Parquet for that table or is None. `fn` must be a
+    module-level function so worker processes can import it.
+    """
+    dst_p.mkdir(parents=True, exist_ok=True)
+    # Anything that changes the Parquet bytes for the same CSV.
+    fp = manifest.fingerprint(layout, INFER_SCHEMA_LENGTH, SCHEMAS, SORT_KEYS)
+    if previous == "auto":
+        prev_p = manifest.find_previous(dst_p)
+    else:
+        prev_p = P.Path(previous) if previous else None
+    prev = manifest.load(prev_p) if prev_p is not None else None
+    prev_tables = prev["tables"] if prev and prev.get("fingerprint") == fp else {}
+
+    def reuse_for(table: str) -> Optional[dict]:
+        entry = prev_tables.get(table)
+        if entry is None or not (prev_p / entry["parquet"]).exists():
+            return None
+        return {
+            "csv_sha256": entry["csv_sha256"],
+            "path": prev_p / entry["parquet"],
+            "rows": entry["rows"],
+        }
+
+    start = time.perf_counter()
+    results = []
+    if workers <= 1:
+        for table, fn, args in tasks:
+            r = fn(*args, reuse_for(table))
+            if "error" not in r:
+                _report(r)
+            results.append(r)
+    else:
+        threads = max(1, (os.cpu_count() or 1) // workers)
+        # spawn, not fork: polars' thread pool does not survive a fork.
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=get_context("spawn"),
+            initializer=_limit_threads,
+            initargs=(threads,),
+        ) as pool:
+            futures = [
+                pool.submit(fn, *args, reuse_for(table)) for table, fn, args in tasks
+            ]
+            for fut in as_completed(futures):
+                r = fut.result()
+                if "error" not in r:
+                    _report(r)
+                results.append(r)
+    elapsed = time.perf_counter() - start
+
+    ok = [r for r in results if "error" not in r]
+    errors = [r for r in results if "error" in r]
+    tables = {
+        P.Path(r["file"]).stem: {
+            "csv": r["file"],
+            "csv_sha256": r["sha256"],
+            "csv_bytes": r["bytes_in"],
+            "parquet": P.Path(r["file"]).with_suffix(".parquet").name,
+            "parquet_bytes": r["bytes_out"],
+            "rows": r["rows"],
+            "changed": "reused" not in r,
+        }
+        for r in ok
+    }
+    old = prev["tables"] if prev else {}
+    changed = sorted(t for t, e in tables.items() if e["changed"])
+    failed = sorted(P.Path(r["file"]).stem for r in errors)
+    manifest.write(
+        dst_p,
+        {
+            "created_at": int(time.time()),
+            "source": source,
+            "previous": prev_p.name if prev_p is not None and prev else None,
+            "fingerprint": fp,
+            "tables": tables,
+            "changed": changed,
+            # A table that failed here is not gone upstream.
+            "removed": sorted(set(old) - set(tables) - set(failed)),
+            "failed": failed,
+        },
+    )
+    rows = sum(r["rows"] for r in ok)
+    mb_in = sum(r["bytes_in"] for r in ok) / 1e6
+    mb_out = sum(r["bytes_out"] for r in ok) / 1e6
+    print(
+        f"Converted {len(ok)} files ({rows} rows, {mb_in:.1f} MB -> {mb_out:.1f} MB) "
+        f"in {elapsed:.2f}s with {max(workers, 1)} worker(s)" + note
+    )
+    reused = len(ok) - len(changed)
+    if prev:
+        print(
+            f"Reused {reused} unchanged files from {prev_p.name}; "
+            f"changed: {', '.join(changed) or 'none'}"
+        )
+    if errors:
+        print(f"Failed {len(errors)} files:")
+        for r in sorted(errors, key=lambda r: r["file"]):
+            print(f"  {r['file']}: {r['error']}")
+    return results
+
+
+def main(
+    src: str,
+    dst: str,
+    workers: int = 1,
+    streaming: bool = False,
+    memory_mb: int = 512,
+    layout: Layout = Layout(),
+    previous: Optional[str] = "auto",
+    streaming_sort: bool = False,
+) -> list:
     src_p = P.Path(src)
     dst_p = P.Path(dst)
-    dst_p.mkdir(parents=True, exist_ok=True)
-    count = 0
-    for csv in src_p.glob("*.csv"):
-        try:
-            df = pl.read_csv(csv, infer_schema_length=10000)
-            out = dst_p / csv.with_suffix(".parquet").name
-            df.write_parquet(out)
-            print(f"ok: {out.name}")
-            count += 1
-        except Exception as e:
-            print(f"skip: {csv.name} - {e}")
-    print("Converted", count, "files")
+    if streaming and layout.sort:
+        if streaming_sort:
+            print(
+                "warning: --streaming-sort holds each whole table in memory while "
+                f"sorting; peak memory can far exceed --memory-mb {memory_mb}",
+                file=sys.stderr,
+            )
+        else:
+            # Keep the memory ceiling: write CSV row order (and say so in the
+            # manifest fingerprint).
+            layout = dataclasses.replace(layout, sort=False)
+    # Each worker gets an equal share of the memory ceiling.
+    share = max(1, memory_mb // workers) if workers > 1 else memory_mb
+    # Largest first, so the long conversions start early and small files fill
+    # the gaps instead of one big file running alone at the end.
+    csvs = sorted(src_p.glob("*.csv"), key=lambda p: p.stat().st_size, reverse=True)
+    tasks = [
+        (csv.stem, _convert_safe, (csv, dst_p, streaming, share, layout))
+        for csv in csvs
+    ]
+    note = ""
+    if streaming:
+        note = f", streaming under {memory_mb} MB" + (
+            "" if layout.sort else ", unsorted"
+        )
+    return run(tasks, str(src_p), dst_p, workers, layout, previous, note)
 
 
 if __name__ == "__main__":
     ap = argparse.ArgumentParser()
     ap.add_argument("src", help="Input raw CSV directory")
     ap.add_argument("dst", help="Output Parquet directory")
+    ap.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("PARQUET_WORKERS", "1")),
+        help="Parallel conversion processes (default: PARQUET_WORKERS or 1)",
+    )
+    ap.add_argument(
+        "--streaming",
+        action="store_true",
+        default=os.getenv("PARQUET_STREAMING", "false").lower() in ("1", "true", "yes"),
+        help="Scan CSVs in chunks instead of loading them whole (PARQUET_STREAMING)",
+    )
+    ap.add_argument(
+        "--memory-mb",
+        type=int,
+        default=int(os.getenv("PARQUET_MEMORY_MB", "512")),
+        help="Memory ceiling for --streaming across all workers (default 512)",
+    )
+    ap.add_argument(
+        "--streaming-sort",
+        action="store_true",
+        default=os.getenv("PARQUET_STREAMING_SORT", "false").lower()
+        in ("1", "true", "yes"),
+        help="Sort by schemas.SORT_KEYS under --streaming too; the sort holds the "
+        "whole table in memory, so --memory-mb no longer bounds it",
+    )
+    ap.add_argument(
+        "--no-sort",
+        dest="sort",
+        action="store_false",
+        default=os.getenv("PARQUET_SORT", "true").lower() in ("1", "true", "yes"),
+        help="Keep CSV row order instead of sorting by schemas.SORT_KEYS",
+    )
+    ap.add_argument(
+        "--row-group-size",
+        type=int,
+        default=int(os.getenv("PARQUET_ROW_GROUP_SIZE", str(Layout.row_group_size))),
+        help="Rows per row group (default PARQUET_ROW_GROUP_SIZE or 122880)",
+    )
+    ap.add_argument(
+        "--zstd-level",
+        type=int,
+        default=int(os.getenv("PARQUET_ZSTD_LEVEL", str(Layout.zstd_level))),
+        help="zstd compression level (default PARQUET_ZSTD_LEVEL or 3)",
+    )
+    ap.add_argument(
+        "--no-dictionary",
+        dest="dictionary",
+        action="store_false",
+        default=os.getenv("PARQUET_DICTIONARY", "true").lower() in ("1", "true", "yes"),
+        help="Disable dictionary encoding (in-memory path)",
+    )
+    ap.add_argument(
+        "--previous",
+        default=os.getenv("PARQUET_PREVIOUS", "auto"),
+        help="Snapshot to reuse unchanged files from: a directory, 'auto' (latest "
+        "sibling of dst with a manifest, default) or '' to convert everything",
+    )
     args = ap.parse_args()
-    main(args.src, args.dst)
+    layout = Layout(args.sort, args.row_group_size, args.zstd_level, args.dictionary)
+    main(
+        args.src,
+        args.dst,
+        args.workers,
+        args.streaming,
+        args.memory_mb,
+        layout,
+        args.previous,
+        args.streaming_sort,
+    )
@@ -0,0 +1,78 @@
+"""Content-hash manifests for Parquet snapshots.
+
+`csv_to_parquet.py` writes `manifest.json` into every Parquet snapshot. It
+records the SHA256 of each source CSV, the Parquet file it produced and whether
+the table changed since the previous snapshot. A later run whose CSV hash and
+conversion settings (`fingerprint`) match the previous manifest links the old
+Parquet file instead of converting again. `changed` lists the tables that got
+new content, so the warehouse load and dbt can skip the rest.
+
+Parquet files are never modified in place (writers go through a temp file and
+`os.replace`), so hardlinks between snapshots are safe.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pathlib as P
+import shutil
+from typing import Optional
+
+MANIFEST = "manifest.json"
+VERSION = 1
+
+
+def sha256_file(path: P.Path, chunk: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(chunk):
+            h.update(block)
+    return h.hexdigest()
+
+
+def fingerprint(*parts) -> str:
+    """Short hash of the settings that shape the Parquet output."""
+    return hashlib.sha256(repr(parts).encode()).hexdigest()[:16]
+
+
+def load(snapshot: P.Path) -> Optional[dict]:
+    try:
+        data = json.loads((snapshot / MANIFEST).read_text())
+    except (OSError, ValueError):
+        return None
+    return data if data.get("version") == VERSION else None
+
+
+def write(snapshot: P.Path, data: dict) -> None:
+    tmp = snapshot / (MANIFEST + ".tmp")
+    tmp.write_text(json.dumps({"version": VERSION, **data}, indent=2, sort_keys=True))
+    os.replace(tmp, snapshot / MANIFEST)
+
+
+def find_previous(snapshot: P.Path) -> Optional[P.Path]:
+    """Most recent sibling snapshot (by name, i.e. timestamp) with a manifest."""
+    parent = snapshot.resolve().parent
+    if not parent.is_dir():
+        return None
+    here = snapshot.resolve().name
+    for d in sorted(parent.iterdir(), key=lambda p: p.name, reverse=True):
+        if d.is_dir() and d.name != here and d.name < here and load(d) is not None:
+            return d
+    return None
+
+
+def link_or_copy(src: P.Path, dst: P.Path) -> str:
+    """Hardlink `src` to `dst`, falling back to a copy; return the method used."""
+    tmp = dst.with_name(dst.name + ".tmp")
+    tmp.unlink(missing_ok=True)
+    try:
+        os.link(src, tmp)
+        method = "link"
+    except OSError:
+        # Other filesystem or no hardlink support.
+        shutil.copyfile(src, tmp)
+        method = "copy"
+    os.replace(tmp, dst)
+    return method
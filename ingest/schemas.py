@@ -0,0 +1,271 @@
+"""Per-table column types applied when converting the raw CSVs to Parquet.
+
+Each entry maps a source table (CSV file stem) to the types its columns should
+have in Parquet, matching what the staging models used to cast them to. Listed
+columns are read as text and converted here instead of being inferred from the
+first rows:
+
+- strings are trimmed and empty values become null (`clean_string`)
+- `Categorical` strings are written dictionary-encoded
+- integers and decimals parse like DuckDB `TRY_CAST`: `"12.0"` -> 12, half away
+  from zero, null on garbage or overflow (`int_or_null`, `decimal_or_null`)
+- dates accept `YYYY-MM-DD` with or without a time part (`to_date`)
+
+`SORT_KEYS` orders each table's rows before writing, by the keys downstream
+models join and filter on, so Parquet row-group statistics (and the zone maps of
+the warehouse tables loaded from them) let DuckDB skip row groups.
+
+Columns missing from the registry keep the inferred type; columns missing from
+a CSV are skipped. Columns whose staging cast throws information away
+(`transfers.transfer_season` like "20/21", `clubs.net_transfer_record` like
+"+€5.00m") stay raw text here and are still cast in staging.
+
+`duckdb_types` gives the same registry as DuckDB column types, which
+`warehouse/load_duckdb.py` declares for the raw tables.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List
+
+import polars as pl
+
+INT = pl.Int32  # staging int_or_null / int_or_zero
+BIGINT = pl.Int64  # ids, inferred counts, bigint_or_null
+MONEY = pl.Decimal(18, 2)  # decimal_or_null default
+PCT = pl.Decimal(5, 2)
+TEXT = pl.String
+CAT = pl.Categorical
+DATE = pl.Date
+BOOL = pl.Boolean
+
+SCHEMAS: Dict[str, Dict[str, pl.DataType]] = {
+    "appearances": {
+        "appearance_id": TEXT,
+        "game_id": BIGINT,
+        "player_id": BIGINT,
+        "player_club_id": BIGINT,
+        "player_current_club_id": BIGINT,
+        "competition_id": CAT,
+        "date": DATE,
+        "player_name": TEXT,
+        "minutes_played": BIGINT,
+        "goals": BIGINT,
+        "assists": BIGINT,
+        "yellow_cards": BIGINT,
+        "red_cards": BIGINT,
+    },
+    "club_games": {
+        "game_id": BIGINT,
+        "club_id": BIGINT,
+        "opponent_id": BIGINT,
+        "own_goals": BIGINT,
+        "own_position": INT,
+        "own_manager_name": TEXT,
+        "opponent_goals": BIGINT,
+        "opponent_position": INT,
+        "opponent_manager_name": TEXT,
+        "hosting": CAT,
+        "is_win": INT,
+    },
+    "clubs": {
+        "club_id": BIGINT,
+        "domestic_competition_id": CAT,
+        "name": TEXT,
+        "total_market_value": MONEY,
+        "net_transfer_record": TEXT,
+        "squad_size": INT,
+        "average_age": PCT,
+        "foreigners_number": INT,
+        "foreigners_percentage": PCT,
+        "national_team_players": INT,
+        "stadium_name": TEXT,
+        "stadium_seats": INT,
+        "coach_name": TEXT,
+        "last_season": INT,
+    },
+    "competitions": {
+        "competition_id": TEXT,
+        "competition_code": TEXT,
+        "name": TEXT,
+        "type": CAT,
+        "sub_type": CAT,
+        "country_id": BIGINT,
+        "country_name": TEXT,
+        "is_major_national_league": BOOL,
+    },
+    "game_events": {
+        "game_event_id": TEXT,
+        "date": DATE,
+        "game_id": BIGINT,
+        "minute": BIGINT,
+        "type": CAT,
+        "club_id": BIGINT,
+        "player_id": BIGINT,
+        "description": TEXT,
+        "player_in_id": BIGINT,
+        "player_assist_id": BIGINT,
+    },
+    "game_lineups": {
+        "game_lineups_id": TEXT,
+        "date": DATE,
+        "game_id": BIGINT,
+        "player_id": BIGINT,
+        "club_id": BIGINT,
+        "player_name": TEXT,
+        "number": INT,
+        "position": CAT,
+        "type": CAT,
+        "team_captain": INT,
+    },
+    "games": {
+        "game_id": BIGINT,
+        "competition_id": CAT,
+        "season": BIGINT,
+        "round": CAT,
+        "date": DATE,
+        "home_club_id": BIGINT,
+        "home_club_name": TEXT,
+        "home_club_goals": BIGINT,
+        "home_club_formation": CAT,
+        "home_club_manager_name": TEXT,
+        "home_club_position": INT,
+        "away_club_id": BIGINT,
+        "away_club_name": TEXT,
+        "away_club_goals": BIGINT,
+        "away_club_formation": CAT,
+        "away_club_manager_name": TEXT,
+        "away_club_position": INT,
+        "competition_type": CAT,
+        "stadium": TEXT,
+        "referee": TEXT,
+        "attendance": INT,
+    },
+    "player_valuations": {
+        "player_id": BIGINT,
+        "date": DATE,
+        "market_value_in_eur": INT,
+        "current_club_id": BIGINT,
+        "player_club_domestic_competition_id": CAT,
+    },
+    "players": {
+        "player_id": BIGINT,
+        "first_name": TEXT,
+        "last_name": TEXT,
+        "name": TEXT,
+        "current_club_id": BIGINT,
+        "current_club_domestic_competition_id": CAT,
+        "last_season": INT,
+        "country_of_birth": CAT,
+        "city_of_birth": TEXT,
+        "country_of_citizenship": CAT,
+        "date_of_birth": DATE,
+        "position": CAT,
+        "sub_position": CAT,
+        "foot": CAT,
+        "height_in_cm": INT,
+        "contract_expiration_date": DATE,
+        "agent_name": TEXT,
+        "market_value_in_eur": BIGINT,
+        "highest_market_value_in_eur": BIGINT,
+    },
+    "transfers": {
+        "player_id": BIGINT,
+        "transfer_date": DATE,
+        "transfer_season": TEXT,
+        "from_club_id": BIGINT,
+        "to_club_id": BIGINT,
+        "from_club_name": TEXT,
+        "to_club_name": TEXT,
+        "transfer_fee": MONEY,
+        "market_value_in_eur": MONEY,
+        "player_name": TEXT,
+    },
+}
+
+SORT_KEYS: Dict[str, List[str]] = {
+    "appearances": ["game_id", "player_id"],
+    "club_games": ["game_id", "club_id"],
+    "clubs": ["club_id"],
+    "competitions": ["competition_id"],
+    "game_events": ["game_id", "player_id"],
+    "game_lineups": ["game_id", "club_id", "player_id"],
+    "games": ["season", "game_id"],
+    "player_valuations": ["player_id", "date"],
+    "players": ["player_id"],
+    "transfers": ["player_id", "transfer_date"],
+}
+
+
+def _clean(col: str) -> pl.Expr:
+    text = pl.col(col).str.strip_chars()
+    return pl.when(text == "").then(None).otherwise(text)
+
+
+def _cast(col: str, dtype: pl.DataType) -> pl.Expr:
+    text = _clean(col)
+    if dtype == DATE:
+        return text.str.slice(0, 10).str.to_date("%Y-%m-%d", strict=False)
+    if dtype == BOOL:
+        lower = text.str.to_lowercase()
+        return (
+            pl.when(lower.is_in(["true", "1"]))
+            .then(True)
+            .when(lower.is_in(["false", "0"]))
+            .then(False)
+        )
+    if dtype.is_integer():
+        # Exact parse first so large ids keep full precision; fall back to a
+        # float parse for "12.0"-style values, rounding like DuckDB.
+        rounded = text.cast(pl.Float64, strict=False).round(
+            0, mode="half_away_from_zero"
+        )
+        return pl.coalesce(
+            text.cast(dtype, strict=False), rounded.cast(dtype, strict=False)
+        )
+    if isinstance(dtype, pl.Decimal):
+        wide = text.cast(pl.Decimal(38, 10), strict=False)
+        return wide.round(dtype.scale, mode="half_away_from_zero").cast(
+            dtype, strict=False
+        )
+    if dtype == CAT:
+        return text.cast(CAT)
+    if dtype == TEXT:
+        return text
+    return text.cast(dtype, strict=False)
+
+
+def read_overrides(table: str, columns: List[str]) -> Dict[str, pl.DataType]:
+    """`schema_overrides` reading every registered column of `table` as text."""
+    schema = SCHEMAS.get(table, {})
+    return {c: pl.String for c in columns if c in schema}
+
+
+def casts(table: str, columns: List[str]) -> List[pl.Expr]:
+    """Expressions converting the registered columns of `table` to their types."""
+    schema = SCHEMAS.get(table, {})
+    return [_cast(c, schema[c]).alias(c) for c in columns if c in schema]
+
+
+def sort_keys(table: str, columns: List[str]) -> List[str]:
+    """Registered sort keys of `table` that are present in `columns`."""
+    return [c for c in SORT_KEYS.get(table, []) if c in columns]
+
+
+def _duckdb_type(dtype: pl.DataType) -> str:
+    if isinstance(dtype, pl.Decimal):
+        return f"DECIMAL({dtype.precision},{dtype.scale})"
+    if dtype == INT:
+        return "INTEGER"
+    if dtype == BIGINT:
+        return "BIGINT"
+    if dtype == DATE:
+        return "DATE"
+    if dtype == BOOL:
+        return "BOOLEAN"
+    return "VARCHAR"  # TEXT, CAT
+
+
+def duckdb_types(table: str) -> Dict[str, str]:
+    """DuckDB column types of the registered columns of `table`."""
+    return {c: _duckdb_type(t) for c, t in SCHEMAS.get(table, {}).items()}
@@ -0,0 +1,191 @@
+"""Content-addressed store for raw and Parquet snapshots.
+
+Every file of a snapshot directory (`RAW_DIR/<ts>`, `PARQUET_DIR/<ts>`) is
+hashed and stored once as `STORE_DIR/objects/<sha[:2]>/<sha>`; the snapshot
+keeps its layout but its files become hardlinks to those objects, so unchanged
+CSVs and Parquet files across snapshots take disk space once and every tool
+keeps reading plain directories. Objects are read-only; writers replace files
+(see `manifest.link_or_copy`) instead of modifying them.
+
+An object whose link count is 1 is referenced by no snapshot. `gc` deletes
+snapshots beyond the newest `--keep` (never the one in `DATA_DIR/LATEST`) and
+then those unreferenced objects. The store must be on the same filesystem as
+the snapshots.
+
+    python ingest/store.py add data/raw/<ts> data/parquet/<ts>
+    python ingest/store.py gc --keep 3 [--dry-run]
+    python ingest/store.py report
+"""
+
+import argparse
+import os
+import pathlib as P
+import shutil
+import stat
+from collections import Counter
+
+from manifest import sha256_file
+
+
+def _env_path(name: str, default: str) -> P.Path:
+    return P.Path(os.getenv(name) or default)
+
+
+def _store_root() -> P.Path:
+    data_dir = os.getenv("DATA_DIR") or "./data"
+    return _env_path("STORE_DIR", os.path.join(data_dir, "store"))
+
+
+def _object(store: P.Path, digest: str) -> P.Path:
+    return store / "objects" / digest[:2] / digest
+
+
+def _objects(store: P.Path):
+    root = store / "objects"
+    return (p for p in root.glob("*/*") if p.is_file()) if root.is_dir() else iter(())
+
+
+def _files(snapshot: P.Path):
+    return (
+        p
+        for p in snapshot.rglob("*")
+        if p.is_file() and not p.is_symlink() and not p.name.endswith(".tmp")
+    )
+
+
+def add(store: P.Path, snapshot: P.Path) -> dict:
+    """Move the files of `snapshot` into the store and hardlink them back."""
+    known = {(st.st_dev, st.st_ino) for st in (p.stat() for p in _objects(store))}
+    stored = linked = skipped = 0
+    saved = 0
+    for path in sorted(_files(snapshot)):
+        st = path.stat()
+        if (st.st_dev, st.st_ino) in known:
+            skipped += 1
+            continue
+        obj = _object(store, sha256_file(path))
+        if obj.exists():
+            # Same content already stored: swap the file for a link to it.
+            tmp = path.with_name(path.name + ".tmp")
+            tmp.unlink(missing_ok=True)
+            os.link(obj, tmp)
+            os.replace(tmp, path)
+            linked += 1
+            saved += st.st_size
+        else:
+            obj.parent.mkdir(parents=True, exist_ok=True)
+            os.link(path, obj)
+            os.chmod(obj, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+            stored += 1
+        known.add((obj.stat().st_dev, obj.stat().st_ino))
+    return {"stored": stored, "linked": linked, "skipped": skipped, "saved": saved}
+
+
+def _snapshots(roots):
+    for root in roots:
+        if root.is_dir():
+            yield root, sorted(d for d in root.iterdir() if d.is_dir())
+
+
+def gc(store: P.Path, roots, keep: int, latest: str, dry_run: bool) -> dict:
+    """Drop snapshots beyond the newest `keep` per root, then orphaned objects."""
+    dropped = []
+    for _, snaps in _snapshots(roots):
+        old = snaps[:-keep] if keep > 0 else snaps
+        dropped += [d for d in old if d.name != latest]
+    pending = Counter()
+    if dry_run:
+        # Links from the snapshots that would be dropped still exist.
+        for d in dropped:
+            pending.update((st.st_dev, st.st_ino) for st in map(os.stat, _files(d)))
+    else:
+        for d in dropped:
+            shutil.rmtree(d)
+    freed = removed = 0
+    for obj in _objects(store):
+        st = obj.stat()
+        if st.st_nlink - pending[(st.st_dev, st.st_ino)] == 1:
+            freed += st.st_size
+            removed += 1
+            if not dry_run:
+                obj.unlink()
+    return {"snapshots": dropped, "objects": removed, "freed": freed}
+
+
+def report(store: P.Path, roots) -> dict:
+    """Logical bytes across snapshots vs bytes actually on disk."""
+    logical = 0
+    inodes = {}
+    snapshots = 0
+    for _, snaps in _snapshots(roots):
+        for d in snaps:
+            snapshots += 1
+            for p in _files(d):
+                st = p.stat()
+                logical += st.st_size
+                inodes[(st.st_dev, st.st_ino)] = st.st_size
+    objects = list(_objects(store))
+    orphaned = sum(o.stat().st_size for o in objects if o.stat().st_nlink == 1)
+    physical = sum(inodes.values()) + orphaned
+    return {
+        "snapshots": snapshots,
+        "objects": len(objects),
+        "logical": logical,
+        "physical": physical,
+        "orphaned": orphaned,
+        "saved": logical - physical,
+    }
+
+
+def _mb(n: int) -> str:
+    return f"{n / 1e6:.1f} MB"
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Content-addressed snapshot store")
+    ap.add_argument("--store", default=str(_store_root()))
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    a = sub.add_parser("add", help="Store snapshot directories and dedupe them")
+    a.add_argument("snapshots", nargs="+")
+    g = sub.add_parser("gc", help="Keep the newest N snapshots, free the rest")
+    g.add_argument("--keep", type=int, default=int(os.getenv("KEEP_SNAPSHOTS", "3")))
+    g.add_argument("--dry-run", action="store_true")
+    sub.add_parser("report", help="Bytes saved by deduplication")
+    args = ap.parse_args()
+
+    store = P.Path(args.store)
+    roots = [
+        _env_path("RAW_DIR", "./data/raw"),
+        _env_path("PARQUET_DIR", "./data/parquet"),
+    ]
+    if args.cmd == "add":
+        for snap in args.snapshots:
+            r = add(store, P.Path(snap))
+            print(
+                f"{snap}: {r['stored']} new objects, {r['linked']} deduplicated "
+                f"({_mb(r['saved'])} saved), {r['skipped']} already stored"
+            )
+    elif args.cmd == "gc":
+        latest_file = _env_path("DATA_DIR", "./data") / "LATEST"
+        latest = latest_file.read_text().strip() if latest_file.exists() else ""
+        r = gc(store, roots, args.keep, latest, args.dry_run)
+        verb = "Would drop" if args.dry_run else "Dropped"
+        for d in r["snapshots"]:
+            print(f"{verb} {d}")
+        print(
+            f"{verb} {len(r['snapshots'])} snapshots and {r['objects']} "
+            f"unreferenced objects ({_mb(r['freed'])})"
+        )
+    else:
+        r = report(store, roots)
+        pct = 100 * r["saved"] / r["logical"] if r["logical"] else 0.0
+        print(
+            f"{r['snapshots']} snapshots, {r['objects']} objects: "
+            f"{_mb(r['logical'])} logical, {_mb(r['physical'])} on disk, "
+            f"{_mb(r['saved'])} saved ({pct:.0f}%), "
+            f"{_mb(r['orphaned'])} unreferenced"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""Convert the CSV members of a dataset zip straight to Parquet.
+
+The Kaggle download is a zip of CSVs. `make ingest` + `make parquet` unzip it
+to disk and read every CSV back; this streams each member out of the archive
+through `pyarrow.csv.open_csv` in blocks of `BLOCK_BYTES` and applies the same
+conversion as `csv_to_parquet.py` (registered types, sort keys, `Layout`) batch
+by batch, so no CSV is ever written and no member is held in memory as bytes.
+Output, manifest and reuse of unchanged tables are identical: the manifest
+records the SHA256 of each decompressed member, hashed as it is read, which
+equals the hash of the extracted CSV, so snapshots built either way reuse each
+other's Parquet.
+
+With `--no-sort`, batches go to a `ParquetWriter` as row groups fill, so peak
+memory stays at a few blocks and a row group whatever the table size. Sorting
+by `schemas.SORT_KEYS` (the default) needs the whole table, so the typed
+batches are collected and sorted before writing; that holds the parsed table
+(not the CSV bytes) in memory, like `csv_to_parquet.py` without `--streaming`.
+
+    python ingest/zip_to_parquet.py data/raw/<ts>/dataset.zip data/parquet/<ts>
+"""
+
+import argparse
+import hashlib
+import itertools
+import os
+import pathlib as P
+import time
+import zipfile
+from typing import Optional
+
+import polars as pl
+import pyarrow as pa
+import pyarrow.csv as pacsv
+
+from csv_to_parquet import (
+    INFER_SCHEMA_LENGTH,
+    Layout,
+    error_result,
+    parquet_writer,
+    reuse_result,
+    run,
+)
+from schemas import casts, read_overrides, sort_keys
+
+# Bytes of CSV parsed per batch.
+BLOCK_BYTES = 1 << 20
+
+
+class _Hashing:
+    """Read-only file wrapper hashing the bytes read through it."""
+
+    def __init__(self, f):
+        self.f = f
+        self.sha = hashlib.sha256()
+        self.size = 0
+        self.closed = False
+
+    def read(self, n: int = -1) -> bytes:
+        data = self.f.read(n)
+        self.sha.update(data)
+        self.size += len(data)
+        return data
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _sha256(zf: zipfile.ZipFile, member: str) -> str:
+    with zf.open(member) as f:
+        h = _Hashing(f)
+        while h.read(BLOCK_BYTES):
+            pass
+    return h.sha.hexdigest()
+
+
+def _schema(zf: zipfile.ZipFile, member: str, table: str) -> pl.Schema:
+    """Types `csv_to_parquet.write_typed` reads the member's columns with:
+    registered ones as text, the rest inferred from the first rows."""
+    with zf.open(member) as f:
+        head = b"".join(itertools.islice(f, INFER_SCHEMA_LENGTH + 1))
+    columns = pl.read_csv(head, n_rows=0).columns
+    return pl.read_csv(
+        head,
+        infer_schema_length=INFER_SCHEMA_LENGTH,
+        schema_overrides=read_overrides(table, columns),
+    ).schema
+
+
+def _write_stream(
+    zf: zipfile.ZipFile, member: str, table: str, out: P.Path, layout: Layout
+) -> tuple:
+    """Stream `member` into typed Parquet at `out`; returns (rows, bytes, sha256)."""
+    schema = _schema(zf, member, table)
+    columns = list(schema)
+    # Read every column as text and type it like the in-memory reader would:
+    # unquoted empty fields are null, quoted ones stay "".
+    convert = pacsv.ConvertOptions(
+        column_types={c: pa.string() for c in columns},
+        strings_can_be_null=True,
+        quoted_strings_can_be_null=False,
+    )
+    registered = read_overrides(table, columns)
+    exprs = casts(table, columns) + [
+        pl.col(c).cast(t) for c, t in schema.items() if c not in registered
+    ]
+    keys = sort_keys(table, columns) if layout.sort else []
+    frames, writer, rows = [], None, 0
+
+    def flush(df: pl.DataFrame) -> None:
+        nonlocal writer
+        arrow = df.to_arrow()
+        if writer is None:
+            writer = parquet_writer(out, arrow.schema, keys, layout)
+        writer.write_table(arrow, row_group_size=layout.row_group_size)
+
+    with zf.open(member) as f:
+        src = _Hashing(f)
+        reader = pacsv.open_csv(
+            src,
+            read_options=pacsv.ReadOptions(block_size=BLOCK_BYTES),
+            convert_options=convert,
+        )
+        for batch in reader:
+            frames.append(pl.from_arrow(batch).with_columns(exprs))
+            rows += batch.num_rows
+            if keys:
+                continue
+            # Write whole row groups as they fill; keep the remainder.
+            pending = pl.concat(frames)
+            full = pending.height // layout.row_group_size * layout.row_group_size
+            if full:
+                flush(pending.slice(0, full))
+            frames = [pending.slice(full)]
+    try:
+        df = (
+            pl.concat(frames)
+            if frames
+            else pl.DataFrame(schema={c: pl.String for c in columns}).with_columns(
+                exprs
+            )
+        )
+        if keys:
+            df = df.sort(keys, maintain_order=True, nulls_last=True)
+        if df.height or writer is None:
+            flush(df)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows, src.size, src.sha.hexdigest()
+
+
+def _convert_member(
+    archive: P.Path,
+    member: str,
+    dst_p: P.Path,
+    layout: Layout = Layout(),
+    reuse: Optional[dict] = None,
+) -> dict:
+    """Convert one zip member, or link `reuse["path"]` if its hash is unchanged."""
+    name = P.PurePosixPath(member).name
+    try:
+        start = time.perf_counter()
+        out = dst_p / P.PurePosixPath(name).with_suffix(".parquet").name
+        with zipfile.ZipFile(archive) as zf:
+            if reuse is not None:
+                digest = _sha256(zf, member)
+                if reuse["csv_sha256"] == digest:
+                    size = zf.getinfo(member).file_size
+                    return reuse_result(name, digest, size, out, reuse, start)
+            # Write beside and swap in: `out` may be a hardlink into an older
+            # snapshot.
+            tmp = out.with_name(out.name + ".tmp")
+            height, size, digest = _write_stream(
+                zf, member, P.PurePosixPath(name).stem, tmp, layout
+            )
+        os.replace(tmp, out)
+        return {
+            "file": name,
+            "rows": height,
+            "bytes_in": size,
+            "bytes_out": out.stat().st_size,
+            "seconds": time.perf_counter() - start,
+            "sha256": digest,
+        }
+    except Exception as e:
+        return error_result(name, e)
+
+
+def _members(archive: P.Path) -> list:
+    """CSV members of `archive`, largest (uncompressed) first."""
+    with zipfile.ZipFile(archive) as zf:
+        infos = [
+            i
+            for i in zf.infolist()
+            if not i.is_dir() and i.filename.lower().endswith(".csv")
+        ]
+    stems = [P.PurePosixPath(i.filename).stem for i in infos]
+    dupes = sorted({s for s in stems if stems.count(s) > 1})
+    if dupes:
+        raise SystemExit(f"{archive}: several members per table: {', '.join(dupes)}")
+    return sorted(infos, key=lambda i: i.file_size, reverse=True)
+
+
+def main(
+    src: str,
+    dst: str,
+    workers: int = 1,
+    layout: Layout = Layout(),
+    previous: Optional[str] = "auto",
+) -> list:
+    src_p = P.Path(src)
+    if src_p.is_dir():
+        zips = sorted(src_p.glob("*.zip"))
+        if len(zips) != 1:
+            raise SystemExit(f"Expected one .zip in {src_p}, found {len(zips)}")
+        src_p = zips[0]
+    dst_p = P.Path(dst)
+    tasks = [
+        (
+            P.PurePosixPath(i.filename).stem,
+            _convert_member,
+            (src_p, i.filename, dst_p, layout),
+        )
+        for i in _members(src_p)
+    ]
+    return run(tasks, str(src_p), dst_p, workers, layout, previous, ", from zip")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("src", help="Dataset zip, or a directory holding exactly one")
+    ap.add_argument("dst", help="Output Parquet directory")
+    ap.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("PARQUET_WORKERS", "1")),
+        help="Parallel conversion processes (default: PARQUET_WORKERS or 1)",
+    )
+    ap.add_argument(
+        "--no-sort",
+        dest="sort",
+        action="store_false",
+        default=os.getenv("PARQUET_SORT", "true").lower() in ("1", "true", "yes"),
+        help="Keep CSV row order instead of sorting by schemas.SORT_KEYS",
+    )
+    ap.add_argument(
+        "--row-group-size",
+        type=int,
+        default=int(os.getenv("PARQUET_ROW_GROUP_SIZE", str(Layout.row_group_size))),
+        help="Rows per row group (default PARQUET_ROW_GROUP_SIZE or 122880)",
+    )
+    ap.add_argument(
+        "--zstd-level",
+        type=int,
+        default=int(os.getenv("PARQUET_ZSTD_LEVEL", str(Layout.zstd_level))),
+        help="zstd compression level (default PARQUET_ZSTD_LEVEL or 3)",
+    )
+    ap.add_argument(
+        "--no-dictionary",
+        dest="dictionary",
+        action="store_false",
+        default=os.getenv("PARQUET_DICTIONARY", "true").lower() in ("1", "true", "yes"),
+        help="Disable dictionary encoding",
+    )
+    ap.add_argument(
+        "--previous",
+        default=os.getenv("PARQUET_PREVIOUS", "auto"),
+        help="Snapshot to reuse unchanged files from: a directory, 'auto' (latest "
+        "sibling of dst with a manifest, default) or '' to convert everything",
+    )
+    args = ap.parse_args()
+    layout = Layout(args.sort, args.row_group_size, args.zstd_level, args.dictionary)
+    results = main(args.src, args.dst, args.workers, layout, args.previous)
+    # Fail the caller (`make ingest-parquet`) instead of recording a partial
+    # snapshot as LATEST.
+    if any("error" in r for r in results):
+        raise SystemExit(1)
@@ -4,3 +4,12 @@
     -- Cast various string/timestamp inputs safely to DATE
     CAST({{ col }} AS DATE)
 {%- endmacro %}
+
+{% macro season_start(col) -%}
+    -- Start year of the July–June season containing the date (2023/2024 -> 2023)
+    CAST(
+        EXTRACT(YEAR FROM {{ col }})
+        - CASE WHEN EXTRACT(MONTH FROM {{ col }}) >= 7 THEN 0 ELSE 1 END
+        AS INTEGER
+    )
+{%- endmacro %}
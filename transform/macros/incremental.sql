@@ -0,0 +1,65 @@
+-- macros/incremental.sql
+--
+-- Season-partitioned incremental marts. `mart_season_inputs` hashes every input
+-- row per season; each incremental mart records the hashes it was built from in
+-- its own `_<model>_seasons` table (post-hook `record_seasons`; a shared table
+-- would conflict between models built in parallel), deletes the seasons whose hash
+-- changed before the next run (pre-hook `delete_changed_seasons`) and then
+-- computes only the seasons missing from the table (`missing_season`).
+-- `dbt run --full-refresh` rebuilds everything; a model without recorded
+-- hashes is emptied and rebuilt the same way.
+
+{% macro season_state_name() -%}
+    _{{ this.identifier }}_seasons
+{%- endmacro %}
+
+{% macro season_state() -%}
+    {{ api.Relation.create(database=this.database, schema=this.schema, identifier=season_state_name()) }}
+{%- endmacro %}
+
+{% macro changed_seasons() -%}
+    -- Seasons whose inputs differ from the ones this model was built from,
+    -- including seasons that disappeared from the inputs
+    SELECT COALESCE(i.season_start, s.season_start) AS season_start
+    FROM {{ ref('mart_season_inputs') }} i
+    FULL JOIN {{ season_state() }} s
+    ON i.season_start IS NOT DISTINCT FROM s.season_start
+    WHERE i.signature IS DISTINCT FROM s.signature
+{%- endmacro %}
+
+{% macro season_changed(col) -%}
+    -- TRUE when the season of {{ col }} must be rebuilt (always without recorded hashes)
+    {%- set state = adapter.get_relation(database=this.database, schema=this.schema, identifier=season_state_name()) -%}
+    {%- if state is none %}
+    TRUE
+    {%- else %}
+    EXISTS (
+        SELECT 1 FROM ({{ changed_seasons() }}) c
+        WHERE c.season_start IS NOT DISTINCT FROM CAST({{ col }} AS INTEGER)
+    )
+    {%- endif %}
+{%- endmacro %}
+
+{% macro delete_changed_seasons() -%}
+    {%- if is_incremental() -%}
+    DELETE FROM {{ this }} t WHERE {{ season_changed('t.season_start') }}
+    {%- endif -%}
+{%- endmacro %}
+
+{% macro record_seasons() -%}
+    CREATE OR REPLACE TABLE {{ season_state() }} AS
+    SELECT season_start, signature
+    FROM {{ ref('mart_season_inputs') }}
+{%- endmacro %}
+
+{% macro missing_season(col) -%}
+    -- TRUE on full builds; on incremental runs only seasons not in the table
+    {%- if is_incremental() %}
+    NOT EXISTS (
+        SELECT 1 FROM {{ this }} t
+        WHERE t.season_start IS NOT DISTINCT FROM CAST({{ col }} AS INTEGER)
+    )
+    {%- else %}
+    TRUE
+    {%- endif %}
+{%- endmacro %}
@@ -0,0 +1,9 @@
+{{ config(materialized='table') }}
+
+SELECT DISTINCT
+    competition_id,
+    season,
+    club_id,
+    club_name
+FROM {{ ref('mart_competition_club_season') }}
+ORDER BY competition_id, season, club_name
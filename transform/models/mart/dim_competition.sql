@@ -0,0 +1,26 @@
+{{ config(materialized='table') }}
+
+WITH seasons AS (
+    SELECT
+        competition_id,
+        MIN(season) AS first_season,
+        MAX(season) AS last_season,
+        COUNT(DISTINCT season) AS season_count
+    FROM {{ ref('mart_competition_club_season') }}
+    GROUP BY competition_id
+)
+
+SELECT
+    s.competition_id,
+    {{ title_case ('co.competition_name') }} AS competition_name,
+    co.competition_type,
+    co.competition_sub_type,
+    co.country_name,
+    co.is_top_5,
+    s.first_season,
+    s.last_season,
+    s.season_count
+FROM seasons AS s
+INNER JOIN {{ ref('stg_competitions') }} AS co
+ON s.competition_id = co.competition_id
+ORDER BY competition_name
@@ -0,0 +1,9 @@
+{{ config(materialized='table') }}
+
+SELECT
+    season,
+    COUNT(DISTINCT competition_id) AS competition_count,
+    COUNT(DISTINCT club_id) AS club_count
+FROM {{ ref('mart_competition_club_season') }}
+GROUP BY season
+ORDER BY season DESC
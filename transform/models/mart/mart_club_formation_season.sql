@@ -74,7 +74,8 @@ WITH games_unioned AS (
 
 SELECT
     {{ title_case ('co.competition_name') }} as competition_name,
-    a.*
+    a.*,
+    CAST(a.season AS INTEGER) AS season_start
 FROM agg a
 INNER JOIN {{ ref('stg_competitions') }} co
 ON a.competition_id = co.competition_id
@@ -1,4 +1,11 @@
-{{ config(materialized='table') }}
+{{ config(
+    materialized='incremental',
+    incremental_strategy='append',
+    pre_hook="{{ delete_changed_seasons() }}",
+    post_hook="{{ record_seasons() }}"
+) }}
+-- incremental by season, see macros/incremental.sql
+-- depends_on: {{ ref('mart_season_inputs') }}
 
 WITH games_unioned AS (
     SELECT
@@ -11,6 +18,7 @@ WITH games_unioned AS (
         CASE WHEN home_points = 1 THEN 1 ELSE 0 END AS draws,
         CASE WHEN home_points = 0 THEN 1 ELSE 0 END AS losses
     FROM {{ ref('mart_game_facts') }}
+    WHERE {{ missing_season('season') }}
 
     UNION ALL
 
@@ -24,6 +32,7 @@ WITH games_unioned AS (
         CASE WHEN away_points = 1 THEN 1 ELSE 0 END AS draws,
         CASE WHEN away_points = 0 THEN 1 ELSE 0 END AS losses
     FROM {{ ref('mart_game_facts') }}
+    WHERE {{ missing_season('season') }}
 ),
 
 club_games AS (
@@ -54,11 +63,13 @@ clubs_squad AS (
     FROM {{ ref('stg_appearances') }} AS a
     JOIN {{ ref('stg_games') }} AS g
       ON a.game_id = g.game_id
+    WHERE {{ missing_season('g.season') }}
     GROUP BY g.season, a.player_club_id
 )
 
 SELECT
     g.season,
+    CAST(g.season AS INTEGER) AS season_start,
     g.club_id,
     c.name,
     g.games_played,
@@ -1,4 +1,11 @@
-{{ config(materialized='table') }}
+{{ config(
+    materialized='incremental',
+    incremental_strategy='append',
+    pre_hook="{{ delete_changed_seasons() }}",
+    post_hook="{{ record_seasons() }}"
+) }}
+-- incremental by season, see macros/incremental.sql
+-- depends_on: {{ ref('mart_season_inputs') }}
 
 WITH games_unioned AS (
     SELECT
@@ -12,6 +19,7 @@ WITH games_unioned AS (
         CASE WHEN home_points = 1 THEN 1 ELSE 0 END AS draws,
         CASE WHEN home_points = 0 THEN 1 ELSE 0 END AS losses
     FROM {{ ref('mart_game_facts') }}
+    WHERE {{ missing_season('season') }}
 
     UNION ALL
 
@@ -26,6 +34,7 @@ WITH games_unioned AS (
         CASE WHEN away_points = 1 THEN 1 ELSE 0 END AS draws,
         CASE WHEN away_points = 0 THEN 1 ELSE 0 END AS losses
     FROM {{ ref('mart_game_facts') }}
+    WHERE {{ missing_season('season') }}
 ),
 
 club_games AS (
@@ -59,6 +68,7 @@ clubs_squad AS (
     JOIN {{ ref('stg_games') }} AS g
     ON a.game_id = g.game_id
     AND g.competition_id = a.competition_id
+    WHERE {{ missing_season('g.season') }}
     GROUP BY g.season, a.player_club_id, g.competition_id
 )
 
@@ -66,6 +76,7 @@ SELECT
     g.club_id,
     c.name AS club_name,
     g.season,
+    CAST(g.season AS INTEGER) AS season_start,
     g.competition_id,
     {{ title_case ('co.competition_name') }} as competition_name,
     g.games_played,
@@ -0,0 +1,33 @@
+{{ config(materialized='table') }}
+
+-- club-season transfer aggregates attached to every competition the club
+-- played that season; sorted so competition/season filters prune row groups
+SELECT
+    c.competition_id,
+    c.competition_name,
+    t.club_id,
+    c.club_name,
+    t.season,
+    t.season_start,
+
+    t.incoming_total,
+    t.outgoing_total,
+
+    t.incoming_free_cnt,
+    t.incoming_paid_cnt,
+    t.incoming_loan_cnt,
+    t.incoming_loan_return_cnt,
+
+    t.outgoing_free_cnt,
+    t.outgoing_paid_cnt,
+    t.outgoing_loan_cnt,
+    t.outgoing_loan_return_cnt,
+
+    t.transfer_spend,
+    t.transfer_income,
+    t.net_spend
+FROM {{ ref('mart_transfer_club') }} t
+INNER JOIN {{ ref('mart_competition_club_season') }} c
+ON c.club_id = t.club_id
+AND c.season_start = t.season_start
+ORDER BY t.season_start, c.competition_id, t.net_spend DESC
@@ -19,6 +19,7 @@ INNER JOIN {{ ref('stg_competitions') }} co ON g.competition_id = co.competition
             game_id,
             competition_id,
             season,
+            CAST(season AS INTEGER) AS season_start,
             date,
             home_club_id,
             away_club_id,
@@ -1,20 +1,17 @@
-{{ config(materialized='table') }}
+{{ config(
+    materialized='incremental',
+    incremental_strategy='delete+insert',
+    unique_key='player_id',
+    pre_hook="{% if is_incremental() %}DELETE FROM {{ this }} WHERE player_id NOT IN (SELECT player_id FROM {{ ref('stg_players') }}){% endif %}",
+    post_hook="{{ record_seasons() }}"
+) }}
+-- incremental by player: players with appearances in changed seasons (see
+-- macros/incremental.sql) or with changed metadata are recomputed
+-- depends_on: {{ ref('mart_season_inputs') }}
+-- depends_on: {{ ref('stg_games') }}
 
 -- career summary merged with player metadata
-WITH base_perf AS (
-    SELECT
-        a.player_id,
-        COUNT(DISTINCT a.game_id) AS total_matches,
-        SUM(a.minutes_played)     AS total_minutes,
-        SUM(a.goals)              AS total_goals,
-        SUM(a.assists)            AS total_assists,
-        SUM(a.yellow_cards)       AS total_yellow_cards,
-        SUM(a.red_cards)          AS total_red_cards
-    FROM {{ ref('stg_appearances') }} a
-    GROUP BY a.player_id
-),
-
-players AS (
+WITH players AS (
     SELECT
         p.player_id,
         p.name AS player_name,
@@ -26,6 +23,44 @@ players AS (
         p.highest_market_value_in_eur  AS career_peak_value_eur,
         p.last_season,
     FROM {{ ref('stg_players') }} p
+),
+
+{% if is_incremental() %}
+touched AS (
+    SELECT a.player_id
+    FROM {{ ref('stg_appearances') }} a
+    LEFT JOIN {{ ref('stg_games') }} g
+        ON g.game_id = a.game_id
+    WHERE {{ season_changed('g.season') }}
+
+    UNION
+
+    SELECT player_id
+    FROM (
+        SELECT * FROM players
+        EXCEPT
+        SELECT
+            player_id, player_name, date_of_birth, country_of_citizenship, foot,
+            position, sub_position, career_peak_value_eur, last_season
+        FROM {{ this }}
+    )
+),
+{% endif %}
+
+base_perf AS (
+    SELECT
+        a.player_id,
+        COUNT(DISTINCT a.game_id) AS total_matches,
+        SUM(a.minutes_played)     AS total_minutes,
+        SUM(a.goals)              AS total_goals,
+        SUM(a.assists)            AS total_assists,
+        SUM(a.yellow_cards)       AS total_yellow_cards,
+        SUM(a.red_cards)          AS total_red_cards
+    FROM {{ ref('stg_appearances') }} a
+    {% if is_incremental() %}
+    WHERE a.player_id IN (SELECT player_id FROM touched)
+    {% endif %}
+    GROUP BY a.player_id
 )
 
 SELECT
@@ -52,3 +87,6 @@ SELECT
 FROM players pl
 LEFT JOIN base_perf bp
 ON pl.player_id = bp.player_id
+{% if is_incremental() %}
+WHERE pl.player_id IN (SELECT player_id FROM touched)
+{% endif %}
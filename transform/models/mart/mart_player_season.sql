@@ -1,4 +1,11 @@
-{{ config(materialized='table') }}
+{{ config(
+    materialized='incremental',
+    incremental_strategy='append',
+    pre_hook="{{ delete_changed_seasons() }}",
+    post_hook="{{ record_seasons() }}"
+) }}
+-- incremental by season, see macros/incremental.sql
+-- depends_on: {{ ref('mart_season_inputs') }}
 
 WITH src AS (
     SELECT
@@ -18,6 +25,7 @@ WITH src AS (
         ON p.player_id = a.player_id
     INNER JOIN {{ ref('stg_games') }} g
         ON g.game_id = a.game_id
+    WHERE {{ missing_season('g.season') }}
 )
 
 , agg AS (
@@ -68,6 +76,7 @@ WITH src AS (
             ORDER BY v.date DESC
         ) AS rn
     FROM {{ ref('stg_player_valuations') }} v
+    WHERE {{ missing_season("EXTRACT('year' FROM v.date)") }}
 )
 
 , season_last_valuation AS (
@@ -83,6 +92,7 @@ SELECT
     p.player_id,
     p.player_name,
     p.season,
+    CAST(p.season AS INTEGER) AS season_start,
     p.games_played,
     p.minutes_played,
     p.goals,
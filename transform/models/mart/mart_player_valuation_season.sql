@@ -17,6 +17,7 @@ WITH src AS (
             THEN CONCAT(EXTRACT(YEAR FROM s.date), '/', EXTRACT(YEAR FROM s.date) + 1)
           ELSE CONCAT(EXTRACT(YEAR FROM s.date) - 1, '/', EXTRACT(YEAR FROM s.date))
         END AS season,
+        {{ season_start('s.date') }} AS season_start,
         market_value,
         ROW_NUMBER() OVER(PARTITION BY player_id, season ORDER BY date ASC) AS rn_asc,
         ROW_NUMBER() OVER(PARTITION BY player_id, season ORDER BY date DESC) AS rn_desc
@@ -27,12 +28,13 @@ WITH src AS (
     SELECT
         player_id,
         season,
+        season_start,
         MAX(CASE WHEN rn_asc = 1 THEN market_value END) AS first_market_value,
         MAX(CASE WHEN rn_desc = 1 THEN market_value END) AS last_market_value,
         MIN(market_value) AS min_market_value,
         MAX(market_value) AS max_market_value
     FROM seasoned
-    GROUP BY player_id, season
+    GROUP BY player_id, season, season_start
 )
 
 , diff_calc AS (
@@ -47,6 +49,7 @@ SELECT
     d.player_id,
     p.name,
     d.season,
+    d.season_start,
     d.first_market_value,
     d.last_market_value,
     d.min_market_value,
@@ -4,6 +4,7 @@ WITH perf AS (
     SELECT
         player_id,
         season,
+        season_start,
         player_name,
         minutes_played,
         goals_per90,
@@ -16,7 +17,7 @@ WITH perf AS (
 val AS (
     SELECT
         player_id,
-        season,
+        season_start,
         first_market_value,
         last_market_value,
         value_change_amount,
@@ -37,9 +38,10 @@ SELECT
     DATE_DIFF(
         'year',
         player.date_of_birth,
-        MAKE_DATE(CAST(perf.season AS INTEGER), 6, 30)
+        MAKE_DATE(perf.season_start, 6, 30)
     ) AS age_in_season,
     perf.season,
+    perf.season_start,
     perf.minutes_played,
     perf.goals_per90,
     perf.assists_per90,
@@ -52,6 +54,6 @@ SELECT
 FROM perf
 LEFT JOIN val
   ON perf.player_id = val.player_id
- AND perf.season = LEFT(val.season, 4)
+ AND perf.season_start = val.season_start
 LEFT JOIN player
   ON perf.player_id = player.player_id
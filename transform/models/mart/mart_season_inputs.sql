@@ -0,0 +1,100 @@
+{{ config(materialized='table') }}
+
+-- One hash per season over every input row the season-incremental marts read
+-- (see macros/incremental.sql). Games, appearances (with the player names the
+-- marts join) and valuations hash into their season, and so do the names of
+-- the clubs and competitions the season's games reference, so renaming a club
+-- only rebuilds the seasons it played in. Appearances without a game fall in
+-- the NULL season.
+
+WITH games AS (
+    SELECT
+        g.game_id,
+        CAST(g.season AS INTEGER) AS season_start,
+        g.home_club_id,
+        g.away_club_id,
+        g.competition_id,
+        HASH(g) AS row_hash
+    FROM {{ ref('stg_games') }} g
+),
+
+games_by_season AS (
+    SELECT season_start, SUM(row_hash::HUGEINT) AS games_hash
+    FROM games
+    GROUP BY season_start
+),
+
+appearances_by_season AS (
+    SELECT
+        gm.season_start,
+        SUM(HASH(a, p.player_id, p.first_name, p.last_name)::HUGEINT) AS appearances_hash
+    FROM {{ ref('stg_appearances') }} a
+    LEFT JOIN games gm
+        ON gm.game_id = a.game_id
+    LEFT JOIN {{ ref('stg_players') }} p
+        ON p.player_id = a.player_id
+    GROUP BY gm.season_start
+),
+
+valuations_by_season AS (
+    -- the player marts match valuations to seasons by calendar year
+    SELECT
+        CAST(EXTRACT('year' FROM v.date) AS INT) AS season_start,
+        SUM(HASH(v)::HUGEINT) AS valuations_hash
+    FROM {{ ref('stg_player_valuations') }} v
+    GROUP BY 1
+),
+
+season_clubs AS (
+    SELECT season_start, home_club_id AS club_id FROM games
+    UNION
+    SELECT season_start, away_club_id FROM games
+),
+
+clubs_by_season AS (
+    SELECT sc.season_start, SUM(HASH(c.club_id, c.name)::HUGEINT) AS clubs_hash
+    FROM season_clubs sc
+    INNER JOIN {{ ref('stg_clubs') }} c
+        ON c.club_id = sc.club_id
+    GROUP BY sc.season_start
+),
+
+competitions_by_season AS (
+    SELECT
+        sc.season_start,
+        SUM(HASH(co.competition_id, co.competition_name)::HUGEINT) AS competitions_hash
+    FROM (SELECT DISTINCT season_start, competition_id FROM games) sc
+    INNER JOIN {{ ref('stg_competitions') }} co
+        ON co.competition_id = sc.competition_id
+    GROUP BY sc.season_start
+),
+
+seasons AS (
+    SELECT season_start FROM games_by_season
+    UNION
+    SELECT season_start FROM appearances_by_season
+    UNION
+    SELECT season_start FROM valuations_by_season
+)
+
+SELECT
+    s.season_start,
+    HASH(
+        g.games_hash,
+        a.appearances_hash,
+        v.valuations_hash,
+        c.clubs_hash,
+        co.competitions_hash
+    ) AS signature
+FROM seasons s
+LEFT JOIN games_by_season g
+    ON g.season_start IS NOT DISTINCT FROM s.season_start
+LEFT JOIN appearances_by_season a
+    ON a.season_start IS NOT DISTINCT FROM s.season_start
+LEFT JOIN valuations_by_season v
+    ON v.season_start IS NOT DISTINCT FROM s.season_start
+LEFT JOIN clubs_by_season c
+    ON c.season_start IS NOT DISTINCT FROM s.season_start
+LEFT JOIN competitions_by_season co
+    ON co.season_start IS NOT DISTINCT FROM s.season_start
+ORDER BY s.season_start
@@ -5,6 +5,7 @@ WITH base AS (
     SELECT
         m.player_id,
         m.season,
+        m.season_start,
         m.from_club_id,
         m.to_club_id,
         m.transfer_category,
@@ -17,6 +18,7 @@ incoming AS (
     SELECT
         b.to_club_id AS club_id,
         b.season,
+        b.season_start,
         COUNT(*) AS incoming_total,
         SUM(b.fee_norm) AS transfer_spend,
         SUM(CASE WHEN b.transfer_category = 'free' THEN 1 ELSE 0 END)           AS incoming_free_cnt,
@@ -25,7 +27,7 @@ incoming AS (
         SUM(CASE WHEN b.transfer_category = 'loan_return' THEN 1 ELSE 0 END) AS incoming_loan_return_cnt
     FROM base b
     WHERE b.to_club_id IS NOT NULL
-    GROUP BY 1,2
+    GROUP BY 1,2,3
 ),
 
 -- outgoing side (from_club_id)
@@ -33,6 +35,7 @@ outgoing AS (
     SELECT
         b.from_club_id AS club_id,
         b.season,
+        b.season_start,
         COUNT(*) AS outgoing_total,
         SUM(b.fee_norm) AS transfer_income,
         SUM(CASE WHEN b.transfer_category = 'free' THEN 1 ELSE 0 END)           AS outgoing_free_cnt,
@@ -41,7 +44,7 @@ outgoing AS (
         SUM(CASE WHEN b.transfer_category = 'loan_return' THEN 1 ELSE 0 END) AS outgoing_loan_return_cnt
     FROM base b
     WHERE b.from_club_id IS NOT NULL
-    GROUP BY 1,2
+    GROUP BY 1,2,3
 ),
 
 -- merge incoming and outgoing
@@ -49,6 +52,7 @@ merged AS (
     SELECT
         COALESCE(i.club_id, o.club_id) AS club_id,
         COALESCE(i.season,  o.season)  AS season,
+        COALESCE(i.season_start, o.season_start) AS season_start,
 
         COALESCE(i.incoming_total, 0)  AS incoming_total,
         COALESCE(o.outgoing_total, 0)  AS outgoing_total,
@@ -67,7 +71,7 @@ merged AS (
         COALESCE(o.transfer_income, 0) AS transfer_income
     FROM incoming i
     FULL OUTER JOIN outgoing o
-      ON i.club_id = o.club_id AND i.season = o.season
+      ON i.club_id = o.club_id AND i.season_start = o.season_start
 ),
 
 -- attach club names
@@ -85,6 +89,7 @@ SELECT
     club_id,
     club_name,
     season,
+    season_start,
 
     incoming_total,
     outgoing_total,
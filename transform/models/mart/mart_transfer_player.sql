@@ -23,7 +23,8 @@ seasoned AS (
           WHEN EXTRACT(MONTH FROM s.transfer_date) >= 7
             THEN CONCAT(EXTRACT(YEAR FROM s.transfer_date), '/', EXTRACT(YEAR FROM s.transfer_date) + 1)
           ELSE CONCAT(EXTRACT(YEAR FROM s.transfer_date) - 1, '/', EXTRACT(YEAR FROM s.transfer_date))
-        END AS season
+        END AS season,
+        {{ season_start('s.transfer_date') }} AS season_start
     FROM src s
 ),
 
@@ -73,6 +74,7 @@ SELECT
     o.player_name,
     o.transfer_date,
     o.season,
+    o.season_start,
     o.from_club_id,
     o.from_club_name,
     o.to_club_id,
@@ -108,7 +110,7 @@ FROM ordered o
 LEFT JOIN loan_flags lf
   ON o.player_id = lf.player_id AND o.rn = lf.rn
 GROUP BY
-    o.player_id, o.player_name, o.transfer_date, o.season,
+    o.player_id, o.player_name, o.transfer_date, o.season, o.season_start,
     o.from_club_id, o.from_club_name, o.to_club_id, o.to_club_name,
     o.market_value_in_eur, o.transfer_fee_raw,
     o.is_free_transfer, o.is_retired_or_without_club
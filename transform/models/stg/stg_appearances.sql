@@ -19,8 +19,8 @@ SELECT
     player_current_club_id,
 
     -- Player info
-    {{ clean_string('player_name') }} AS player_name,
-    {{ to_date('date') }} AS date,
+    player_name,
+    date,
 
     -- Match stats
     {{ non_negative('minutes_played') }} AS minutes_played,
@@ -16,16 +16,16 @@ SELECT
 
     -- Club info
     {{ non_negative('own_goals') }} AS own_goals,
-    {{ int_or_zero('own_position') }} AS own_position,
-    {{ clean_string('own_manager_name') }} AS own_manager_name,
+    COALESCE(own_position, 0) AS own_position,
+    own_manager_name,
 
     -- Opponent info
     {{ non_negative('opponent_goals') }} AS opponent_goals,
-    {{ int_or_zero('opponent_position') }} AS opponent_position,
-    {{ clean_string('opponent_manager_name') }} AS opponent_manager_name,
+    COALESCE(opponent_position, 0) AS opponent_position,
+    opponent_manager_name,
 
     -- Match flags
-    {{ clean_string('hosting') }} AS hosting,
-    {{ int_or_null('is_win') }} AS is_win
+    hosting,
+    is_win
 
 FROM source
@@ -3,12 +3,12 @@ WITH src AS (
 )
 
 SELECT
-    CAST(competition_id AS varchar)         AS competition_id,
-    NULLIF(TRIM(competition_code), '')      AS competition_code,
-    nullif(trim(name), '')                  as competition_name,
-    nullif(trim(type), '')                  as competition_type,
-    nullif(trim(sub_type), '')              as competition_sub_type,
-    cast(country_id as bigint)              as country_id,
-    nullif(trim(country_name), '')          as country_name,
+    competition_id,
+    competition_code,
+    name                                    AS competition_name,
+    type                                    AS competition_type,
+    sub_type                                AS competition_sub_type,
+    country_id,
+    country_name,
     COALESCE(is_major_national_league, FALSE) AS is_top_5
 from src
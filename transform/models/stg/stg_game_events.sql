@@ -18,11 +18,11 @@ SELECT
     player_assist_id,
 
     -- Time info
-    {{ to_date('date') }} AS date,
+    date,
     {{ non_negative('minute') }} AS minute,
 
     -- Event info
-    {{ clean_string('type') }} AS type,
-    {{ clean_string('description') }} AS description
+    type,
+    description
 
 FROM source
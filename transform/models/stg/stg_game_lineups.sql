@@ -12,13 +12,13 @@ SELECT
     player_id,
 
     -- Info
-    {{ clean_string('player_name') }} AS player_name,
-    {{ clean_string('position') }} AS position,
-    {{ clean_string('type') }} AS type,
-    {{ int_or_null('number') }} AS number,
-    {{ int_or_zero('team_captain') }} AS team_captain,
+    player_name,
+    position,
+    type,
+    number,
+    COALESCE(team_captain, 0) AS team_captain,
 
     -- Date of lineup
-    {{ to_date('date') }} AS date
+    date
 
 FROM source
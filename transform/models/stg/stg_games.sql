@@ -11,28 +11,28 @@ SELECT
     competition_id,
     season,
     round,
-    {{ to_date('date') }} AS date,
+    date,
 
     -- HOME CLUB
     home_club_id,
-    {{ clean_string('home_club_name') }} AS home_club_name,
+    home_club_name,
     {{ non_negative('home_club_goals') }} AS home_club_goals,
-    {{ clean_string('home_club_formation') }} AS home_club_formation,
-    {{ clean_string('home_club_manager_name') }} AS home_club_manager_name,
-    {{ int_or_zero('home_club_position') }} AS home_club_position,
+    home_club_formation,
+    home_club_manager_name,
+    COALESCE(home_club_position, 0) AS home_club_position,
 
     -- AWAY CLUB
     away_club_id,
-    {{ clean_string('away_club_name') }} AS away_club_name,
+    away_club_name,
     {{ non_negative('away_club_goals') }} AS away_club_goals,
-    {{ clean_string('away_club_formation') }} AS away_club_formation,
-    {{ clean_string('away_club_manager_name') }} AS away_club_manager_name,
-    {{ int_or_zero('away_club_position') }} AS away_club_position,
+    away_club_formation,
+    away_club_manager_name,
+    COALESCE(away_club_position, 0) AS away_club_position,
 
     -- MATCH INFO
-    {{ clean_string('competition_type') }} AS competition_type,
-    {{ clean_string('stadium') }} AS stadium,
-    {{ clean_string('referee') }} AS referee,
-    {{ int_or_zero('attendance') }} AS attendance
+    competition_type,
+    stadium,
+    referee,
+    COALESCE(attendance, 0) AS attendance
 
 FROM source
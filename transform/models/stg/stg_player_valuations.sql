@@ -10,10 +10,10 @@ WITH source AS (
 SELECT
     -- Composite key
     player_id,
-    {{ to_date('date') }} AS date,
+    date,
 
     -- Value info
-    {{ int_or_null('market_value_in_eur') }} AS market_value_in_eur,
+    market_value_in_eur,
 
     -- Club context
     current_club_id,
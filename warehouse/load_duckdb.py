@@ -1,18 +1,400 @@
-import argparse, pathlib as P, duckdb
+"""Load a Parquet snapshot into the DuckDB warehouse.
 
-def main(db: str, pq_dir: str):
+Every `<table>.parquet` becomes table `<table>` in `main`, with the column types
+registered in `ingest/schemas.py` (other columns keep their Parquet type). The
+tables are built side by side as `__load_<table>`, several at once (`--workers`,
+one cursor each; every scan is itself parallel across row groups), and then
+swapped in within one transaction. A failed or interrupted load therefore leaves
+the previous tables untouched, and readers see either all old or all new
+tables. Other objects in the file (dbt models) are kept.
+
+Loads are incremental. `_warehouse_loads` records the source CSV hash and
+conversion fingerprint (from the snapshot's `manifest.json`, see
+`ingest/manifest.py`) each table was last loaded from, and tables whose hash
+and fingerprint are unchanged are skipped. Changed tables listed in
+`UPSERT_KEYS`, the append-mostly ones, are diffed against the warehouse by
+natural key and row hash; only new, changed and deleted keys are rewritten, in
+the same transaction as the swap. The warehouse side of the diff is
+`_warehouse_keys_<table>`, the per-key row hashes stored when the table was last
+loaded, so an upsert hashes the new Parquet only and does not rescan the table.
+Upserted rows are appended, so those tables drift from `SORT_KEYS` order until
+the next `--full` load, which reloads every table.
+
+`--views` creates views over the Parquet files instead: nothing is copied, so a
+load is instant, but every query reads Parquet. Meant for dev iteration; the
+views break when the snapshot directory moves.
+
+    python warehouse/load_duckdb.py <db> data/parquet/<ts> [--workers N] [--full]
+    python warehouse/load_duckdb.py <db> data/parquet/<ts> --views
+"""
+
+import argparse
+import os
+import pathlib as P
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import duckdb
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "ingest"))
+
+import manifest  # noqa: E402
+from schemas import duckdb_types  # noqa: E402
+
+STAGE = "__load_"
+STATE = "_warehouse_loads"
+# Per-key row hashes of each `UPSERT_KEYS` table, as of its last load.
+KEYS = "_warehouse_keys_"
+# Natural keys of the append-mostly tables, diffed row by row instead of
+# reloaded when their source changes.
+UPSERT_KEYS = {
+    "appearances": ["appearance_id"],
+    "game_events": ["game_event_id"],
+    "player_valuations": ["player_id", "date"],
+}
+# More tables in flight than cores only adds contention.
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
+
+def _select(con, table: str, path: str):
+    """Column definitions and SELECT list reading `path` as `table`'s types."""
+    registered = duckdb_types(table)
+    defs, exprs = [], []
+    for name, parquet_type, *_ in con.execute(
+        f"DESCRIBE SELECT * FROM read_parquet('{path}')"
+    ).fetchall():
+        target = registered.get(name, parquet_type)
+        col = f'"{name}"'
+        defs.append(f"{col} {target}")
+        # Older snapshots have untyped text columns; cast like staging used to.
+        exprs.append(
+            col if target == parquet_type else f"TRY_CAST({col} AS {target}) AS {col}"
+        )
+    return ", ".join(defs), ", ".join(exprs)
+
+
+def _existing(con) -> dict:
+    """Object name -> 'BASE TABLE' or 'VIEW' in the main schema."""
+    rows = con.execute(
+        "SELECT table_name, table_type FROM information_schema.tables "
+        "WHERE table_catalog = current_database() AND table_schema = 'main'"
+    ).fetchall()
+    return dict(rows)
+
+
+def _drop(con, name: str, kind: str) -> None:
+    con.execute(f"DROP {'VIEW' if kind == 'VIEW' else 'TABLE'} {name}")
+
+
+def _key_hashes(con, table: str, source: str) -> str:
+    """Per natural key of `table` in `source`, the sum of its row hashes.
+
+    Keys are grouped by their hash `__k`, so joins and group-bys run on one
+    integer; keys sharing a hash are simply diffed (and rewritten) together.
+    The sum is order-independent and sensitive to duplicates, so two sides
+    hold the same rows for a key exactly when the sums match (up to hash
+    collisions). `hash` may change across DuckDB versions; that only makes
+    every key look stale.
+    """
+    columns = ", ".join(
+        f'"{n}"' for n, *_ in con.execute(f"DESCRIBE SELECT * FROM {source}").fetchall()
+    )
+    return (
+        f"SELECT {_key(table)} AS __k, sum(hash({columns})::HUGEINT) AS __h "
+        f"FROM {source} GROUP BY __k"
+    )
+
+
+def _key(table: str) -> str:
+    return "hash(" + ", ".join(f'"{c}"' for c in UPSERT_KEYS[table]) + ")"
+
+
+def _stage(con, table: str, path: str) -> dict:
+    """Build `__load_<table>` from `path` on its own cursor, with the key hashes
+    of `UPSERT_KEYS` tables beside it."""
+    start = time.perf_counter()
+    cur = con.cursor()
+    try:
+        defs, exprs = _select(cur, table, path)
+        cur.execute(f"CREATE TABLE {STAGE}{table} ({defs})")
+        rows = cur.execute(
+            f"INSERT INTO {STAGE}{table} SELECT {exprs} FROM read_parquet('{path}')"
+        ).fetchone()[0]
+        if table in UPSERT_KEYS:
+            cur.execute(
+                f"CREATE TABLE {STAGE}{KEYS}{table} AS "
+                + _key_hashes(cur, table, f"{STAGE}{table}")
+            )
+    finally:
+        cur.close()
+    return {"table": table, "rows": rows, "seconds": time.perf_counter() - start}
+
+
+def _defs(con, table: str) -> str:
+    """Column definitions of an existing `table`, formatted like `_select`."""
+    return ", ".join(
+        f'"{n}" {t}' for n, t, *_ in con.execute(f"DESCRIBE {table}").fetchall()
+    )
+
+
+def _ensure_state(con) -> None:
+    con.execute(
+        f"CREATE TABLE IF NOT EXISTS {STATE} (table_name VARCHAR, snapshot VARCHAR, "
+        "csv_sha256 VARCHAR, fingerprint VARCHAR, rows BIGINT, mode VARCHAR, "
+        "loaded_at TIMESTAMP)"
+    )
+
+
+def _plan(con, files: list, snap, full: bool) -> dict:
+    """Table -> 'unchanged', 'upsert' or 'full'."""
+    existing = _existing(con)
+    loaded = {
+        t: (sha, fp)
+        for t, sha, fp in con.execute(
+            f"SELECT table_name, csv_sha256, fingerprint FROM {STATE}"
+        ).fetchall()
+    }
+    entries = snap["tables"] if snap else {}
+    plan = {}
+    for p in files:
+        t, entry = p.stem, entries.get(p.stem)
+        if full or existing.get(t) != "BASE TABLE":
+            plan[t] = "full"
+        elif entry and loaded.get(t) == (entry["csv_sha256"], snap["fingerprint"]):
+            plan[t] = "unchanged"
+        elif (
+            t in UPSERT_KEYS
+            and existing.get(f"{KEYS}{t}") == "BASE TABLE"
+            and _select(con, t, p.resolve().as_posix())[0] == _defs(con, t)
+        ):
+            plan[t] = "upsert"
+        else:
+            plan[t] = "full"
+    return plan
+
+
+def _upsert(con, table: str, path: str) -> dict:
+    """Rewrite the keys of `table` whose rows differ from the Parquet at `path`.
+
+    Only the Parquet is hashed; it is compared with the stored key hashes, not
+    with `table` itself.
+    """
+    start = time.perf_counter()
+    _, exprs = _select(con, table, path)
+    src = f"(SELECT {exprs} FROM read_parquet('{path}'))"
+    con.execute("CREATE TEMP TABLE __hashes AS " + _key_hashes(con, table, src))
+    # A key is stale when its hash sum changed or it exists on one side only;
+    # only stale keys are deleted and re-inserted.
+    con.execute(
+        "CREATE TEMP TABLE __delta AS SELECT coalesce(s.__k, w.__k) AS __k "
+        f"FROM __hashes s FULL JOIN {KEYS}{table} w ON s.__k = w.__k "
+        "WHERE s.__h IS DISTINCT FROM w.__h"
+    )
+    try:
+        stale = f"{_key(table)} IN (SELECT __k FROM __delta)"
+        deleted = con.execute(f"DELETE FROM {table} WHERE {stale}").fetchone()[0]
+        inserted = con.execute(
+            f"INSERT INTO {table} SELECT * FROM {src} WHERE {stale}"
+        ).fetchone()[0]
+        known = "__k IN (SELECT __k FROM __delta)"
+        con.execute(f"DELETE FROM {KEYS}{table} WHERE {known}")
+        con.execute(f"INSERT INTO {KEYS}{table} SELECT * FROM __hashes WHERE {known}")
+    finally:
+        con.execute("DROP TABLE __delta")
+        con.execute("DROP TABLE __hashes")
+    rows = con.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    return {
+        "table": table,
+        "rows": rows,
+        "seconds": time.perf_counter() - start,
+        "mode": "upsert",
+        "inserted": inserted,
+        "deleted": deleted,
+    }
+
+
+_VERBS = {"full": "Loaded", "upsert": "Upserted", "unchanged": "Unchanged"}
+
+
+def _report(r: dict) -> None:
+    extra = f"  (+{r['inserted']} -{r['deleted']})" if r["mode"] == "upsert" else ""
+    print(
+        f"{_VERBS[r['mode']]:<9} {r['table']:<20} {r['rows']:>10} rows "
+        f"{r['seconds']:>7.2f}s{extra}"
+    )
+
+
+def _record(con, results: list, snapshot: str, snap) -> None:
+    """Remember what each loaded table came from, for the next incremental load."""
+    entries = snap["tables"] if snap else {}
+    fp = snap["fingerprint"] if snap else None
+    for r in results:
+        if r["mode"] == "unchanged":
+            continue
+        t, entry = r["table"], entries.get(r["table"])
+        con.execute(f"DELETE FROM {STATE} WHERE table_name = ?", [t])
+        if r["mode"] == "view":
+            continue
+        con.execute(
+            f"INSERT INTO {STATE} VALUES (?, ?, ?, ?, ?, ?, now()::TIMESTAMP)",
+            [
+                t,
+                snapshot,
+                entry["csv_sha256"] if entry else None,
+                fp if entry else None,
+                r["rows"],
+                r["mode"],
+            ],
+        )
+
+
+def _load_tables(
+    con, files: list, workers: int, snapshot: str, snap, full: bool
+) -> list:
+    plan = _plan(con, files, snap, full)
+    paths = {p.stem: p.resolve().as_posix() for p in files}
+    entries = snap["tables"] if snap else {}
+    results = []
+    for t in (t for t in paths if plan[t] == "unchanged"):
+        r = {
+            "table": t,
+            "rows": entries[t]["rows"],
+            "seconds": 0.0,
+            "mode": "unchanged",
+        }
+        _report(r)
+        results.append(r)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [
+            pool.submit(_stage, con, t, path)
+            for t, path in paths.items()
+            if plan[t] == "full"
+        ]
+        for fut in as_completed(futures):
+            r = {**fut.result(), "mode": "full"}
+            _report(r)
+            results.append(r)
+    start = time.perf_counter()
+    con.execute("BEGIN TRANSACTION")
+    existing = _existing(con)
+    for r in [r for r in results if r["mode"] == "full"]:
+        t = r["table"]
+        if t in existing:
+            _drop(con, t, existing[t])
+        con.execute(f"ALTER TABLE {STAGE}{t} RENAME TO {t}")
+        if t in UPSERT_KEYS:
+            if f"{KEYS}{t}" in existing:
+                _drop(con, f"{KEYS}{t}", existing[f"{KEYS}{t}"])
+            con.execute(f"ALTER TABLE {STAGE}{KEYS}{t} RENAME TO {KEYS}{t}")
+    for t in (t for t in paths if plan[t] == "upsert"):
+        r = _upsert(con, t, paths[t])
+        _report(r)
+        results.append(r)
+    _record(con, results, snapshot, snap)
+    con.execute("COMMIT")
+    print(f"Committed in {time.perf_counter() - start:.2f}s")
+    return results
+
+
+def _load_views(con, files: list) -> list:
+    results = []
+    con.execute("BEGIN TRANSACTION")
+    existing = _existing(con)
+    for p in files:
+        start = time.perf_counter()
+        t, path = p.stem, p.resolve().as_posix()
+        _, exprs = _select(con, t, path)
+        if existing.get(t) == "BASE TABLE":
+            _drop(con, t, "BASE TABLE")
+        if f"{KEYS}{t}" in existing:
+            _drop(con, f"{KEYS}{t}", existing[f"{KEYS}{t}"])
+        con.execute(
+            f"CREATE OR REPLACE VIEW {t} AS SELECT {exprs} FROM read_parquet('{path}')"
+        )
+        rows = con.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0]
+        r = {"table": t, "rows": rows, "seconds": time.perf_counter() - start}
+        print(f"{'View':<9} {t:<20} {rows:>10} rows {r['seconds']:>7.2f}s")
+        results.append({**r, "mode": "view"})
+    # Views are not loads; the next table load starts from scratch.
+    _record(con, results, "", None)
+    con.execute("COMMIT")
+    return results
+
+
+def main(
+    db: str,
+    pq_dir: str,
+    workers: int = DEFAULT_WORKERS,
+    views: bool = False,
+    full: bool = False,
+) -> list:
     con = duckdb.connect(db)
     pq = P.Path(pq_dir)
-    for p in pq.glob("*.parquet"):
-        t = p.stem  # dosya adı -> tablo adı
-        con.execute(f"DROP TABLE IF EXISTS {t}")
-        con.execute(f"CREATE TABLE {t} AS SELECT * FROM read_parquet('{p.as_posix()}')")
-        print("Loaded", t)
+    snap = manifest.load(pq)
+    # dosya adı -> tablo adı; largest first so the long loads start early
+    files = sorted(pq.glob("*.parquet"), key=lambda p: p.stat().st_size, reverse=True)
+    start = time.perf_counter()
+    try:
+        # Leftovers of an interrupted load.
+        for name, kind in _existing(con).items():
+            if name.startswith(STAGE):
+                _drop(con, name, kind)
+        _ensure_state(con)
+        if views:
+            results = _load_views(con, files)
+        else:
+            results = _load_tables(con, files, workers, pq.name, snap, full)
+    except Exception:
+        try:
+            con.execute("ROLLBACK")
+        except duckdb.Error:
+            pass  # no transaction open
+        for name, kind in _existing(con).items():
+            if name.startswith(STAGE):
+                _drop(con, name, kind)
+        con.close()
+        raise
     con.close()
+    rows = sum(r["rows"] for r in results)
+    if views:
+        mode = "views"
+    else:
+        counts = {m: sum(r["mode"] == m for r in results) for m in _VERBS}
+        mode = (
+            f"tables ({counts['full']} loaded, {counts['upsert']} upserted, "
+            f"{counts['unchanged']} unchanged), {max(1, workers)} worker(s)"
+        )
+    print(
+        f"Loaded {len(results)} {mode} ({rows} rows) into {db} "
+        f"in {time.perf_counter() - start:.2f}s"
+    )
+    return results
+
 
 if __name__ == "__main__":
     ap = argparse.ArgumentParser()
     ap.add_argument("db")
     ap.add_argument("pq_dir")
+    ap.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("LOAD_WORKERS") or DEFAULT_WORKERS),
+        help="Tables loaded at once (default: LOAD_WORKERS or min(4, CPUs))",
+    )
+    ap.add_argument(
+        "--views",
+        action="store_true",
+        default=os.getenv("WAREHOUSE_VIEWS", "false").lower() in ("1", "true", "yes"),
+        help="Create views over the Parquet files instead of tables (WAREHOUSE_VIEWS)",
+    )
+    ap.add_argument(
+        "--full",
+        action="store_true",
+        default=os.getenv("WAREHOUSE_FULL", "false").lower() in ("1", "true", "yes"),
+        help="Reload every table, ignoring the manifest and the last load "
+        "(WAREHOUSE_FULL)",
+    )
     args = ap.parse_args()
-    main(args.db, args.pq_dir)
+    main(args.db, args.pq_dir, args.workers, args.views, args.full)